@@ -0,0 +1,49 @@
+"""
+Preload-then-fork server mode (gunicorn with uvicorn workers).
+
+    gunicorn -c gunicorn.conf.py src.main:app
+
+The master imports src.main once (models loaded, weights memory-mapped with
+INFERENCE_SHARED_WEIGHTS) and then forks the workers, so every worker starts
+with the models already in memory and their read-only pages shared instead of
+loading a private copy each. Check with scripts/report_worker_memory.py.
+
+The asyncpg pools are created by init_pools in each worker's lifespan
+(src.main._start_up), after the fork, so no database connection crosses it;
+the model warm-up runs there too. Nothing runs inference in the master: ONNX Runtime sessions are recreated lazily in
+each worker (their thread pools do not survive fork) and the PyTorch thread
+pool is sized per worker in post_fork (src.utils.runtime_config: CPUs split
+across workers and inference slots, each worker pinned to its own CPU slice
+with INFERENCE_CPU_AFFINITY).
+
+Environment: PORT (8000), WEB_CONCURRENCY (workers, 2), GUNICORN_TIMEOUT (120 s).
+Set the worker count through WEB_CONCURRENCY rather than -w: the thread layout
+is computed from it.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 2))
+# O app (Settings.WEB_CONCURRENCY) divide as threads pelo mesmo número de workers
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 120))
+graceful_timeout = 30
+
+
+def when_ready(server):
+    # Move os objetos já criados para a geração permanente: a coleta de lixo nos workers
+    # não escreve nos cabeçalhos deles e as páginas herdadas seguem compartilhadas
+    gc.collect()
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from src.config.settings import Settings
+    from src.utils.runtime_config import configure_runtime
+
+    # Divide os núcleos entre os workers em vez de cada um usar todos. age conta os workers já
+    # criados (1, 2, ...): um worker reiniciado pode dividir a fatia de CPUs com outro
+    configure_runtime(Settings(), worker_index=(worker.age - 1) % workers)
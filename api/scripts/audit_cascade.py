@@ -0,0 +1,191 @@
+"""
+Audit of the classifier cascade (src.utils.cascade): throughput gained against
+positives missed, from stored attendances.
+
+Usage (from api/, with the database settings of the API in .env):
+    python scripts/audit_cascade.py [--models tuberculosis] [--limit 2000]
+    python scripts/audit_cascade.py --simulate [--bands 0.02:0.98 0.05:0.95 0.1:0.9]
+        [--screen-size 112]
+
+Without --simulate, reads the cascade entry stored with each attendance result
+("decided_by") and reports, per stage, how many results it decided, accuracy on
+the labeled ones and the positives it called negative. Labels are resolved like
+scripts/quantize_models.py does.
+
+With --simulate, runs the screen (the <model>-screen.onnx export if present, else
+the eager model at --screen-size) and the full model on every labeled attendance
+and replays the cascade for each band (multi-class models: the screen only
+settles negatives): share decided by the screen, estimated
+latency per image (screen + full when uncertain) and speedup over the full model
+alone, accuracy and missed positives against the full model alone.
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import sys
+import time
+
+import torch
+import torch.nn.functional as F
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_models import CLASSIFIER_SIZE, DEVICE, EAGER_LOADERS  # noqa: E402
+from quantize_models import CLASS_NAMES, fetch_attendances, resolve_label  # noqa: E402
+from src.utils.cascade import NEGATIVE_CLASS_INDEX, parse_cascade_bands, screen_decides  # noqa: E402
+from src.utils.image_ingest import decode_image  # noqa: E402
+from src.utils.inference_backend import EagerBackend, OnnxRuntimeBackend, exported_model_path  # noqa: E402
+from src.utils.preprocessing import ClassifierPreprocessor, StageTimer  # noqa: E402
+
+
+def _stored_cascade(row):
+    try:
+        return json.loads(row["model_result"]).get("cascade")
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def _predicted(row):
+    try:
+        return json.loads(row["model_result"]).get("class_pred", "").lower()
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def report_stored(model_name: str, rows):
+    """Decisions stored with the attendances, by stage."""
+    classes = [name.lower() for name in CLASS_NAMES[model_name]]
+    negative = classes[NEGATIVE_CLASS_INDEX[model_name]]
+    stages = {}
+    for row in rows:
+        cascade = _stored_cascade(row)
+        stage = cascade.get("decided_by") if cascade else "no cascade"
+        counts = stages.setdefault(stage, {"results": 0, "labeled": 0, "correct": 0, "missed_positives": 0})
+        counts["results"] += 1
+        label = resolve_label(model_name, row)
+        if label is None:
+            continue
+        predicted = _predicted(row)
+        counts["labeled"] += 1
+        counts["correct"] += int(predicted == classes[label])
+        counts["missed_positives"] += int(classes[label] != negative and predicted == negative)
+
+    total = sum(counts["results"] for counts in stages.values())
+    print(f"  {'stage':<12}{'results':>9}{'share %':>9}{'labeled':>9}{'acc %':>8}{'missed +':>10}")
+    for stage, counts in sorted(stages.items()):
+        accuracy = f"{100 * counts['correct'] / counts['labeled']:.1f}" if counts["labeled"] else "-"
+        print(f"  {stage:<12}{counts['results']:>9}{100 * counts['results'] / total:>9.1f}"
+              f"{counts['labeled']:>9}{accuracy:>8}{counts['missed_positives']:>10}")
+    return stages
+
+
+def _timed(backend, tensor):
+    start = time.perf_counter()
+    with torch.no_grad():
+        probs = F.softmax(backend(tensor), dim=1)
+    return probs, (time.perf_counter() - start) * 1000
+
+
+def simulate(model_name: str, rows, bands, screen_size: int, models_dir: str):
+    """Replays the cascade over the labeled attendances for each band."""
+    full = EagerBackend(EAGER_LOADERS[model_name](), "classifier")
+    screen_path = exported_model_path(models_dir, f"{model_name}-screen", "onnx")
+    if os.path.exists(screen_path):
+        screen = OnnxRuntimeBackend(screen_path, "classifier", name="onnx-screen")
+        shape = screen.session.get_inputs()[0].shape[2:]
+        if all(isinstance(side, int) for side in shape):
+            screen_size = shape[0]
+    else:
+        screen = full
+    print(f"  screen: {screen.name} at {screen_size}x{screen_size}")
+
+    full_preprocessor = ClassifierPreprocessor(CLASSIFIER_SIZE, DEVICE)
+    screen_preprocessor = ClassifierPreprocessor((screen_size, screen_size), DEVICE)
+    timer = StageTimer()
+    negative = NEGATIVE_CLASS_INDEX[model_name]
+
+    samples = []
+    for row in rows:
+        label = resolve_label(model_name, row)
+        if label is None:
+            continue
+        data = row["image_base64"]
+        if data.startswith("data:"):
+            data = data.split(",", 1)[1]
+        try:
+            image = decode_image(base64.b64decode(data), min_size=CLASSIFIER_SIZE)
+        except Exception:
+            continue
+        screen_probs, screen_ms = _timed(screen, screen_preprocessor(image, timer))
+        full_probs, full_ms = _timed(full, full_preprocessor(image, timer))
+        samples.append({
+            "label": label,
+            "screen_positive": 1.0 - float(screen_probs[0, negative]),
+            "screen_pred": int(screen_probs.argmax(dim=1)[0]),
+            "classes": int(screen_probs.shape[1]),
+            "full_pred": int(full_probs.argmax(dim=1)[0]),
+            "screen_ms": screen_ms,
+            "full_ms": full_ms,
+        })
+    if not samples:
+        print("  no labeled attendances with readable images")
+        return []
+
+    screen_ms = statistics.median(sample["screen_ms"] for sample in samples)
+    full_ms = statistics.median(sample["full_ms"] for sample in samples)
+    positives = sum(sample["label"] != negative for sample in samples)
+    full_correct = sum(sample["full_pred"] == sample["label"] for sample in samples)
+    full_missed = sum(sample["label"] != negative and sample["full_pred"] == negative for sample in samples)
+    print(f"  {len(samples)} labeled images ({positives} positive); p50 screen {screen_ms:.1f} ms, full {full_ms:.1f} ms")
+    print(f"  {'band':<14}{'screen %':>9}{'ms/img':>9}{'speedup':>9}{'acc %':>8}{'missed +':>10}")
+    print(f"  {'full only':<14}{0.0:>9.1f}{full_ms:>9.1f}{1.0:>9.2f}"
+          f"{100 * full_correct / len(samples):>8.1f}{full_missed:>10}")
+
+    results = []
+    for low, high in bands:
+        decided = [screen_decides((low, high), sample["screen_positive"], sample["classes"]) for sample in samples]
+        predictions = [sample["screen_pred"] if by_screen else sample["full_pred"]
+                       for sample, by_screen in zip(samples, decided)]
+        screen_rate = sum(decided) / len(samples)
+        latency = screen_ms + (1 - screen_rate) * full_ms
+        correct = sum(prediction == sample["label"] for prediction, sample in zip(predictions, samples))
+        missed = sum(sample["label"] != negative and prediction == negative
+                     for prediction, sample in zip(predictions, samples))
+        results.append({
+            "band": [low, high], "screen_rate": screen_rate, "ms_per_image": latency,
+            "accuracy": correct / len(samples), "missed_positives": missed,
+        })
+        print(f"  {f'{low}:{high}':<14}{100 * screen_rate:>9.1f}{latency:>9.1f}{full_ms / latency:>9.2f}"
+              f"{100 * correct / len(samples):>8.1f}{missed:>10}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", nargs="+", choices=list(CLASS_NAMES), default=list(CLASS_NAMES))
+    parser.add_argument("--limit", type=int, default=2000)
+    parser.add_argument("--simulate", action="store_true")
+    parser.add_argument("--bands", nargs="+", help="low:high pairs to replay (default: the configured band)")
+    parser.add_argument("--screen-size", type=int, default=int(os.environ.get("CASCADE_SCREEN_SIZE", 112)))
+    parser.add_argument("--models-dir", default=os.environ.get("INFERENCE_MODELS_DIR", "exported_models"))
+    args = parser.parse_args()
+
+    configured = parse_cascade_bands(os.environ.get("CASCADE_BANDS", ""))
+    for model_name in args.models:
+        print(f"\n== {model_name} ==")
+        rows = asyncio.run(fetch_attendances(model_name, args.limit))
+        if not args.simulate:
+            report_stored(model_name, rows)
+            continue
+        bands = ([tuple(float(value) for value in band.split(":", 1)) for band in args.bands]
+                 if args.bands else [configured[model_name]])
+        simulate(model_name, rows, bands, args.screen_size, args.models_dir)
+
+    if args.simulate:
+        print("\nSet the chosen band with CASCADE_BANDS=<model>=<low>:<high> and enable with CASCADE_MODELS.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Latency against recall of the breast detection profiles (src.utils.detection_profiles)
+on a labeled set of mammograms.
+
+Usage (from api/):
+    python scripts/benchmark_detection_profiles.py --annotations labeled_set.json
+        [--profiles fast accurate tiled] [--iou 0.5] [--repeats 3] [--budget-ms 8000]
+
+Annotation file: ground-truth masses in original-image pixels, paths relative to the file:
+    {"images": [{"path": "case_001.jpg", "boxes": [[x1, y1, x2, y2], ...]}, ...]}
+
+Each image goes through the same path as the API (decode_image at the profile's
+max_side, DetectorPreprocessor or tiled inference, profile-configured Faster
+R-CNN). Predicted boxes
+are mapped back to original pixels, and a ground-truth box counts as found when a
+prediction overlaps it with IoU >= --iou. Latency is the model call only, best
+of --repeats, reported as p50/p95 over the images (for "tiled" it includes the
+coarse pass and is bounded by --budget-ms).
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+
+import torch
+from PIL import Image
+from torchvision.ops import box_iou
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_models import DEVICE, EAGER_LOADERS  # noqa: E402
+from src.utils.detection_profiles import DETECTION_PROFILES, configure_detector  # noqa: E402
+from src.utils.image_ingest import decode_image, EXIF_ORIENTATION_TAG, TRANSPOSED_ORIENTATIONS  # noqa: E402
+from src.utils.preprocessing import DetectorPreprocessor, StageTimer  # noqa: E402
+from src.utils.tiled_detection import detect_tiled  # noqa: E402
+
+
+def load_annotations(path: str):
+    with open(path) as file:
+        manifest = json.load(file)
+    base_dir = os.path.dirname(os.path.abspath(path))
+    cases = []
+    for entry in manifest["images"]:
+        with open(os.path.join(base_dir, entry["path"]), "rb") as image_file:
+            data = image_file.read()
+        cases.append((data, torch.tensor(entry["boxes"], dtype=torch.float32).reshape(-1, 4)))
+    return cases
+
+
+def run_profile(name: str, base_model, cases, iou_threshold: float, repeats: int, budget_ms: int):
+    profile = DETECTION_PROFILES[name]
+    detector = configure_detector(base_model, profile)
+    preprocessor = DetectorPreprocessor(profile["max_side"], DEVICE)
+    timer = StageTimer()
+    tiling = profile.get("tiling")
+    if tiling:
+        tiling = {**tiling, "budget_ms": budget_ms}
+        coarse_detector = configure_detector(base_model, DETECTION_PROFILES[tiling["coarse_profile"]])
+
+    def detect(image):
+        """Boxes in the coordinates of the returned image."""
+        if tiling:
+            display_image, boxes, _, _, _ = detect_tiled(coarse_detector, detector, image, tiling, DEVICE, timer)
+            return display_image, boxes
+        resized, tensor = preprocessor(image, timer)
+        with torch.no_grad():
+            return resized, detector([tensor])[0]["boxes"]
+
+    latencies, found, total, predicted = [], 0, 0, 0
+    for data, truth in cases:
+        decoded = decode_image(data, max_side=profile["max_side"])
+        original_width, original_height = _original_size(data)
+
+        best = None
+        for _ in range(repeats):
+            start = time.perf_counter()
+            image, boxes = detect(decoded)
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+
+        # Caixas de volta para os pixels da imagem original
+        scale = torch.tensor([original_width / image.width, original_height / image.height] * 2)
+        boxes = boxes * scale
+        predicted += len(boxes)
+        total += len(truth)
+        if len(truth) and len(boxes):
+            found += int((box_iou(truth, boxes).max(dim=1).values >= iou_threshold).sum())
+
+    ordered = sorted(latencies)
+    return {
+        "profile": name,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        "recall": 100 * found / total if total else float("nan"),
+        "detections_per_image": predicted / len(cases),
+    }
+
+
+def _original_size(data: bytes):
+    """Upright size of the uploaded image (EXIF orientation applied, header only)."""
+    with Image.open(io.BytesIO(data)) as image:
+        width, height = image.size
+        if image.getexif().get(EXIF_ORIENTATION_TAG, 1) in TRANSPOSED_ORIENTATIONS:
+            width, height = height, width
+    return width, height
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--annotations", required=True)
+    parser.add_argument("--profiles", nargs="+", choices=list(DETECTION_PROFILES), default=list(DETECTION_PROFILES))
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--budget-ms", type=int, default=int(os.environ.get("BREAST_TILED_BUDGET_MS", 8000)))
+    args = parser.parse_args()
+
+    cases = load_annotations(args.annotations)
+    base_model = EAGER_LOADERS["breast"]()
+    print(f"{len(cases)} images, {sum(len(truth) for _, truth in cases)} ground-truth masses, "
+          f"IoU >= {args.iou}, torch threads: {torch.get_num_threads()}")
+    print(f"{'profile':<12}{'p50 ms':>10}{'p95 ms':>10}{'recall %':>10}{'det/img':>10}")
+    for name in args.profiles:
+        result = run_profile(name, base_model, cases, args.iou, args.repeats, args.budget_ms)
+        print(f"{result['profile']:<12}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+              f"{result['recall']:>10.1f}{result['detections_per_image']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
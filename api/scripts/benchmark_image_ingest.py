@@ -0,0 +1,100 @@
+"""
+Benchmark of reduced-resolution decoding (src.utils.image_ingest) against the
+previous Image.open(...).convert('RGB') + resize path, across typical X-ray
+and mammogram sizes.
+
+Usage (from api/):
+    python scripts/benchmark_image_ingest.py [--repeats 5]
+
+Synthetic images are generated in memory (grayscale noise over a gradient, which
+compresses roughly like a radiograph). 'decoded MP' is the size of the image
+handed to the final resize. For JPEG that is the only pixel buffer allocated.
+PNG has no reduced-scale decoding, so the full frame still exists briefly
+before Image.reduce.
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+
+from src.utils.image_ingest import decode_image  # noqa: E402
+
+SIZES = [(1500, 1500), (3000, 2500), (4000, 5000), (5300, 7500)]  # ~2, 7.5, 20, 40 MP
+TARGETS = {
+    "classifier 224x224": {"min_size": (224, 224)},
+    "detector max 1024": {"max_side": 1024},
+}
+
+
+def _synthetic_xray(width: int, height: int, fmt: str) -> bytes:
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(40, 200, width, dtype=np.float32)[None, :].repeat(height, axis=0)
+    pixels = np.clip(gradient + rng.normal(0, 12, (height, width)), 0, 255).astype(np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, "L").save(buffer, format=fmt, quality=90)
+    return buffer.getvalue()
+
+
+def _final_size(image: Image.Image, target: dict):
+    if "min_size" in target:
+        return target["min_size"]
+    scale = min(1.0, target["max_side"] / max(image.size))
+    return max(1, int(image.width * scale)), max(1, int(image.height * scale))
+
+
+def _legacy(data: bytes, target: dict):
+    image = Image.open(io.BytesIO(data)).convert("RGB")
+    decoded = image.size
+    image.resize(_final_size(image, target), Image.Resampling.BILINEAR)
+    return decoded
+
+
+def _ingest(data: bytes, target: dict):
+    image = decode_image(data, **target)
+    decoded = image.size
+    image.resize(_final_size(image, target), Image.Resampling.BILINEAR)
+    return decoded
+
+
+def _time(fn, data, target, repeats):
+    decoded = fn(data, target)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(data, target)
+    return (time.perf_counter() - start) * 1000 / repeats, decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    columns = ["format", "source", "target", "legacy_ms", "ingest_ms", "speedup", "legacy_decoded_mp", "ingest_decoded_mp"]
+    print(" | ".join(columns))
+    for fmt in ("JPEG", "PNG"):
+        for width, height in SIZES:
+            data = _synthetic_xray(width, height, fmt)
+            for target_name, target in TARGETS.items():
+                legacy_ms, legacy_size = _time(_legacy, data, target, args.repeats)
+                ingest_ms, ingest_size = _time(_ingest, data, target, args.repeats)
+                print(" | ".join([
+                    fmt,
+                    f"{width}x{height} ({width * height / 1e6:.1f} MP, {len(data) / 1e6:.1f} MB)",
+                    target_name,
+                    f"{legacy_ms:.1f}",
+                    f"{ingest_ms:.1f}",
+                    f"{legacy_ms / ingest_ms:.1f}x",
+                    f"{legacy_size[0] * legacy_size[1] / 1e6:.2f}",
+                    f"{ingest_size[0] * ingest_size[1] / 1e6:.2f}",
+                ]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Latency and throughput of the exported inference backends (TorchScript, ONNX
+Runtime on CPU) against the eager PyTorch path.
+
+Usage (from api/), after scripts/export_models.py:
+    python scripts/export_models.py --format onnx --format torchscript
+    python scripts/benchmark_inference_backends.py [--models tuberculosis breast]
+        [--iterations 50] [--concurrency 2] [--images sample.jpg]
+
+For every model and every backend with an export in --models-dir:
+- latency: one request at a time, p50/p95 in ms (model call only; preprocessing
+  is identical across backends and is timed in /api/metrics);
+- throughput: --concurrency threads calling the backend in a loop, like the
+  API's inference pool (INFERENCE_WORKERS), in inferences per second.
+
+Thread settings come from the same variables the API reads (ORT_INTRA_OP_THREADS,
+ORT_INTER_OP_THREADS), so runs with different values can be compared directly.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_models import (  # noqa: E402
+    DEVICE, EAGER_LOADERS, MODEL_KINDS, load_images, model_inputs
+)
+from src.utils.inference_backend import (  # noqa: E402
+    EagerBackend, create_inference_backend, exported_model_path, EXPORT_EXTENSIONS
+)
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+def measure_latency(backend, inputs, iterations: int):
+    timings = []
+    for index in range(iterations):
+        start = time.perf_counter()
+        backend(inputs[index % len(inputs)])
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), _percentile(timings, 95)
+
+
+def measure_throughput(backend, inputs, iterations: int, concurrency: int):
+    def worker(offset):
+        for index in range(iterations):
+            backend(inputs[(offset + index) % len(inputs)])
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(concurrency)))
+    return concurrency * iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", nargs="+", choices=list(MODEL_KINDS), default=list(MODEL_KINDS))
+    parser.add_argument("--models-dir", default=os.environ.get("INFERENCE_MODELS_DIR", "exported_models"))
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=int(os.environ.get("INFERENCE_WORKERS", 2)))
+    parser.add_argument("--images", nargs="*", help="sample images (default: synthetic radiographs)")
+    args = parser.parse_args()
+
+    intra_op = int(os.environ.get("ORT_INTRA_OP_THREADS", 0))
+    inter_op = int(os.environ.get("ORT_INTER_OP_THREADS", 1))
+    images = load_images(args.images)
+    print(f"torch threads: {torch.get_num_threads()}, ORT intra/inter-op threads: {intra_op}/{inter_op}, "
+          f"concurrency: {args.concurrency}")
+
+    header = f"{'model':<14}{'backend':<13}{'p50 ms':>10}{'p95 ms':>10}{'inf/s':>10}{'speedup':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for model_name in args.models:
+        kind = MODEL_KINDS[model_name]
+        inputs = model_inputs(model_name, images)
+        backends = [EagerBackend(EAGER_LOADERS[model_name](), kind)]
+        for fmt in EXPORT_EXTENSIONS:
+            if os.path.exists(exported_model_path(args.models_dir, model_name, fmt)):
+                backend = create_inference_backend(model_name, kind, fmt, lambda: None, DEVICE,
+                                                   args.models_dir, intra_op, inter_op)
+                if backend.name == fmt:
+                    backends.append(backend)
+
+        eager_p50 = None
+        for backend in backends:
+            for index in range(args.warmup):
+                backend(inputs[index % len(inputs)])
+            p50, p95 = measure_latency(backend, inputs, args.iterations)
+            throughput = measure_throughput(backend, inputs, max(1, args.iterations // args.concurrency),
+                                            args.concurrency)
+            eager_p50 = eager_p50 or p50
+            print(f"{model_name:<14}{backend.name:<13}{p50:>10.1f}{p95:>10.1f}{throughput:>10.1f}"
+                  f"{eager_p50 / p50:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
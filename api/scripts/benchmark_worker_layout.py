@@ -0,0 +1,151 @@
+"""
+Throughput of the API's inference at 1/2/4/8 server workers, with the thread
+layout of src.utils.runtime_config against torch's default (every worker using
+every core).
+
+Usage (from api/):
+    python scripts/benchmark_worker_layout.py [--models tuberculosis] [--workers 1 2 4 8]
+        [--slots 2] [--duration 20] [--backend eager] [--affinity] [--images sample.jpg]
+
+Each worker is a separate process (like gunicorn/uvicorn workers) that loads
+the model through the API's own path (create_inference_backend) and runs
+--slots threads calling it in a loop, like its inference pool
+(INFERENCE_WORKERS). All workers start together and run for --duration
+seconds; the table shows the aggregate inferences per second and the p50/p95
+latency of one call. Layouts:
+- default: torch/ONNX Runtime thread defaults (one intra-op thread per core in
+  every worker and slot: oversubscribed as soon as workers x slots > 1);
+- layout: intra-op threads = CPUs // workers // slots (CPUs from the affinity
+  mask and cgroup quota), each worker pinned to its CPU slice with --affinity.
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import threading
+import time
+
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_models import DEVICE, EAGER_LOADERS, MODEL_KINDS, load_images, model_inputs  # noqa: E402
+from src.utils.inference_backend import create_inference_backend  # noqa: E402
+from src.utils.runtime_config import (  # noqa: E402
+    affinity_cpus, effective_cpus, plan_thread_layout, worker_cpu_slice
+)
+
+LAYOUTS = ("default", "layout")
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))]
+
+
+def run_worker(worker_index, options, barrier, results):
+    """One server worker: applies the layout, loads the model, then calls it from `slots` threads."""
+    ort_intra_op_threads = 0
+    if options["layout"] == "layout":
+        cpus, _ = effective_cpus()
+        layout = plan_thread_layout(cpus, options["workers"], options["slots"])
+        if options["affinity"] and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, worker_cpu_slice(affinity_cpus(), worker_index, options["workers"]))
+        torch.set_num_threads(layout["intra_op_threads"])
+        torch.set_num_interop_threads(layout["inter_op_threads"])
+        ort_intra_op_threads = layout["intra_op_threads"]
+
+    model_name = options["model"]
+    backend = create_inference_backend(
+        model_name, MODEL_KINDS[model_name], options["backend"], EAGER_LOADERS[model_name], DEVICE,
+        options["models_dir"], ort_intra_op_threads, 1
+    )
+    inputs = model_inputs(model_name, load_images(options["images"]))
+    with torch.no_grad():
+        for index in range(options["warmup"]):
+            backend(inputs[index % len(inputs)])
+
+    latencies = []
+    lock = threading.Lock()
+
+    def slot(offset, deadline):
+        timings = []
+        index = offset
+        with torch.no_grad():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                backend(inputs[index % len(inputs)])
+                timings.append((time.perf_counter() - start) * 1000)
+                index += 1
+        with lock:
+            latencies.extend(timings)
+
+    barrier.wait()
+    deadline = time.perf_counter() + options["duration"]
+    threads = [threading.Thread(target=slot, args=(offset, deadline)) for offset in range(options["slots"])]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put(latencies)
+
+
+def measure(options):
+    """Aggregate inferences/s and per-call latencies of `options['workers']` concurrent workers."""
+    context = multiprocessing.get_context("spawn")  # Cada worker começa sem pools de threads herdados
+    barrier = context.Barrier(options["workers"])
+    results = context.Queue()
+    processes = [
+        context.Process(target=run_worker, args=(index, options, barrier, results))
+        for index in range(options["workers"])
+    ]
+    for process in processes:
+        process.start()
+    latencies = []
+    for _ in processes:
+        latencies.extend(results.get())
+    for process in processes:
+        process.join()
+    return len(latencies) / options["duration"], latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", nargs="+", choices=list(MODEL_KINDS), default=["tuberculosis"])
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--slots", type=int, default=int(os.environ.get("INFERENCE_WORKERS", 2)))
+    parser.add_argument("--layouts", nargs="+", choices=LAYOUTS, default=list(LAYOUTS))
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load per run")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--backend", default=os.environ.get("INFERENCE_BACKEND", "eager"))
+    parser.add_argument("--models-dir", default=os.environ.get("INFERENCE_MODELS_DIR", "exported_models"))
+    parser.add_argument("--affinity", action="store_true", help="pin each worker to its CPU slice (layout only)")
+    parser.add_argument("--images", nargs="*", help="sample images (default: synthetic radiographs)")
+    args = parser.parse_args()
+
+    cpus, source = effective_cpus()
+    print(f"CPUs: {cpus} ({source}), inference slots per worker: {args.slots}, backend: {args.backend}, "
+          f"{args.duration:.0f}s per run")
+
+    header = f"{'model':<14}{'layout':<9}{'workers':>8}{'threads':>9}{'inf/s':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for model_name in args.models:
+        for layout in args.layouts:
+            for workers in args.workers:
+                options = {
+                    "model": model_name, "layout": layout, "workers": workers, "slots": args.slots,
+                    "duration": args.duration, "warmup": args.warmup, "backend": args.backend,
+                    "models_dir": args.models_dir, "affinity": args.affinity, "images": args.images,
+                }
+                throughput, latencies = measure(options)
+                threads = (plan_thread_layout(cpus, workers, args.slots)["intra_op_threads"]
+                           if layout == "layout" else torch.get_num_threads())
+                p50 = statistics.median(latencies) if latencies else 0.0
+                p95 = _percentile(latencies, 95) if latencies else 0.0
+                print(f"{model_name:<14}{layout:<9}{workers:>8}{threads:>9}{throughput:>10.1f}{p50:>10.1f}{p95:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Exports the prediction models to TorchScript and/or ONNX for the non-eager
+inference backends (src.utils.inference_backend), then checks that every export
+reproduces the eager PyTorch outputs within tolerance.
+
+Usage (from api/):
+    python scripts/export_models.py --format onnx [--format torchscript]
+        [--models tuberculosis osteoporosis breast respiratory]
+        [--output-dir exported_models] [--images sample1.jpg sample2.png]
+        [--skip-parity]
+
+- tuberculosis / osteoporosis: traced (TorchScript) or exported with a dynamic batch axis (ONNX).
+- breast (Faster R-CNN): scripted (TorchScript) or exported for one image of
+  variable size per call (ONNX, opset 17), like the use case calls it.
+- respiratory (YOLO): exported through ultralytics at imgsz 640 and loaded back
+  through ultralytics.
+
+Parity runs the exported file through the same backend class the API uses.
+Inputs come from --images (preprocessed exactly like the API does) or, without
+images, from seeded synthetic radiograph-like images. The exit status is 1 if
+any export fails or drifts beyond tolerance.
+"""
+import argparse
+import os
+import shutil
+import sys
+
+import numpy as np
+import torch
+from PIL import Image
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, API_DIR)
+
+from src.neural_network_weights.load_models import (  # noqa: E402
+    load_model_respiratory_diseases, load_model_breast_cancer, load_model_tuberculosis, load_model_osteoporosis
+)
+from src.utils.inference_backend import (  # noqa: E402
+    EagerBackend, create_inference_backend, exported_model_path
+)
+from src.utils.preprocessing import (  # noqa: E402
+    ClassifierPreprocessor, DetectorPreprocessor, StageTimer
+)
+
+DEVICE = torch.device("cpu")  # Produção roda em CPU
+MODEL_KINDS = {
+    "tuberculosis": "classifier",
+    "osteoporosis": "classifier",
+    "breast": "detector",
+    "respiratory": "yolo",
+}
+EAGER_LOADERS = {
+    "tuberculosis": lambda: load_model_tuberculosis(DEVICE),
+    "osteoporosis": lambda: load_model_osteoporosis(DEVICE),
+    "breast": lambda: load_model_breast_cancer(DEVICE),
+    "respiratory": load_model_respiratory_diseases,
+}
+CLASSIFIER_SIZE = (224, 224)
+DETECTOR_MAX_SIDE = 1024
+YOLO_IMGSZ = 640
+ONNX_OPSET = 17
+EXPORT_FORMATS = ["onnx", "torchscript"]  # onnx-int8 vem de scripts/quantize_models.py
+
+# Tolerâncias da checagem de paridade
+LOGITS_ATOL = 1e-3
+BOX_ATOL = 1.0  # pixels
+SCORE_ATOL = 1e-2
+DETECTION_SCORE_THRESHOLD = 0.7  # Mesmo limiar do use case
+
+
+def synthetic_images(count: int = 4):
+    """Radiograph-like test images (gradient plus noise), reproducible."""
+    rng = np.random.default_rng(0)
+    images = []
+    for index in range(count):
+        width, height = 900 + 150 * index, 1100 - 100 * index
+        gradient = np.linspace(30, 210, width, dtype=np.float32)[None, :].repeat(height, axis=0)
+        pixels = np.clip(gradient + rng.normal(0, 15, (height, width)), 0, 255).astype(np.uint8)
+        images.append(Image.fromarray(pixels, "L").convert("RGB"))
+    return images
+
+
+def load_images(paths):
+    if not paths:
+        return synthetic_images()
+    return [Image.open(path).convert("RGB") for path in paths]
+
+
+def model_inputs(model_name: str, images):
+    """Inputs in the form the use case hands to the backend for this model."""
+    kind = MODEL_KINDS[model_name]
+    timer = StageTimer()
+    if kind == "classifier":
+        preprocessor = ClassifierPreprocessor(CLASSIFIER_SIZE, DEVICE)
+        return [preprocessor(image, timer) for image in images]
+    if kind == "detector":
+        preprocessor = DetectorPreprocessor(DETECTOR_MAX_SIDE, DEVICE)
+        return [[preprocessor(image, timer)[1]] for image in images]
+    return list(images)
+
+
+# --- Exportação ---
+
+def export_classifier(model, fmt: str, path: str):
+    example = torch.randn(1, 3, *CLASSIFIER_SIZE)
+    if fmt == "torchscript":
+        with torch.no_grad():
+            traced = torch.jit.trace(model, example)
+        traced.save(path)
+    else:
+        torch.onnx.export(
+            model, example, path,
+            input_names=["input"], output_names=["logits"],
+            dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=ONNX_OPSET,
+        )
+
+
+def export_detector(model, fmt: str, path: str):
+    if fmt == "torchscript":
+        torch.jit.script(model).save(path)
+    else:
+        example = torch.rand(3, DETECTOR_MAX_SIDE, int(DETECTOR_MAX_SIDE * 0.8))
+        torch.onnx.export(
+            model, ([example],), path,
+            input_names=["image"], output_names=["boxes", "labels", "scores"],
+            dynamic_axes={
+                "image": {1: "height", 2: "width"},
+                "boxes": {0: "detections"}, "labels": {0: "detections"}, "scores": {0: "detections"},
+            },
+            opset_version=ONNX_OPSET,
+        )
+
+
+def export_yolo(model, fmt: str, path: str):
+    # O ultralytics grava a exportação ao lado dos pesos; movemos para o diretório de saída
+    exported = model.export(format=fmt, imgsz=YOLO_IMGSZ)
+    shutil.move(str(exported), path)
+
+
+EXPORTERS = {"classifier": export_classifier, "detector": export_detector, "yolo": export_yolo}
+
+
+# --- Paridade ---
+
+def _compare_classifier(reference, candidate):
+    diff = (reference.float() - candidate.float()).abs().max().item()
+    same_class = bool((reference.argmax(dim=1) == candidate.argmax(dim=1)).all())
+    return diff <= LOGITS_ATOL and same_class, f"max |logit diff| {diff:.2e}, same class: {same_class}"
+
+
+def _compare_detector(reference, candidate):
+    reference, candidate = reference[0], candidate[0]
+    ref_keep = reference["scores"] >= DETECTION_SCORE_THRESHOLD
+    cand_keep = candidate["scores"] >= DETECTION_SCORE_THRESHOLD
+    ref_boxes, cand_boxes = reference["boxes"][ref_keep], candidate["boxes"][cand_keep]
+    if len(ref_boxes) != len(cand_boxes):
+        return False, f"{len(ref_boxes)} vs {len(cand_boxes)} detections above {DETECTION_SCORE_THRESHOLD}"
+    if len(ref_boxes) == 0:
+        return True, "no detections on either side"
+    box_diff = (ref_boxes - cand_boxes).abs().max().item()
+    score_diff = (reference["scores"][ref_keep] - candidate["scores"][cand_keep]).abs().max().item()
+    ok = box_diff <= BOX_ATOL and score_diff <= SCORE_ATOL
+    return ok, f"{len(ref_boxes)} detections, max |box diff| {box_diff:.2f}px, max |score diff| {score_diff:.2e}"
+
+
+def _compare_yolo(reference, candidate):
+    ref_probs, cand_probs = reference[0].probs, candidate[0].probs
+    if ref_probs is None or cand_probs is None:
+        return True, "not a classification model, skipped"
+    diff = float((ref_probs.data.cpu() - cand_probs.data.cpu()).abs().max())
+    same_class = ref_probs.top1 == cand_probs.top1
+    return diff <= SCORE_ATOL and same_class, f"max |prob diff| {diff:.2e}, same class: {same_class}"
+
+
+COMPARATORS = {"classifier": _compare_classifier, "detector": _compare_detector, "yolo": _compare_yolo}
+
+
+def check_parity(model_name: str, eager: EagerBackend, exported, inputs) -> bool:
+    """Runs eager and exported backends on the same inputs and reports the drift."""
+    compare = COMPARATORS[MODEL_KINDS[model_name]]
+    all_ok = True
+    for index, model_input in enumerate(inputs):
+        ok, message = compare(eager(model_input), exported(model_input))
+        all_ok = all_ok and ok
+        print(f"    input {index}: {'OK  ' if ok else 'FAIL'} {message}")
+    return all_ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--format", action="append", choices=EXPORT_FORMATS, required=True)
+    parser.add_argument("--models", nargs="+", choices=list(MODEL_KINDS), default=list(MODEL_KINDS))
+    parser.add_argument("--output-dir", default=os.environ.get("INFERENCE_MODELS_DIR", "exported_models"))
+    parser.add_argument("--images", nargs="*", help="sample images for the parity check")
+    parser.add_argument("--skip-parity", action="store_true")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    images = load_images(args.images)
+    failures = []
+
+    for model_name in args.models:
+        kind = MODEL_KINDS[model_name]
+        eager = EagerBackend(EAGER_LOADERS[model_name](), kind)
+        inputs = None if args.skip_parity else model_inputs(model_name, images)
+
+        for fmt in args.format:
+            path = exported_model_path(args.output_dir, model_name, fmt)
+            print(f"{model_name} -> {fmt}: {path}")
+            try:
+                EXPORTERS[kind](eager.model, fmt, path)
+            except Exception as e:
+                print(f"    export FAILED: {e}")
+                failures.append(f"{model_name}/{fmt}")
+                continue
+            if args.skip_parity:
+                continue
+            exported = create_inference_backend(model_name, kind, fmt, lambda: None, DEVICE, args.output_dir)
+            if isinstance(exported, EagerBackend) and exported.name == "eager":
+                print("    export could not be loaded back (see log)")
+                failures.append(f"{model_name}/{fmt}")
+            elif not check_parity(model_name, eager, exported, inputs):
+                failures.append(f"{model_name}/{fmt}")
+
+    if failures:
+        print(f"\nFailed: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nAll exports OK")
+
+
+if __name__ == "__main__":
+    main()
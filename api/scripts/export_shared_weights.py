@@ -0,0 +1,67 @@
+"""
+Writes the PyTorch weights of the prediction models as memory-mappable files
+for INFERENCE_SHARED_WEIGHTS (src.utils.shared_weights), then checks that a model
+running on the mapped weights reproduces the original outputs.
+
+Usage (from api/):
+    python scripts/export_shared_weights.py [--models tuberculosis osteoporosis breast respiratory]
+        [--output-dir exported_models] [--images sample1.jpg sample2.png] [--skip-parity]
+
+Each model is written to <output-dir>/<model>.weights.pt. The parity check
+loads a second copy of the model through the API's own path
+(create_inference_backend with shared_weights=True) and compares it with the
+original on the inputs of scripts/export_models.py. Re-run this script whenever
+the weights in neural_network_weights change: the API maps these files as they are.
+YOLO weights are written fused (conv+bn); files written unfused no longer load
+and the API falls back to private weights until they are exported again.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_models import DEVICE, EAGER_LOADERS, MODEL_KINDS, check_parity, load_images, model_inputs  # noqa: E402
+from src.utils.inference_backend import EagerBackend, create_inference_backend  # noqa: E402
+from src.utils.shared_weights import save_shared_weights, shared_weights_path, torch_module  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", nargs="+", choices=list(MODEL_KINDS), default=list(MODEL_KINDS))
+    parser.add_argument("--output-dir", default=os.environ.get("INFERENCE_MODELS_DIR", "exported_models"))
+    parser.add_argument("--images", nargs="*", help="sample images for the parity check")
+    parser.add_argument("--skip-parity", action="store_true")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    images = load_images(args.images)
+    failures = []
+
+    for model_name in args.models:
+        kind = MODEL_KINDS[model_name]
+        eager = EagerBackend(EAGER_LOADERS[model_name](), kind)
+        path = shared_weights_path(args.output_dir, model_name)
+        try:
+            save_shared_weights(torch_module(eager.model, kind), path)
+        except Exception as e:
+            print(f"{model_name}: export FAILED: {e}")
+            failures.append(model_name)
+            continue
+        print(f"{model_name} -> {path} ({os.path.getsize(path) / (1024 * 1024):.1f} MB)")
+        if args.skip_parity:
+            continue
+
+        mapped = create_inference_backend(
+            model_name, kind, "eager", EAGER_LOADERS[model_name], DEVICE, args.output_dir, shared_weights=True
+        )
+        if not check_parity(model_name, eager, mapped, model_inputs(model_name, images)):
+            failures.append(model_name)
+
+    if failures:
+        print(f"\nFailed: {', '.join(failures)}")
+        sys.exit(1)
+    print("\nAll weights written. Enable with INFERENCE_SHARED_WEIGHTS=true.")
+
+
+if __name__ == "__main__":
+    main()
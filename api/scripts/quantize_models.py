@@ -0,0 +1,271 @@
+"""
+Post-training int8 quantization of the classification models (tuberculosis,
+osteoporosis), calibrated on stored attendances, with an accuracy/latency/memory
+report to decide per model whether to enable it (INFERENCE_INT8_MODELS).
+
+Usage (from api/, with the database settings of the API in .env):
+    python scripts/export_models.py --format onnx --models tuberculosis osteoporosis
+    python scripts/quantize_models.py --mode static [--models tuberculosis]
+        [--calibration-size 200] [--eval-size 1000] [--calibrate-method minmax]
+        [--report quantization_report.json]
+
+Modes (ONNX Runtime quantization of the fp32 ONNX export):
+- static: weights and activations in int8 (QDQ, per-channel weights). Activation
+  ranges come from running the calibration images through the fp32 graph.
+- dynamic: int8 weights, activation ranges computed per inference. No
+  calibration data needed, smaller speedup on CNNs.
+
+Data: the most recent attendances of each model that have an image. The
+calibration set is the first --calibration-size images (labels not needed). The
+evaluation set is the remaining attendances whose label can be resolved:
+expected_result matching a class name (case-insensitive), or the model's own
+class when the professional marked the diagnosis as correct. Images are
+preprocessed exactly like the API does (decode_image + ClassifierPreprocessor).
+
+The report compares eager PyTorch fp32 (the current default), ONNX fp32 and ONNX
+int8: accuracy on the evaluation set, delta vs eager, agreement with eager
+predictions, p50 latency, file size and resident memory added by loading the model.
+"""
+import argparse
+import asyncio
+import base64
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+import asyncpg
+import numpy as np
+import psutil
+import torch
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from export_models import CLASSIFIER_SIZE, DEVICE, EAGER_LOADERS  # noqa: E402
+from src.db.database import get_database  # noqa: E402
+from src.utils.image_ingest import decode_image  # noqa: E402
+from src.utils.inference_backend import EagerBackend, OnnxRuntimeBackend, exported_model_path  # noqa: E402
+from src.utils.preprocessing import ClassifierPreprocessor, StageTimer  # noqa: E402
+
+# Mesma ordem de classes dos use cases
+CLASS_NAMES = {
+    "tuberculosis": ["negative", "positive"],
+    "osteoporosis": ["Normal", "Osteopenia", "Osteoporosis"],
+}
+
+
+async def fetch_attendances(model_name: str, limit: int):
+    """Most recent attendances of a model that carry an image."""
+    conn = await asyncpg.connect(dsn=get_database())
+    try:
+        return await conn.fetch(
+            """
+            SELECT image_base64, expected_result, correct_diagnosis, model_result
+            FROM attendances
+            WHERE model_used = $1 AND image_base64 IS NOT NULL AND image_base64 <> ''
+            ORDER BY attendance_date DESC
+            LIMIT $2
+            """,
+            model_name, limit
+        )
+    finally:
+        await conn.close()
+
+
+def resolve_label(model_name: str, row):
+    """Class index of an attendance, or None if it cannot be told from the record."""
+    classes = [name.lower() for name in CLASS_NAMES[model_name]]
+    expected = (row["expected_result"] or "").strip().lower()
+    if expected in classes:
+        return classes.index(expected)
+    if row["correct_diagnosis"]:
+        try:
+            predicted = json.loads(row["model_result"]).get("class_pred", "").lower()
+        except (TypeError, ValueError, AttributeError):
+            return None
+        if predicted in classes:
+            return classes.index(predicted)
+    return None
+
+
+def preprocess(rows):
+    """Model inputs (NCHW float32 arrays) and labels, skipping unreadable images."""
+    preprocessor = ClassifierPreprocessor(CLASSIFIER_SIZE, DEVICE)
+    timer = StageTimer()
+    samples = []
+    for row in rows:
+        data = row["image_base64"]
+        if data.startswith("data:"):
+            data = data.split(",", 1)[1]
+        try:
+            image = decode_image(base64.b64decode(data), min_size=CLASSIFIER_SIZE)
+        except Exception:
+            continue
+        samples.append((preprocessor(image, timer).contiguous().numpy(), row))
+    return samples
+
+
+class CalibrationReader:
+    """onnxruntime.quantization CalibrationDataReader over preprocessed inputs."""
+
+    def __init__(self, input_name: str, inputs):
+        self.input_name = input_name
+        self.inputs = iter(inputs)
+
+    def get_next(self):
+        array = next(self.inputs, None)
+        return None if array is None else {self.input_name: array}
+
+
+def quantize(model_name: str, fp32_path: str, int8_path: str, mode: str, calibration, calibrate_method: str):
+    from onnxruntime.quantization import (
+        CalibrationMethod, QuantFormat, QuantType, quantize_dynamic, quantize_static
+    )
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Inferência de shapes e fusões antes de quantizar (recomendado pelo ORT)
+        prepared = os.path.join(tmp_dir, f"{model_name}.prep.onnx")
+        quant_pre_process(fp32_path, prepared)
+        if mode == "dynamic":
+            quantize_dynamic(prepared, int8_path, weight_type=QuantType.QUInt8)
+            return
+        input_name = OnnxRuntimeBackend(fp32_path, "classifier").input_name
+        quantize_static(
+            prepared, int8_path, CalibrationReader(input_name, calibration),
+            quant_format=QuantFormat.QDQ, per_channel=True,
+            activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8,
+            calibrate_method={
+                "minmax": CalibrationMethod.MinMax,
+                "entropy": CalibrationMethod.Entropy,
+                "percentile": CalibrationMethod.Percentile,
+            }[calibrate_method],
+        )
+
+
+def _rss_mb() -> float:
+    gc.collect()
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def evaluate(name: str, load, evaluation, latency_inputs, reference=None):
+    """Accuracy, agreement with the reference predictions, p50 latency and memory of one variant."""
+    rss_before = _rss_mb()
+    backend = load()
+    backend(torch.from_numpy(latency_inputs[0]))  # Aquecimento (alocações preguiçosas entram na conta de memória)
+    rss_added = _rss_mb() - rss_before
+
+    predictions = [int(backend(torch.from_numpy(array)).argmax(dim=1)[0]) for array, _ in evaluation]
+    labels = [label for _, label in evaluation]
+    correct = sum(prediction == label for prediction, label in zip(predictions, labels))
+
+    timings = []
+    for array in latency_inputs:
+        start = time.perf_counter()
+        backend(torch.from_numpy(array))
+        timings.append((time.perf_counter() - start) * 1000)
+
+    result = {
+        "variant": name,
+        "accuracy": round(100 * correct / len(evaluation), 2) if evaluation else None,
+        "p50_ms": round(statistics.median(timings), 2),
+        "rss_added_mb": round(rss_added, 1),
+        "predictions": predictions,
+    }
+    if reference is not None and evaluation:
+        agree = sum(a == b for a, b in zip(predictions, reference))
+        result["agreement_with_eager"] = round(100 * agree / len(evaluation), 2)
+    del backend
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--models", nargs="+", choices=list(CLASS_NAMES), default=list(CLASS_NAMES))
+    parser.add_argument("--mode", choices=["static", "dynamic"], default="static")
+    parser.add_argument("--models-dir", default=os.environ.get("INFERENCE_MODELS_DIR", "exported_models"))
+    parser.add_argument("--calibration-size", type=int, default=200)
+    parser.add_argument("--eval-size", type=int, default=1000)
+    parser.add_argument("--calibrate-method", choices=["minmax", "entropy", "percentile"], default="minmax")
+    parser.add_argument("--latency-runs", type=int, default=50)
+    parser.add_argument("--report", help="write the report as JSON to this path")
+    args = parser.parse_args()
+
+    report = {}
+    for model_name in args.models:
+        print(f"\n== {model_name} ({args.mode}) ==")
+        fp32_path = exported_model_path(args.models_dir, model_name, "onnx")
+        int8_path = exported_model_path(args.models_dir, model_name, "onnx-int8")
+        if not os.path.exists(fp32_path):
+            print(f"  missing {fp32_path}; run scripts/export_models.py --format onnx first")
+            continue
+
+        rows = asyncio.run(fetch_attendances(model_name, args.calibration_size + args.eval_size))
+        samples = preprocess(rows)
+        calibration = [array for array, _ in samples[:args.calibration_size]]
+        evaluation = [
+            (array, label) for array, label in
+            ((array, resolve_label(model_name, row)) for array, row in samples[args.calibration_size:])
+            if label is not None
+        ]
+        print(f"  {len(samples)} usable attendances: {len(calibration)} for calibration, "
+              f"{len(evaluation)} labeled for evaluation")
+        if not samples:
+            # Sem imagens não há o que medir (latência nem acurácia), em qualquer modo
+            print("  no usable attendances; skipping (store attendances for this model first)")
+            continue
+        if args.mode == "static" and not calibration:
+            print("  no calibration images; skipping (use --mode dynamic or store more attendances)")
+            continue
+        if not evaluation:
+            print("  warning: no labeled attendances left for evaluation; accuracy will not be reported")
+
+        quantize(model_name, fp32_path, int8_path, args.mode, calibration, args.calibrate_method)
+        print(f"  wrote {int8_path}")
+
+        random.seed(0)
+        latency_inputs = [array for array, _ in random.choices(samples, k=args.latency_runs)]
+        eager = evaluate("eager fp32", lambda: EagerBackend(EAGER_LOADERS[model_name](), "classifier"),
+                         evaluation, latency_inputs)
+        variants = [
+            eager,
+            evaluate("onnx fp32", lambda: OnnxRuntimeBackend(fp32_path, "classifier"),
+                     evaluation, latency_inputs, eager["predictions"]),
+            evaluate(f"onnx int8 ({args.mode})", lambda: OnnxRuntimeBackend(int8_path, "classifier", name="onnx-int8"),
+                     evaluation, latency_inputs, eager["predictions"]),
+        ]
+        sizes = {"onnx fp32": os.path.getsize(fp32_path), f"onnx int8 ({args.mode})": os.path.getsize(int8_path)}
+
+        print(f"  {'variant':<22}{'accuracy':>10}{'delta':>9}{'agree':>9}{'p50 ms':>9}{'file MB':>9}{'RSS MB':>9}")
+        for variant in variants:
+            variant.pop("predictions")
+            variant["file_mb"] = round(sizes[variant["variant"]] / (1024 * 1024), 1) if variant["variant"] in sizes else None
+            if variant["accuracy"] is not None and eager["accuracy"] is not None:
+                variant["accuracy_delta"] = round(variant["accuracy"] - eager["accuracy"], 2)
+
+            def cell(key, fmt):
+                value = variant.get(key)
+                return format(value, fmt) if value is not None else "-"
+            print(f"  {variant['variant']:<22}{cell('accuracy', '.2f'):>10}{cell('accuracy_delta', '+.2f'):>9}"
+                  f"{cell('agreement_with_eager', '.1f'):>9}{cell('p50_ms', '.2f'):>9}{cell('file_mb', '.1f'):>9}"
+                  f"{cell('rss_added_mb', '.1f'):>9}")
+
+        report[model_name] = {
+            "mode": args.mode,
+            "calibration_images": len(calibration),
+            "evaluation_images": len(evaluation),
+            "variants": variants,
+        }
+
+    if args.report:
+        with open(args.report, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nReport written to {args.report}")
+    print("\nEnable a model with INFERENCE_INT8_MODELS=<model>[,<model>] once its accuracy delta is acceptable.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Per-worker memory of a running multi-worker API server, to verify that model
+weights are shared (preload-then-fork, INFERENCE_SHARED_WEIGHTS) and not copied
+into every worker.
+
+Usage:
+    python scripts/report_worker_memory.py [--pid <master pid>] [--match gunicorn]
+
+Without --pid, the master is the oldest process whose command line contains
+--match and whose children run the same command. For each worker the report
+shows RSS, USS (pages only that worker holds: what one more worker costs), PSS
+(shared pages split evenly) and shared (RSS - USS). With sharing working, USS is
+a small fraction of RSS and the sum of PSS is far below the sum of RSS. Linux
+only (USS/PSS come from /proc/<pid>/smaps).
+"""
+import argparse
+import sys
+
+import psutil
+
+MB = 1024 * 1024
+
+
+def find_master(match: str):
+    candidates = [
+        process for process in psutil.process_iter(["pid", "cmdline", "create_time"])
+        if match in " ".join(process.info["cmdline"] or [])
+    ]
+    masters = [process for process in candidates if process.children()]
+    if not masters:
+        return None
+    return min(masters, key=lambda process: process.info["create_time"])
+
+
+def describe(process, role: str):
+    info = process.memory_full_info()
+    return {
+        "role": role,
+        "pid": process.pid,
+        "rss": info.rss / MB,
+        "uss": info.uss / MB,
+        "pss": getattr(info, "pss", 0) / MB,
+        "shared": (info.rss - info.uss) / MB,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pid", type=int, help="PID of the server master process")
+    parser.add_argument("--match", default="gunicorn", help="command line substring used to find the master")
+    args = parser.parse_args()
+
+    master = psutil.Process(args.pid) if args.pid else find_master(args.match)
+    if master is None:
+        print(f"No running master process matching '{args.match}' with workers; pass --pid.")
+        sys.exit(1)
+
+    try:
+        rows = [describe(master, "master")] + [describe(child, "worker") for child in master.children()]
+    except psutil.AccessDenied:
+        print("Access denied reading process memory; run as the server's user or root.")
+        sys.exit(1)
+
+    print(f"{'role':<8}{'pid':>8}{'RSS MB':>10}{'USS MB':>10}{'PSS MB':>10}{'shared MB':>11}")
+    for row in rows:
+        print(f"{row['role']:<8}{row['pid']:>8}{row['rss']:>10.1f}{row['uss']:>10.1f}{row['pss']:>10.1f}{row['shared']:>11.1f}")
+
+    workers = [row for row in rows if row["role"] == "worker"]
+    if workers:
+        total_rss = sum(row["rss"] for row in rows)
+        total_pss = sum(row["pss"] for row in rows)
+        print(f"\n{len(workers)} workers: mean USS {sum(row['uss'] for row in workers) / len(workers):.1f} MB "
+              f"(cost of one more worker), sum RSS {total_rss:.1f} MB, "
+              f"sum PSS {total_pss:.1f} MB (actual footprint), shared saving {total_rss - total_pss:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
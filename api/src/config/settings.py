@@ -1,3 +1,4 @@
+from pydantic import Field
 from pydantic_settings import BaseSettings
 from typing import Optional
 
@@ -18,6 +19,54 @@ class Settings(BaseSettings):
     USER_STATUS_ROOT: str = "active"
     
 
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_RATE_LIMIT_IP_CAPACITY: int = 20
+    LOGIN_RATE_LIMIT_IP_REFILL_PER_MINUTE: float = Field(10.0, gt=0)
+    LOGIN_RATE_LIMIT_EMAIL_CAPACITY: int = 5
+    LOGIN_RATE_LIMIT_EMAIL_REFILL_PER_MINUTE: float = Field(1.0, gt=0)
+    TRUSTED_PROXY_IPS: str = ""
+
+
+    LOOKUP_CACHE_TTL_SECONDS: float = 60.0
+    LOOKUP_CACHE_MAX_ENTRIES: int = 10000
+
+
+    PREDICTION_ARTIFACT_TTL_SECONDS: int = 1800
+
+
+    IMAGE_MAX_PIXELS: int = 100_000_000
+    INFERENCE_WORKERS: int = 2
+    INFERENCE_BACKEND: str = "eager"
+    INFERENCE_MODELS_DIR: str = "exported_models"
+    ORT_INTRA_OP_THREADS: int = 0
+    ORT_INTER_OP_THREADS: int = 1
+    INFERENCE_INT8_MODELS: str = ""
+    INFERENCE_SHARED_WEIGHTS: bool = False
+    WEB_CONCURRENCY: int = 1
+    TORCH_INTRA_OP_THREADS: int = 0
+    TORCH_INTER_OP_THREADS: int = 0
+    INFERENCE_CPU_AFFINITY: bool = False
+
+
+    BREAST_DETECTION_PROFILE: str = "accurate"
+    BREAST_DETECTION_PROFILE_BY_HEALTH_UNIT: str = ""
+    BREAST_TILED_BUDGET_MS: int = 8000
+    BREAST_ANNOTATION_CACHE_TTL_SECONDS: int = 600
+    BREAST_ANNOTATION_CACHE_MAX_ENTRIES: int = 32
+    ANNOTATED_IMAGE_FORMAT: str = "jpeg"
+    ANNOTATED_IMAGE_QUALITY: int = 95
+
+
+    CASCADE_MODELS: str = ""
+    CASCADE_BANDS: str = ""
+    CASCADE_SCREEN_SIZE: int = 112
+
+
+    STARTUP_WARMUP: bool = True
+    STARTUP_WARMUP_ROUNDS: int = 2
+    STARTUP_DATABASE_RETRY_MAX_SECONDS: float = 30.0
+
+
     def get_database(self) -> str:
         """Retorna a string de conexão com o banco de dados PostgreSQL."""
         return self.POSTGRES_URL
@@ -2,6 +2,7 @@
 from fastapi import Request
 from ..interfaces.create_health_unit import CreateHealthUnit
 from ..interfaces.update_health_unit import UpdateHealthUnit
+from ..interfaces.lookup_ids import LookupIds
 from ..usecases.health_unit_usecases import HealthUnitUseCases
 from ..utils.credentials_middleware import AuthMiddleware
 from ..utils.logger import get_logger
@@ -102,6 +103,21 @@ class HealthUnitController:
         # com o admin_id do token (para professional) ou user_id (para admin).
         return await self.health_unit_use_cases.get_health_unit_by_id(unit_id, user_info, audit_data)
 
+    async def lookup_health_units(self, request: Request, lookup: LookupIds):
+        """
+        Resolves many health unit IDs at once (display fields only).
+        """
+        await self.auth_middleware.verify_request(request)
+
+        audit_data = {
+            "user_id": request.state.user.get("user_id"),
+            "action": "lookup_health_units",
+            "ids_count": len(lookup.ids),
+            "ip_address": request.client.host if request.client else "N/A"
+        }
+
+        return await self.health_unit_use_cases.lookup_health_units(lookup.ids, audit_data)
+
     async def update_health_unit(self, request: Request, unit_id: str, health_unit: UpdateHealthUnit):
         """
         Updates information of a health unit.
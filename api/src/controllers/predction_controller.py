@@ -1,24 +1,36 @@
 from fastapi import Request, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from typing import List, Optional
 import base64
+import json
 from ..utils.logger import get_logger
-from ..usecases.prediction_usecases import PredictionUseCases
+from ..usecases.prediction_usecases import PredictionUseCases, MODEL_INPUT_SPECS, resolve_detection_profile, settings
 from ..utils.credentials_middleware import AuthMiddleware
+from ..utils.error_handler import raise_http_error
+from ..utils.annotation import IMAGE_FORMATS, IMAGE_MEDIA_TYPES
+from ..utils.content_negotiation import choose_media_type, multipart_mixed_response
 
 logger = get_logger(__name__)
 
+def _negotiate_image_format(accept: Optional[str]) -> Optional[str]:
+    """Image format the client names in Accept (e.g. image/webp), or None for the configured default."""
+    media_type = choose_media_type(accept, list(IMAGE_MEDIA_TYPES), explicit=True)
+    return IMAGE_MEDIA_TYPES.get(media_type)
+
+
 class PredictionController:
     def __init__(self):
         self.prediction_use_cases = PredictionUseCases()
         self.auth_middleware = AuthMiddleware()
     
-    async def predict_respiratory(self, request: Request, file: UploadFile):
+    async def predict_respiratory(self, request: Request, file: UploadFile, persist: bool = False):
         """
         Controls the prediction flow for respiratory diseases.
         
         Args:
             request: FastAPI Request object
             file: Image file uploaded by the user
+            persist: Store image and result under a short-lived prediction_id
             
         Returns:
             dict: Prediction result
@@ -55,8 +67,7 @@ class PredictionController:
             }
             logger.info(f"Respiratory prediction completed: {audit_data}")
             
-            # Return the result
-            return {
+            response = {
                 "detail": {
                     "message": "Prediction successfully completed",
                     "model": "respiratory",
@@ -64,6 +75,16 @@ class PredictionController:
                     "status_code": 200
                 }
             }
+
+            if persist:
+                stored = await self.prediction_use_cases.store_prediction(
+                    request.state.user.get("user_id"), "respiratory", prediction_result, image_data
+                )
+                if stored:
+                    response["detail"].update(stored)
+
+            # Return the result
+            return response
             
         except HTTPException as e:
             # Propaga exceções HTTP
@@ -81,13 +102,20 @@ class PredictionController:
                 }
             )
     
-    async def detect_breast_cancer(self, request: Request, file: UploadFile):
+    async def detect_breast_cancer(self, request: Request, file: UploadFile, persist: bool = False,
+                                   profile: Optional[str] = None, health_unit_id: Optional[str] = None,
+                                   annotated: bool = True):
         """
         Controls the detection flow for breast cancer using Faster R-CNN.
         
         Args:
             request: FastAPI Request object
             file: Image file uploaded by the user
+            persist: Store image and result under a short-lived prediction_id
+            profile: Detection profile ("fast" or "accurate")
+            health_unit_id: Health unit whose configured profile applies when no profile is given
+            annotated: Return the annotated image; otherwise only boxes and scores plus
+                a URL to render the annotated image on demand
             
         Returns:
             dict: Detection result with annotated image
@@ -112,11 +140,18 @@ class PredictionController:
             # Lê o conteúdo do arquivo
             image_data = await file.read()
             
+            # Perfil pedido, ou o da unidade de saúde, ou o padrão
+            profile = resolve_detection_profile(profile, health_unit_id)
+
+            # Formato da resposta (Accept): JSON com a imagem em base64, ou multipart/mixed com a imagem em bytes
+            accept = request.headers.get("accept")
+            multipart = choose_media_type(accept, ["application/json", "multipart/mixed"]) == "multipart/mixed"
+            image_format = _negotiate_image_format(accept)
+
             # Realiza a detecção
-            detection_result = await self.prediction_use_cases.detect_breast_cancer(image_data)
-            
-            # Codifica a imagem em base64 para retorno
-            image_base64 = base64.b64encode(detection_result["image_base64"]).decode('utf-8')
+            detection_result = await self.prediction_use_cases.detect_breast_cancer(
+                image_data, profile, annotated or multipart, request.state.user.get("user_id"), image_format
+            )
             
             # Log de auditoria
             audit_data = {
@@ -124,21 +159,62 @@ class PredictionController:
                 "action": "breast_cancer_detection",
                 "ip_address": request.client.host,
                 "file_name": file.filename,
-                "detections_count": len(detection_result["detections"])
+                "detections_count": len(detection_result["detections"]),
+                "profile": profile
             }
             logger.info(f"Breast cancer detection completed: {audit_data}")
             
-            # Return the result
-            return {
+            response = {
                 "detail": {
                     "message": "Detection successfully completed",
                     "model": "breast",
                     "detections": detection_result["detections"],
                     "bounding_boxes": detection_result["bounding_boxes"],
-                    "image_base64": image_base64,
+                    "image_size": detection_result["image_size"],
+                    "profile": detection_result["profile"],
                     "status_code": 200
                 }
             }
+            if multipart:
+                # A imagem vai como parte binária (abaixo), fora do JSON
+                response["detail"]["image_format"] = detection_result["image_format"]
+            elif annotated:
+                # Codifica a imagem em base64 para retorno
+                response["detail"]["image_base64"] = base64.b64encode(detection_result["image_base64"]).decode('utf-8')
+                response["detail"]["image_format"] = detection_result["image_format"]
+            else:
+                # Sem imagem no JSON: o cliente desenha as caixas (coordenadas em image_size) sobre a imagem original
+                detection_id = detection_result["detection_id"]
+                response["detail"]["detection_id"] = detection_id
+                response["detail"]["annotated_image_url"] = f"/api/predictions/breast-cancer/{detection_id}/annotated"
+            if detection_result.get("tiling"):
+                response["detail"]["tiling"] = detection_result["tiling"]
+
+            if persist:
+                stored = await self.prediction_use_cases.store_prediction(
+                    request.state.user.get("user_id"), "breast", detection_result["bounding_boxes"], image_data,
+                    {"image_size": detection_result["image_size"], "detections": detection_result["detections"]}
+                )
+                if stored:
+                    response["detail"].update(stored)
+                    if "detection_id" in response["detail"]:
+                        # Persistida: a imagem anotada pode ser renderizada por qualquer worker
+                        detection_id = self.prediction_use_cases.link_breast_annotation(
+                            response["detail"]["detection_id"], stored["prediction_id"]
+                        )
+                        response["detail"]["detection_id"] = detection_id
+                        response["detail"]["annotated_image_url"] = f"/api/predictions/breast-cancer/{detection_id}/annotated"
+
+            if multipart:
+                # Parte 1: o JSON de sempre (sem base64); parte 2: a imagem anotada em bytes
+                _, media_type, extension = IMAGE_FORMATS[detection_result["image_format"]]
+                return multipart_mixed_response([
+                    ("application/json", json.dumps(response).encode("utf-8"), None),
+                    (media_type, detection_result["image_base64"], f"annotated.{extension}"),
+                ])
+
+            # Return the result
+            return response
             
         except HTTPException as e:
             # Propaga exceções HTTP
@@ -156,13 +232,46 @@ class PredictionController:
                 }
             )
     
-    async def predict_tuberculosis(self, request: Request, file: UploadFile):
+    async def get_breast_annotation(self, request: Request, detection_id: str):
+        """
+        Returns the annotated image of a detection made with annotated=false.
+
+        Args:
+            request: FastAPI Request object
+            detection_id: ID returned by the detection
+
+        Returns:
+            Response: annotated image (JPEG or WebP, negotiated through Accept)
+        """
+        await self.auth_middleware.verify_request(request)
+        if request.state.user.get("profile") != "professional":
+            raise_http_error(403, "Only healthcare professionals can access detections")
+
+        rendered = await self.prediction_use_cases.render_breast_annotation(
+            detection_id, request.state.user.get("user_id"), _negotiate_image_format(request.headers.get("accept"))
+        )
+        if rendered is None:
+            raise_http_error(404, "Detection not found or expired")
+        image_bytes, image_format = rendered
+        return Response(
+            content=image_bytes,
+            media_type=IMAGE_FORMATS[image_format][1],
+            headers={
+                "Cache-Control": f"private, max-age={settings.BREAST_ANNOTATION_CACHE_TTL_SECONDS}",
+                "Vary": "Accept"
+            }
+        )
+
+    async def predict_tuberculosis(self, request: Request, file: UploadFile, persist: bool = False,
+                                  cascade: Optional[bool] = None):
         """
         Controls the prediction flow for tuberculosis.
         
         Args:
             request: FastAPI Request object
             file: Image file uploaded by the user
+            persist: Store image and result under a short-lived prediction_id
+            cascade: Run the cascade screen first (None = server default)
             
         Returns:
             dict: Prediction result
@@ -188,7 +297,7 @@ class PredictionController:
             image_data = await file.read()
             
             # Realiza a predição
-            result = await self.prediction_use_cases.predict_tuberculosis(image_data)
+            result = await self.prediction_use_cases.predict_tuberculosis(image_data, cascade)
             
             # Log de auditoria
             audit_data = {
@@ -196,12 +305,12 @@ class PredictionController:
                 "action": "tuberculosis_prediction",
                 "ip_address": request.client.host,
                 "file_name": file.filename,
-                "result": result["class_pred"]
+                "result": result["class_pred"],
+                "decided_by": result.get("cascade", {}).get("decided_by", "full")
             }
             logger.info(f"Tuberculosis prediction completed: {audit_data}")
             
-            # Return the result
-            return {
+            response = {
                 "detail": {
                     "message": "Prediction successfully completed",
                     "model": "tuberculosis",
@@ -209,6 +318,16 @@ class PredictionController:
                     "status_code": 200
                 }
             }
+
+            if persist:
+                stored = await self.prediction_use_cases.store_prediction(
+                    request.state.user.get("user_id"), "tuberculosis", result, image_data
+                )
+                if stored:
+                    response["detail"].update(stored)
+
+            # Return the result
+            return response
             
         except HTTPException as e:
             # Propaga exceções HTTP
@@ -227,13 +346,16 @@ class PredictionController:
             )
     
 
-    async def prediction_osteoporosis(self, request: Request, file: UploadFile):
+    async def prediction_osteoporosis(self, request: Request, file: UploadFile, persist: bool = False,
+                                     cascade: Optional[bool] = None):
         """
         Controls the prediction flow for osteoporosis.
         
         Args:
             request: FastAPI Request object
             file: Image file uploaded by the user
+            persist: Store image and result under a short-lived prediction_id
+            cascade: Run the cascade screen first (None = server default)
             
         Returns:
             dict: Prediction result
@@ -259,7 +381,7 @@ class PredictionController:
             image_data = await file.read()
             
             # Realiza a predição
-            result = await self.prediction_use_cases.predict_osteoporosis(image_data)
+            result = await self.prediction_use_cases.predict_osteoporosis(image_data, cascade)
             
             # Log de auditoria
             audit_data = {
@@ -267,12 +389,12 @@ class PredictionController:
                 "action": "osteoporosis_prediction",
                 "ip_address": request.client.host,
                 "file_name": file.filename,
-                "result": result["class_pred"]
+                "result": result["class_pred"],
+                "decided_by": result.get("cascade", {}).get("decided_by", "full")
             }
             logger.info(f"Osteoporosis prediction completed: {audit_data}")
             
-            # Return the result
-            return {
+            response = {
                 "detail": {
                     "message": "Prediction successfully completed",
                     "model": "osteoporosis",
@@ -280,6 +402,16 @@ class PredictionController:
                     "status_code": 200
                 }
             }
+
+            if persist:
+                stored = await self.prediction_use_cases.store_prediction(
+                    request.state.user.get("user_id"), "osteoporosis", result, image_data
+                )
+                if stored:
+                    response["detail"].update(stored)
+
+            # Return the result
+            return response
             
         except HTTPException as e:
             # Propaga exceções HTTP
@@ -297,6 +429,113 @@ class PredictionController:
                 }
             )
     
+    async def predict_screening(self, request: Request, file: UploadFile, models: List[str], persist: bool = False):
+        """
+        Controls the multi-model screening flow: one upload, several models.
+
+        Args:
+            request: FastAPI Request object
+            file: Image file uploaded by the user
+            models: Models to run on the image
+            persist: Store the image and all results under a single prediction_id,
+                usable to create one attendance with model_used='screening'
+
+        Returns:
+            dict: Results by model, errors by model and timings
+        """
+        try:
+            # Verifica a autenticação
+            await self.auth_middleware.verify_request(request)
+
+            # Verifica se o usuário é um profissional
+            if request.state.user.get("profile") != "professional":
+                logger.warning(f"User {request.state.user.get('user_id')} without professional privileges attempted to access screening")
+                return JSONResponse(
+                    status_code=403,
+                    content={
+                        "detail": {
+                            "message": "Only healthcare professionals can access predictions",
+                            "status_code": 403
+                        }
+                    }
+                )
+
+            # Aceita "models=a&models=b" e "models=a,b"; remove repetidos mantendo a ordem
+            requested = []
+            for item in models:
+                for name in item.split(","):
+                    name = name.strip()
+                    if name and name not in requested:
+                        requested.append(name)
+            if not requested:
+                raise_http_error(422, "At least one model is required")
+            invalid = [name for name in requested if name not in MODEL_INPUT_SPECS]
+            if invalid:
+                raise_http_error(422, f"Invalid model(s): {', '.join(invalid)}. Should be one of: {', '.join(MODEL_INPUT_SPECS)}")
+
+            # Lê o conteúdo do arquivo
+            image_data = await file.read()
+
+            # Realiza as predições
+            screening = await self.prediction_use_cases.predict_screening(image_data, requested)
+            results = screening["results"]
+
+            # A imagem anotada da mama vai em base64, como no endpoint individual
+            if "breast" in results:
+                results["breast"]["image_base64"] = base64.b64encode(results["breast"]["image_base64"]).decode('utf-8')
+
+            # Log de auditoria
+            audit_data = {
+                "user_id": request.state.user.get("user_id"),
+                "action": "screening_prediction",
+                "ip_address": request.client.host,
+                "file_name": file.filename,
+                "models": requested,
+                "failed_models": list(screening["errors"])
+            }
+            logger.info(f"Screening completed: {audit_data}")
+
+            response = {
+                "detail": {
+                    "message": "Screening successfully completed",
+                    "model": "screening",
+                    "models": requested,
+                    "results": results,
+                    "errors": screening["errors"],
+                    "timings": screening["timings"],
+                    "status_code": 200
+                }
+            }
+
+            if persist:
+                # Um único resultado combinado (a mama guarda só as bounding boxes, como no endpoint individual)
+                combined_result = {
+                    name: (result["bounding_boxes"] if name == "breast" else result)
+                    for name, result in results.items()
+                }
+                stored = await self.prediction_use_cases.store_prediction(
+                    request.state.user.get("user_id"), "screening", combined_result, image_data
+                )
+                if stored:
+                    response["detail"].update(stored)
+
+            return response
+
+        except HTTPException as e:
+            # Propaga exceções HTTP
+            raise e
+        except Exception as e:
+            logger.error(f"Unexpected error processing screening: {str(e)}")
+            return JSONResponse(
+                status_code=500,
+                content={
+                    "detail": {
+                        "message": "Internal error processing the screening",
+                        "status_code": 500
+                    }
+                }
+            )
+
     async def get_model_classes(self):
         """
         Retrieves the possible diagnostic classes for each model type.
@@ -317,4 +556,24 @@ class PredictionController:
              logger.error(f"Error fetching model classes: {e}", exc_info=True)
              # Usar raise_http_error para consistência
              from ..utils.error_handler import raise_http_error
-             raise_http_error(500, "Failed to retrieve model classes")
\ No newline at end of file
+             raise_http_error(500, "Failed to retrieve model classes")
+
+    async def get_model_info(self):
+        """
+        Retrieves the input resolution advertised by each model, so clients can
+        downscale images before uploading them.
+        """
+        logger.info("Fetching model input specs")
+        try:
+            models = self.prediction_use_cases.get_model_input_specs()
+            return {
+                "detail": {
+                    "message": "Model info retrieved successfully",
+                    "models": models,
+                    "status_code": 200
+                }
+            }
+        except Exception as e:
+             logger.error(f"Error fetching model info: {e}", exc_info=True)
+             from ..utils.error_handler import raise_http_error
+             raise_http_error(500, "Failed to retrieve model info")
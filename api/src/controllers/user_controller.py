@@ -3,8 +3,11 @@ from ..interfaces.create_user import CreateUser
 from ..interfaces.update_user import UpdateUser
 from ..interfaces.login_user import LoginUser
 from ..interfaces.create_subscriptions import CreateSubscriptions
+from ..interfaces.lookup_ids import LookupIds
 from ..usecases.user_usecases import UserUseCases
 from ..utils.credentials_middleware import AuthMiddleware
+from ..utils.rate_limiter import login_rate_limiter
+from ..utils.client_ip import client_ip
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -47,15 +50,22 @@ class UserController:
         Does not require prior authentication.
         """
         api_key = request.headers.get('api_key')
-        self.auth_middleware._verify_api_key(api_key)
+        await self.auth_middleware._verify_api_key(api_key)
         
+        # Real client behind the web tier (X-Forwarded-For from TRUSTED_PROXY_IPS only)
+        ip_address = client_ip(request)
         audit_data = {
             "email": user.email,
             "action": "login",
-            "ip_address": request.client.host
+            "ip_address": ip_address or request.client.host
         }
+
+        # Refuse throttled attempts before any user lookup or password hashing
+        await login_rate_limiter.check(ip_address, user.email)
         
-        return await self.user_use_cases.login_user(user, audit_data)
+        result = await self.user_use_cases.login_user(user, audit_data)
+        await login_rate_limiter.reset_email(user.email)
+        return result
 
     async def get_users(self, request: Request, admin_id: str = None):
         """
@@ -113,6 +123,27 @@ class UserController:
         
         return await self.user_use_cases.get_user_by_id(user_id, audit_data)
 
+    async def lookup_users(self, request: Request, lookup: LookupIds):
+        """
+        Resolves many user IDs at once (display fields only).
+        Administrators can resolve any user; other users only themselves.
+        """
+        await self.auth_middleware.verify_request(request)
+
+        audit_data = {
+            "user_id": request.state.user.get("user_id"),
+            "action": "lookup_users",
+            "ids_count": len(lookup.ids),
+            "ip_address": request.client.host
+        }
+
+        return await self.user_use_cases.lookup_users(
+            lookup.ids,
+            request.state.user.get("user_id"),
+            request.state.user.get("profile"),
+            audit_data
+        )
+
     async def update_user(self, request: Request, user_id: str, user: UpdateUser):
         """
         Updates user information.
@@ -1,6 +1,23 @@
+import asyncio
+import weakref
+
 from ..config.settings import Settings
 
+# Objetos com pool de conexões (init_pool), para criar os pools na inicialização
+# (WeakSet: instâncias temporárias, como a de ensure_root_user, não ficam retidas)
+_pool_owners = weakref.WeakSet()
+
+
 def get_database():
     settings = Settings()
     return settings.POSTGRES_URL
 
+
+def register_pool_owner(owner):
+    """Registers an object with an async init_pool() to be initialized by init_pools()."""
+    _pool_owners.add(owner)
+
+
+async def init_pools():
+    """Creates every registered connection pool (readiness waits for this)."""
+    await asyncio.gather(*(owner.init_pool() for owner in list(_pool_owners)))
@@ -26,11 +26,12 @@ class BoundingBox(BaseModel):
 
 class CreateAttendance(BaseModel):
     health_unit_id: str = Field(..., description="ID of the health unit where the attendance occurred")
-    model_used: str = Field(..., description="Identifier of the AI model used (e.g., 'respiratory', 'breast')")
-    model_result: str = Field(..., description="Raw result/prediction generated by the AI model")
+    model_used: str = Field(..., description="Identifier of the AI model used (e.g., 'respiratory', 'breast', or 'screening' for a multi-model screening)")
+    model_result: Optional[str] = Field(None, description="Raw result/prediction generated by the AI model. Required unless prediction_id is given")
     expected_result: str = Field(..., description="The result expected or confirmed by the professional")
     correct_diagnosis: bool = Field(..., description="Whether the AI model's result matched the expected result")
-    image_base64: str = Field(..., description="Base64 encoded image associated with the attendance")
+    image_base64: Optional[str] = Field(None, description="Base64 encoded image associated with the attendance. Required unless prediction_id is given")
+    prediction_id: Optional[str] = Field(None, description="ID returned by a prediction made with persist=true; its stored image and model result (and bounding boxes) are used instead of the ones sent")
     observation: Optional[str] = Field(None, description="General observations by the professional") # Tornar opcional
     bounding_boxes: Optional[List[BoundingBox]] = Field(None, description="List of bounding boxes, applicable for models like 'breast'") # Adicionado
 
@@ -0,0 +1,14 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+MAX_LOOKUP_IDS = 500
+
+class LookupIds(BaseModel):
+    ids: List[str] = Field(..., max_length=MAX_LOOKUP_IDS, description="IDs to resolve (duplicates are ignored)")
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "ids": ["a1b2c3d4-e5f6-7890-1234-567890abcdef", "b2c3d4e5-f6a7-8901-2345-67890abcdef1"]
+            }
+        }
@@ -1,7 +1,9 @@
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import time
 import uuid
 from .routes.user_routes import router as user_router
@@ -12,12 +14,66 @@ from .utils.custom_openapi import custom_openapi
 from .config.settings import Settings
 from .utils.logger import get_logger
 from .utils.root_user import ensure_root_user
+from .utils.credentials_middleware import AuthMiddleware
+from .utils.rate_limiter import login_rate_limiter
+from .utils.cache import cache_metrics
+from .utils.preprocessing import preprocessing_metrics
+from .utils.cascade import cascade_metrics
+from .utils.shared_weights import memory_usage
+from .utils.runtime_config import runtime_layout
+from .utils.readiness import FAILED, READY, WAITING_FOR_DATABASE, WARMING, readiness
+from .usecases.prediction_usecases import WARMUP_MODELS, run_inference, warm_up_model
+from .db.database import init_pools
 
 
 load_dotenv()
 
 settings = Settings()
 logger = get_logger("api")
+auth_middleware = AuthMiddleware()
+
+
+async def _create_pools():
+    """Creates the database pools, retrying with exponential backoff until the database answers."""
+    delay = 1.0
+    while True:
+        try:
+            await init_pools()
+            return
+        except Exception as e:
+            logger.warning(f"Database not available yet ({str(e)}); retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.STARTUP_DATABASE_RETRY_MAX_SECONDS)
+
+
+async def _start_up():
+    """
+    Warms every model on synthetic inputs and creates the database pools, then
+    marks the process ready (/api/health/ready). Runs in the background: the
+    server answers liveness checks meanwhile.
+    """
+    try:
+        if settings.STARTUP_WARMUP:
+            readiness.set_state(WARMING)
+            # Um modelo por vez, no pool de inferência (mesmas threads das requisições)
+            for model_name in WARMUP_MODELS:
+                round_ms = await run_inference(warm_up_model, model_name, settings.STARTUP_WARMUP_ROUNDS)
+                readiness.record_warmup(model_name, round_ms)
+        readiness.set_state(WAITING_FOR_DATABASE)
+        await _create_pools()
+        readiness.set_state(READY)
+        logger.info(f"API ready: {readiness.as_dict()}")
+    except Exception as e:
+        logger.error(f"Startup failed, the API will not report ready: {str(e)}")
+        readiness.set_state(FAILED, str(e))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    startup_task = asyncio.create_task(_start_up())
+    yield
+    startup_task.cancel()
+
 
 app = FastAPI(
     title="Medical Diagnosis By Images API",
@@ -25,7 +81,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -71,6 +128,41 @@ async def health_check():
     """
     return {"status": "healthy", "version": "1.0.0"}
 
+@app.get("/api/health/live", tags=["health check API"])
+async def liveness():
+    """
+    Liveness probe: the process is up and its event loop answers.
+    Does not wait for warm-up or the database (see /api/health/ready).
+    """
+    return {"status": "alive"}
+
+@app.get("/api/health/ready", tags=["health check API"])
+async def readiness_check():
+    """
+    Readiness probe: 200 once every model has been warmed up and the database
+    pools are created, 503 before that (or if startup failed), with the startup
+    state and the warm-up duration of each round per model.
+    """
+    return JSONResponse(status_code=200 if readiness.ready else 503, content=readiness.as_dict())
+
+@app.get("/api/metrics", tags=["health check API"])
+async def metrics(request: Request):
+    """
+    Returns in-process operational counters (e.g. rejected login attempts,
+    lookup cache hit rates, per-stage prediction timings, cascade
+    decisions by stage, memory and thread layout of the worker that answered).
+    Requires a valid API key.
+    """
+    await auth_middleware._verify_api_key(request.headers.get('api_key'))
+    return {
+        "login_rate_limit": login_rate_limiter.metrics(),
+        "caches": cache_metrics(),
+        "preprocessing": preprocessing_metrics(),
+        "cascade": cascade_metrics(),
+        "memory": memory_usage(),
+        "runtime": runtime_layout()
+    }
+
 @app.post("/api/ensure-root", tags=["health check API"])
 async def ensure_root():
     """
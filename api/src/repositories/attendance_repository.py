@@ -1,9 +1,10 @@
 from datetime import datetime
 import asyncpg
+import json
 import uuid
 from typing import Any, Dict, List, Optional, Tuple
 from ..utils.logger import get_logger
-from ..db.database import get_database
+from ..db.database import get_database, register_pool_owner
 from ..config.settings import Settings
 
 settings = Settings()
@@ -13,6 +14,7 @@ class AttendanceRepository:
     def __init__(self):
         self.db_connection = get_database()
         self.pool = None
+        register_pool_owner(self)
 
     async def init_pool(self):
         """Initialize the connection pool if necessary."""
@@ -49,17 +51,40 @@ class AttendanceRepository:
 
                 async with conn.transaction():
 
-                    query = """
-                        INSERT INTO attendances (
-                            professional_id, health_unit_id, admin_id, 
-                            model_used, model_result, expected_result, correct_diagnosis,
-                            image_base64, observations
-                        )
-                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9) 
-                        RETURNING id
-                    """
+                    prediction_id = attendance_data.get("prediction_id")
+                    if prediction_id:
+                        # The image and the model result are copied from the stored prediction inside
+                        # the database, so the image never travels through the API again and the result
+                        # is the one the model produced for it. The prediction is single-use.
+                        # ($5 stays in the COALESCE only so every parameter has a type.)
+                        query = """
+                            WITH artifact AS (
+                                DELETE FROM prediction_artifacts
+                                WHERE id = $8 AND professional_id = $1 AND expires_at > NOW()
+                                RETURNING image_base64, model_result
+                            )
+                            INSERT INTO attendances (
+                                professional_id, health_unit_id, admin_id,
+                                model_used, model_result, expected_result, correct_diagnosis,
+                                image_base64, observations
+                            )
+                            SELECT $1, $2, $3, $4, COALESCE(artifact.model_result, $5), $6, $7, artifact.image_base64, $9 FROM artifact
+                            RETURNING id, model_result
+                        """
+                        image_param = uuid.UUID(prediction_id)
+                    else:
+                        query = """
+                            INSERT INTO attendances (
+                                professional_id, health_unit_id, admin_id, 
+                                model_used, model_result, expected_result, correct_diagnosis,
+                                image_base64, observations
+                            )
+                            VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9) 
+                            RETURNING id
+                        """
+                        image_param = attendance_data["image_base64"]
                     
-                    returned_id = await conn.fetchval(
+                    row = await conn.fetchrow(
                         query,
                         professional_id,
                         health_unit_id,
@@ -68,10 +93,22 @@ class AttendanceRepository:
                         attendance_data["model_result"],
                         attendance_data.get("expected_result"),
                         attendance_data.get("correct_diagnosis"),
-                        attendance_data["image_base64"],
+                        image_param,
                         attendance_data.get("observations")
                     )
-                    
+
+                    if not row:
+                        logger.warning(f"Prediction {prediction_id} not found or expired when adding attendance")
+                        return {
+                            "attendance_id": "",
+                            "added": False,
+                            "reason": "Prediction not found or expired"
+                        }
+                    returned_id = row["id"]
+
+                    if prediction_id and attendance_data["model_used"] == "breast":
+                        # Caixas da detecção armazenada (o model_result da mama é a lista delas)
+                        bounding_boxes = json.loads(row["model_result"])
 
                     if attendance_data["model_used"] == "breast" and bounding_boxes:
                         for box in bounding_boxes:
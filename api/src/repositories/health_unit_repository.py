@@ -3,16 +3,22 @@ import asyncpg
 import uuid
 from typing import Any, Dict, List, Optional
 from ..utils.logger import get_logger
-from ..db.database import get_database
+from ..db.database import get_database, register_pool_owner
 from ..config.settings import Settings
+from ..utils.cache import TTLCache
 
 settings = Settings()
 logger = get_logger(__name__)
 
+health_unit_cache = TTLCache("health_units", settings.LOOKUP_CACHE_TTL_SECONDS, settings.LOOKUP_CACHE_MAX_ENTRIES)
+# Listings keyed by admin_id ("*" for all units); cleared on every health unit write
+health_unit_list_cache = TTLCache("health_unit_lists", settings.LOOKUP_CACHE_TTL_SECONDS, settings.LOOKUP_CACHE_MAX_ENTRIES)
+
 class HealthUnitRepository:
     def __init__(self):
         self.db_connection = get_database()
         self.pool = None
+        register_pool_owner(self)
 
     async def init_pool(self):
         """Initialize the connection pool if necessary."""
@@ -46,6 +52,7 @@ class HealthUnitRepository:
                     unit_data.get("status", "active")
                 )
                 logger.info(f"Health unit {unit_data['name']} added with ID {returned_id}")
+                health_unit_list_cache.clear()
                 return {
                     "unit_id": str(returned_id),
                     "added": True
@@ -62,6 +69,11 @@ class HealthUnitRepository:
         Retrieve all health units.
         If admin_id is provided, return only units associated with that admin.
         """
+        cache_key = str(admin_id) if admin_id else "*"
+        cached = health_unit_list_cache.get(cache_key)
+        if cached is not None:
+            return [dict(unit) for unit in cached]
+
         await self.init_pool()
         try:
             async with self.pool.acquire() as conn:
@@ -78,7 +90,7 @@ class HealthUnitRepository:
                     units = await conn.fetch(query)
                 
                 logger.info(f"Found {len(units)} health units")
-                return [
+                unit_list = [
                     {
                         "id": str(unit["id"]),
                         "admin_id": str(unit["admin_id"]),
@@ -89,12 +101,18 @@ class HealthUnitRepository:
                     }
                     for unit in units
                 ]
+                health_unit_list_cache.set(cache_key, unit_list)
+                return [dict(unit) for unit in unit_list]
         except Exception as e:
             logger.error(f"Error fetching health units: {e}")
             return []
         
     async def get_health_unit_by_id(self, unit_id: str) -> Optional[Dict]:
-        """Retrieve a health unit by ID."""
+        """Retrieve a health unit by ID. Found units are served from health_unit_cache until they expire or change."""
+        cached = health_unit_cache.get(str(unit_id))
+        if cached is not None:
+            return dict(cached)
+
         await self.init_pool()
         try:
             unit_uuid = uuid.UUID(unit_id)
@@ -103,7 +121,7 @@ class HealthUnitRepository:
                 unit = await conn.fetchrow(query, unit_uuid)
                 if unit:
                     logger.info(f"Health unit {unit_id} found")
-                    return {
+                    unit_data = {
                         "id": str(unit["id"]),
                         "admin_id": str(unit["admin_id"]),
                         "name": unit["name"],
@@ -111,6 +129,8 @@ class HealthUnitRepository:
                         "created_at": unit["created_at"],
                         "status": unit["status"]
                     }
+                    health_unit_cache.set(unit_data["id"], unit_data)
+                    return dict(unit_data)
                 else:
                     logger.info(f"Health unit {unit_id} not found")
                     return None
@@ -121,6 +141,47 @@ class HealthUnitRepository:
             logger.error(f"Error fetching health unit by ID: {e}")
             return None
         
+    async def get_health_units_by_ids(self, unit_ids: List[str]) -> List[Dict]:
+        """
+        Resolve many health units in a single query, returning only display fields.
+        Units already in health_unit_cache are not queried again.
+        """
+        found = []
+        missing = []
+        for unit_id in dict.fromkeys(unit_ids):
+            cached = health_unit_cache.get(unit_id)
+            if cached is not None:
+                found.append(cached)
+                continue
+            try:
+                missing.append(uuid.UUID(unit_id))
+            except ValueError:
+                logger.warning(f"Invalid UUID format in lookup: {unit_id}")
+
+        if missing:
+            await self.init_pool()
+            try:
+                async with self.pool.acquire() as conn:
+                    query = "SELECT id, admin_id, name, status FROM health_units WHERE id = ANY($1::uuid[])"
+                    units = await conn.fetch(query, missing)
+                    found.extend(
+                        {
+                            "id": str(unit["id"]),
+                            "admin_id": str(unit["admin_id"]),
+                            "name": unit["name"],
+                            "status": unit["status"]
+                        }
+                        for unit in units
+                    )
+            except Exception as e:
+                logger.error(f"Error looking up health units: {e}")
+
+        logger.info(f"Resolved {len(found)} of {len(unit_ids)} health units")
+        return [
+            {key: unit[key] for key in ("id", "admin_id", "name", "status")}
+            for unit in found
+        ]
+
     async def update_health_unit(self, unit_id: str, unit_data: Dict) -> Dict:
         """Update health unit information."""
         await self.init_pool()
@@ -150,6 +211,8 @@ class HealthUnitRepository:
                 )
                 if updated_id:
                     logger.info(f"Health unit {unit_id} updated")
+                    health_unit_cache.invalidate(str(unit_uuid))
+                    health_unit_list_cache.clear()
                     return {
                         "unit_id": unit_id,
                         "updated": True,
@@ -206,6 +269,8 @@ class HealthUnitRepository:
                 
                 if deleted_id:
                     logger.info(f"Health unit {unit_id} deleted successfully")
+                    health_unit_cache.invalidate(str(unit_uuid))
+                    health_unit_list_cache.clear()
                     return {
                         "unit_id": unit_id,
                         "deleted": True,
@@ -0,0 +1,130 @@
+import asyncpg
+import uuid
+from typing import Dict, Optional
+from ..utils.logger import get_logger
+from ..db.database import get_database, register_pool_owner
+from ..config.settings import Settings
+
+settings = Settings()
+logger = get_logger(__name__)
+
+class PredictionRepository:
+    """
+    Short-lived storage of prediction inputs and results, so an attendance
+    can later be created by referencing a prediction_id instead of
+    uploading the image again.
+    """
+
+    def __init__(self):
+        self.db_connection = get_database()
+        self.pool = None
+        register_pool_owner(self)
+
+    async def init_pool(self):
+        """Initialize the connection pool and the artifacts table if necessary."""
+        if not self.pool:
+            self.pool = await asyncpg.create_pool(dsn=self.db_connection, min_size=1, max_size=5)
+            async with self.pool.acquire() as conn:
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS prediction_artifacts (
+                        id UUID PRIMARY KEY,
+                        professional_id UUID NOT NULL,
+                        model_used TEXT NOT NULL,
+                        model_result TEXT NOT NULL,
+                        image_base64 TEXT NOT NULL,
+                        details TEXT,
+                        created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+                        expires_at TIMESTAMP NOT NULL
+                    )
+                """)
+                # Tabelas criadas antes da coluna details (detecções da mama, para renderizar a imagem anotada)
+                await conn.execute("ALTER TABLE prediction_artifacts ADD COLUMN IF NOT EXISTS details TEXT")
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_prediction_artifacts_expires_at ON prediction_artifacts (expires_at)"
+                )
+            logger.info("Prediction artifacts connection pool initialized.")
+
+    async def save_prediction(self, professional_id: str, model_used: str, model_result: str,
+                              image_base64: str, ttl_seconds: int, details: Optional[str] = None) -> Optional[str]:
+        """
+        Store a prediction and return its id. Expired rows are purged on the way.
+        """
+        await self.init_pool()
+        try:
+            prediction_id = uuid.uuid4()
+            async with self.pool.acquire() as conn:
+                await conn.execute("DELETE FROM prediction_artifacts WHERE expires_at < NOW()")
+                await conn.execute(
+                    """
+                    INSERT INTO prediction_artifacts (id, professional_id, model_used, model_result, image_base64, details, expires_at)
+                    VALUES ($1, $2, $3, $4, $5, $6, NOW() + make_interval(secs => $7))
+                    """,
+                    prediction_id,
+                    uuid.UUID(professional_id),
+                    model_used,
+                    model_result,
+                    image_base64,
+                    details,
+                    float(ttl_seconds)
+                )
+            logger.info(f"Prediction {prediction_id} stored for professional {professional_id}")
+            return str(prediction_id)
+        except Exception as e:
+            logger.error(f"Error storing prediction: {e}")
+            return None
+
+    async def get_prediction(self, prediction_id: str, professional_id: str) -> Optional[Dict]:
+        """Retrieve a non-expired prediction owned by the professional."""
+        await self.init_pool()
+        try:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT id, model_used, model_result, created_at, expires_at FROM prediction_artifacts
+                    WHERE id = $1 AND professional_id = $2 AND expires_at > NOW()
+                    """,
+                    uuid.UUID(prediction_id),
+                    uuid.UUID(professional_id)
+                )
+                if not row:
+                    return None
+                return {
+                    "id": str(row["id"]),
+                    "model_used": row["model_used"],
+                    "model_result": row["model_result"],
+                    "created_at": row["created_at"],
+                    "expires_at": row["expires_at"]
+                }
+        except ValueError:
+            logger.error(f"Invalid UUID format: {prediction_id}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching prediction: {e}")
+            return None
+
+    async def get_prediction_source(self, prediction_id: str, professional_id: str) -> Optional[Dict]:
+        """Retrieve the stored image and details of a non-expired prediction owned by the professional."""
+        await self.init_pool()
+        try:
+            async with self.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT model_used, image_base64, details FROM prediction_artifacts
+                    WHERE id = $1 AND professional_id = $2 AND expires_at > NOW()
+                    """,
+                    uuid.UUID(prediction_id),
+                    uuid.UUID(professional_id)
+                )
+                if not row:
+                    return None
+                return {
+                    "model_used": row["model_used"],
+                    "image_base64": row["image_base64"],
+                    "details": row["details"]
+                }
+        except ValueError:
+            logger.error(f"Invalid UUID format: {prediction_id}")
+            return None
+        except Exception as e:
+            logger.error(f"Error fetching prediction source: {e}")
+            return None
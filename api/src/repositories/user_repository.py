@@ -1,24 +1,35 @@
 from datetime import datetime
+import asyncio
 import asyncpg
 import uuid
 from typing import Any, Dict, List, Optional
 from ..utils.logger import get_logger
-from ..db.database import get_database
+from ..db.database import get_database, register_pool_owner
 from ..config.settings import Settings
+from ..utils.cache import TTLCache
 
 settings = Settings()
 logger = get_logger(__name__)
 
+user_cache = TTLCache("users", settings.LOOKUP_CACHE_TTL_SECONDS, settings.LOOKUP_CACHE_MAX_ENTRIES)
+
 class UserRepository:
+    # Um pool por processo, compartilhado pelas instâncias (use cases e limite de login)
+    pool = None
+    _pool_lock = asyncio.Lock()
+
     def __init__(self):
         self.db_connection = get_database()
-        self.pool = None
+        register_pool_owner(self)
 
     async def init_pool(self):
-        """Initialize the connection pool if necessary."""
-        if not self.pool:
-            self.pool = await asyncpg.create_pool(dsn=self.db_connection, min_size=1, max_size=10)
-            logger.info("Connection pool initialized.")
+        """Initialize the connection pool shared by every instance if necessary."""
+        if not UserRepository.pool:
+            # Instâncias inicializadas juntas (init_pools) criam um pool só
+            async with UserRepository._pool_lock:
+                if not UserRepository.pool:
+                    UserRepository.pool = await asyncpg.create_pool(dsn=self.db_connection, min_size=1, max_size=10)
+                    logger.info("Connection pool initialized.")
 
     async def add_user(self, user_data: Dict) -> Dict:
         """Add a new user."""
@@ -124,7 +135,11 @@ class UserRepository:
             return []
         
     async def get_user_by_id(self, user_id: str) -> Optional[Dict]:
-        """Retrieve a user by ID."""
+        """Retrieve a user by ID. Found users are served from user_cache until they expire or change."""
+        cached = user_cache.get(str(user_id))
+        if cached is not None:
+            return dict(cached)
+
         await self.init_pool()
         try:
             user_uuid = uuid.UUID(user_id)
@@ -133,7 +148,7 @@ class UserRepository:
                 user = await conn.fetchrow(query, user_uuid)
                 if user:
                     logger.info(f"User {user_id} found")
-                    return {
+                    user_data = {
                         "id": str(user["id"]),
                         "full_name": user["full_name"],
                         "email": user["email"],
@@ -143,6 +158,8 @@ class UserRepository:
                         "status": user["status"],
                         "created_at": user["created_at"]
                     }
+                    user_cache.set(user_data["id"], user_data)
+                    return dict(user_data)
                 else:
                     logger.info(f"User {user_id} not found")
                     return None
@@ -153,6 +170,49 @@ class UserRepository:
             logger.error(f"Error fetching user by ID: {e}")
             return None
         
+    async def get_users_by_ids(self, user_ids: List[str]) -> List[Dict]:
+        """
+        Resolve many users in a single query, returning only display fields.
+        Users already in user_cache are not queried again.
+        """
+        found = []
+        missing = []
+        for user_id in dict.fromkeys(user_ids):
+            cached = user_cache.get(user_id)
+            if cached is not None:
+                found.append(cached)
+                continue
+            try:
+                missing.append(uuid.UUID(user_id))
+            except ValueError:
+                logger.warning(f"Invalid UUID format in lookup: {user_id}")
+
+        if missing:
+            await self.init_pool()
+            try:
+                async with self.pool.acquire() as conn:
+                    query = "SELECT id, full_name, email, profile, admin_id, status FROM users WHERE id = ANY($1::uuid[])"
+                    users = await conn.fetch(query, missing)
+                    found.extend(
+                        {
+                            "id": str(user["id"]),
+                            "full_name": user["full_name"],
+                            "email": user["email"],
+                            "profile": user["profile"],
+                            "admin_id": str(user["admin_id"]) if user["admin_id"] else None,
+                            "status": user["status"]
+                        }
+                        for user in users
+                    )
+            except Exception as e:
+                logger.error(f"Error looking up users: {e}")
+
+        logger.info(f"Resolved {len(found)} of {len(user_ids)} users")
+        return [
+            {key: user[key] for key in ("id", "full_name", "email", "profile", "admin_id", "status")}
+            for user in found
+        ]
+
     async def get_user_by_email(self, email: str) -> Optional[Dict]:
         """Retrieve a user by email."""
         await self.init_pool()
@@ -211,6 +271,7 @@ class UserRepository:
                 )
                 if updated_id:
                     logger.info(f"User {user_id} updated")
+                    user_cache.invalidate(str(user_uuid))
                     return {
                         "user_id": user_id,
                         "updated": True,
@@ -245,6 +306,7 @@ class UserRepository:
                 updated_id = await conn.fetchval(query, password_hash, user_uuid)
                 if updated_id:
                     logger.info(f"Password updated for user {user_id}")
+                    user_cache.invalidate(str(user_uuid))
                     return {
                         "user_id": user_id,
                         "updated": True,
@@ -275,6 +337,7 @@ class UserRepository:
                 deleted_id = await conn.fetchval(query, user_uuid)
                 if deleted_id:
                     logger.info(f"User {user_id} deleted successfully")
+                    user_cache.invalidate(str(user_uuid))
                     return {
                         "user_id": user_id,
                         "deleted": True,
@@ -30,7 +30,7 @@ async def create_attendance(request: Request, attendance: CreateAttendance):
 async def get_attendances(
     request: Request, 
     health_unit_id: Optional[str] = None,
-    model_used: Optional[str] = Query(None, description="Model type used: respiratory, tuberculosis, osteoporosis, breast"),
+    model_used: Optional[str] = Query(None, description="Model type used: respiratory, tuberculosis, osteoporosis, breast, screening"),
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(10, ge=1, le=100, description="Items per page")
 ):
@@ -43,7 +43,7 @@ async def get_attendances(
     
     Filter parameters:
     - **health_unit_id**: Filter by specific health unit (required for administrators with multiple health units)
-    - **model_used**: Filter by model type (respiratory, tuberculosis, osteoporosis, breast)
+    - **model_used**: Filter by model type (respiratory, tuberculosis, osteoporosis, breast, screening)
     - **page**: Page number (default: 1)
     - **per_page**: Items per page (default: 10, max: 100)
     
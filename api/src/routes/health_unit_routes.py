@@ -3,6 +3,7 @@ from fastapi import APIRouter, Request
 from ..controllers.health_unit_controller import HealthUnitController
 from ..interfaces.create_health_unit import CreateHealthUnit
 from ..interfaces.update_health_unit import UpdateHealthUnit
+from ..interfaces.lookup_ids import LookupIds
 
 
 router = APIRouter(
@@ -38,6 +39,15 @@ async def get_health_units(request: Request):
     """
     return await health_unit_controller.get_health_units(request)
 
+@router.post("/lookup", summary="Get many health units by ID")
+async def lookup_health_units(request: Request, lookup: LookupIds):
+    """
+    Resolves up to 500 health unit IDs in a single call, returning only display fields.
+    
+    Returns the units found and the IDs that were not found.
+    """
+    return await health_unit_controller.lookup_health_units(request, lookup)
+
 @router.get("/{unit_id}", summary="Get health unit by ID")
 async def get_health_unit(request: Request, unit_id: str):
     """
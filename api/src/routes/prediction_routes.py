@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Request, UploadFile, File
+from typing import List, Optional
+from fastapi import APIRouter, Request, UploadFile, File, Query
 from ..controllers.predction_controller import PredictionController
 
 router = APIRouter(
@@ -10,7 +11,11 @@ router = APIRouter(
 prediction_controller = PredictionController()
 
 @router.post("/respiratory", summary="Prediction of respiratory diseases")
-async def predict_respiratory(request: Request, file: UploadFile = File(...)):
+async def predict_respiratory(
+    request: Request,
+    file: UploadFile = File(...),
+    persist: bool = Query(False, description="Store the image and result under a short-lived prediction_id for attendance creation")
+):
     """
     Performs prediction of respiratory diseases in an X-ray image.
     
@@ -19,45 +24,106 @@ async def predict_respiratory(request: Request, file: UploadFile = File(...)):
     
     Returns the probabilities for each disease class.
     """
-    return await prediction_controller.predict_respiratory(request, file)
+    return await prediction_controller.predict_respiratory(request, file, persist)
 
 @router.post("/breast-cancer", summary="Breast cancer detection")
-async def detect_breast_cancer(request: Request, file: UploadFile = File(...)):
+async def detect_breast_cancer(
+    request: Request,
+    file: UploadFile = File(...),
+    persist: bool = Query(False, description="Store the image and result under a short-lived prediction_id for attendance creation"),
+    profile: Optional[str] = Query(None, description="Detection profile: 'fast' (lower resolution, fewer proposals), 'accurate', or 'tiled' (full-resolution tiles within a latency budget)"),
+    health_unit_id: Optional[str] = Query(None, description="Use this health unit's configured profile when no profile is given"),
+    annotated: bool = Query(True, description="Include the annotated image; false returns only boxes and scores plus an annotated_image_url")
+):
     """
     Detects possible areas with breast cancer in a mammography.
     
     - **Requires professional profile**
     - Uses Faster R-CNN model to detect masses
     - Returns annotated image with suspicious regions
+    - Detection profile: `profile`, else the health unit's, else the server default
+    - `annotated=false`: no image in the response; boxes are in pixels of `image_size`
+      for the client to draw over the original image. With `persist=true` the
+      detection_id is the prediction_id, renderable by any server worker
+    - `Accept: multipart/mixed`: the JSON body and the annotated image as raw bytes in
+      a second part (no base64)
+    - `Accept` naming `image/webp` or `image/jpeg` picks the annotated image encoding
     
-    Returns the detections found and the annotated image in base64.
+    Returns the detections found, the profile used and the annotated image in base64.
     """
-    return await prediction_controller.detect_breast_cancer(request, file)
+    return await prediction_controller.detect_breast_cancer(request, file, persist, profile, health_unit_id, annotated)
+
+@router.get("/breast-cancer/{detection_id}/annotated", summary="Annotated breast cancer detection image")
+async def get_breast_annotation(request: Request, detection_id: str):
+    """
+    Returns the annotated JPEG of a detection made with `annotated=false`.
+    
+    - **Requires professional profile** (the user who ran the detection)
+    - Rendered on the first request and cached while the detection is kept
+    - Without `persist=true` the detection is kept only by the server worker that
+      ran it; persisted detections are rebuilt from the stored prediction
+    - JPEG or WebP, negotiated through `Accept` (default: server configuration)
+    
+    Returns 404 once the detection has expired.
+    """
+    return await prediction_controller.get_breast_annotation(request, detection_id)
 
 @router.post("/tuberculosis", summary="Tuberculosis prediction")
-async def predict_tuberculosis(request: Request, file: UploadFile = File(...)):
+async def predict_tuberculosis(
+    request: Request,
+    file: UploadFile = File(...),
+    persist: bool = Query(False, description="Store the image and result under a short-lived prediction_id for attendance creation"),
+    cascade: Optional[bool] = Query(None, description="Run a fast screen first and the full model only when it is uncertain (default: server configuration)")
+):
     """
     Predicts the probability of tuberculosis in an X-ray image.
     
     - **Requires professional profile**
     - Classifies the image as positive or negative for tuberculosis
+    - With the cascade, `prediction.cascade.decided_by` tells whether the screen or the full model decided
     
     Returns the predicted class and probabilities.
     """
-    return await prediction_controller.predict_tuberculosis(request, file)
+    return await prediction_controller.predict_tuberculosis(request, file, persist, cascade)
 
 
 @router.post("/osteoporosis", summary="Osteoporosis prediction")
-async def predict_osteoporosis(request: Request, file: UploadFile = File(...)):
+async def predict_osteoporosis(
+    request: Request,
+    file: UploadFile = File(...),
+    persist: bool = Query(False, description="Store the image and result under a short-lived prediction_id for attendance creation"),
+    cascade: Optional[bool] = Query(None, description="Run a fast screen first and the full model only when it is uncertain (default: server configuration)")
+):
     """
     Predicts the presence of osteoporosis in an X-ray image.
     
     - **Requires professional profile**
     - Classifies the image into one of three categories: Normal, Osteopenia or Osteoporosis
+    - With the cascade, `prediction.cascade.decided_by` tells whether the screen or the full model decided
     
     Returns the predicted class and probabilities for each category.
     """
-    return await prediction_controller.prediction_osteoporosis(request, file)
+    return await prediction_controller.prediction_osteoporosis(request, file, persist, cascade)
+
+
+@router.post("/screening", summary="Run several models on one image")
+async def predict_screening(
+    request: Request,
+    file: UploadFile = File(...),
+    models: List[str] = Query(..., description="Models to run, e.g. models=tuberculosis&models=respiratory (comma-separated also accepted)"),
+    persist: bool = Query(False, description="Store the image and all results under one prediction_id, to create a single attendance with model_used='screening'")
+):
+    """
+    Runs several prediction models on a single upload (e.g. tuberculosis and
+    respiratory on the same chest X-ray).
+
+    - **Requires professional profile**
+    - The image is decoded once and the models run concurrently
+    - A model that fails is reported in `errors` without discarding the others
+
+    Returns the result of each model and per-model timings in milliseconds.
+    """
+    return await prediction_controller.predict_screening(request, file, models, persist)
 
 
 @router.get("/classes", summary="Get possible classes for each prediction model")
@@ -67,4 +133,18 @@ async def get_model_classes():
     type of prediction model available (e.g., 'respiratory', 'tuberculosis').
     Useful for populating selection options in the UI.
     """
-    return await prediction_controller.get_model_classes()
\ No newline at end of file
+    return await prediction_controller.get_model_classes()
+
+
+@router.get("/models", summary="Get the input resolution of each prediction model")
+async def get_model_info():
+    """
+    Returns, for each prediction model, the input size it consumes and the
+    largest upload dimension (longest side) that still matters for the result.
+    Clients can downscale images to `max_upload_dimension` before uploading.
+    For breast detection the limit depends on the profile that runs: use
+    `max_upload_dimension_by_profile[profile]` and send that `profile` explicitly
+    (a health unit mapped to another profile, e.g. "tiled", needs its own limit;
+    `max_upload_dimension` is the default profile's).
+    """
+    return await prediction_controller.get_model_info()
@@ -5,6 +5,7 @@ from ..interfaces.create_user import CreateUser
 from ..interfaces.update_user import UpdateUser
 from ..interfaces.login_user import LoginUser
 from ..interfaces.create_subscriptions import CreateSubscriptions
+from ..interfaces.lookup_ids import LookupIds
 
 router = APIRouter(
     prefix="/api/users",
@@ -114,6 +115,18 @@ async def create_subscription(request: Request, subscription: CreateSubscription
     """
     return await user_controller.create_subscription(request, subscription)
 
+@router.post("/lookup", summary="Get many users by ID")
+async def lookup_users(request: Request, lookup: LookupIds):
+    """
+    Resolves up to 500 user IDs in a single call, returning only display fields.
+    
+    - **Administrators**: Can resolve any user
+    - **Other users**: Only their own ID is resolved
+    
+    Returns the users found and the IDs that were not found.
+    """
+    return await user_controller.lookup_users(request, lookup)
+
 @router.get("/{user_id}", summary="Get user by ID")
 async def get_user(request: Request, user_id: str):
     """
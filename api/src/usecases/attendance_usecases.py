@@ -5,6 +5,7 @@ from ..interfaces.update_attendance import UpdateAttendance
 from ..repositories.attendance_repository import AttendanceRepository
 from ..repositories.user_repository import UserRepository
 from ..repositories.health_unit_repository import HealthUnitRepository
+from ..repositories.prediction_repository import PredictionRepository
 from ..utils.error_handler import raise_http_error
 from src.config.settings import Settings
 from typing import List, Dict, Any
@@ -18,6 +19,7 @@ class AttendanceUseCases:
         self.attendance_repository = AttendanceRepository()
         self.user_repository = UserRepository()
         self.health_unit_repository = HealthUnitRepository()
+        self.prediction_repository = PredictionRepository()
 
 
     async def add_attendance(self, attendance: CreateAttendance, professional_id: str, admin_id: str, audit_data: Dict[str, Any] = None):
@@ -55,7 +57,7 @@ class AttendanceUseCases:
                 logger.error(f"Error adding attendance: Health unit {health_unit_id} belongs to a different administrator ({health_unit['admin_id']}) than the professional's ({admin_id})")
                 raise_http_error(403, "Health unit belongs to a different administrator")
 
-            valid_models = ["respiratory", "tuberculosis", "osteoporosis", "breast"]
+            valid_models = ["respiratory", "tuberculosis", "osteoporosis", "breast", "screening"]
             if attendance_data["model_used"] not in valid_models:
                 logger.error(f"Error adding attendance: Invalid model '{attendance_data['model_used']}'")
                 raise_http_error(422, f"Invalid model. Should be one of: {', '.join(valid_models)}")
@@ -78,9 +80,25 @@ class AttendanceUseCases:
             attendance_data["professional_id"] = professional_id
             attendance_data["admin_id"] = admin_id # Adiciona o admin_id recebido
 
-            if not attendance_data.get("image_base64"):
+            if attendance_data.get("prediction_id"):
+                # Imagem e resultado já armazenados pela predição: o cadastro é só de metadados
+                # (o resultado enviado pelo cliente é ignorado; o repositório usa o da predição)
+                attendance_data["image_base64"] = None
+                attendance_data["model_result"] = None
+                attendance_data["bounding_boxes"] = None
+                prediction = await self.prediction_repository.get_prediction(attendance_data["prediction_id"], professional_id)
+                if not prediction:
+                    logger.error(f"Error adding attendance: Prediction {attendance_data['prediction_id']} not found or expired")
+                    raise_http_error(404, "Prediction not found or expired")
+                if prediction["model_used"] != attendance_data["model_used"]:
+                    logger.error(f"Error adding attendance: Prediction {attendance_data['prediction_id']} was made with model '{prediction['model_used']}'")
+                    raise_http_error(422, "Prediction was made with a different model")
+            elif not attendance_data.get("image_base64"):
                 logger.error("Error adding attendance: Image in base64 format is required")
-                raise_http_error(400, "Image in base64 format is required")
+                raise_http_error(400, "Image in base64 format or prediction_id is required")
+            elif not attendance_data.get("model_result"):
+                logger.error("Error adding attendance: Model result is required")
+                raise_http_error(400, "Model result or prediction_id is required")
 
             # Passar os dados, incluindo bounding_boxes se existirem
             result = await self.attendance_repository.add_attendance(attendance_data)
@@ -94,6 +112,8 @@ class AttendanceUseCases:
                         "status_code": 201
                     }
                 }
+            elif result.get("reason") == "Prediction not found or expired":
+                raise_http_error(404, "Prediction not found or expired")
             else:
                 logger.error("Error adding attendance record to database", extra=audit_data)
                 raise_http_error(500, "Error adding attendance record to database")
@@ -127,7 +147,7 @@ class AttendanceUseCases:
         try:
 
             if model_used:
-                valid_models = ["respiratory", "tuberculosis", "osteoporosis", "breast"]
+                valid_models = ["respiratory", "tuberculosis", "osteoporosis", "breast", "screening"]
                 if model_used not in valid_models:
                     logger.error(f"Error retrieving attendances: Invalid model '{model_used}'")
                     raise_http_error(422, f"Invalid model. Should be one of: {', '.join(valid_models)}")
@@ -248,7 +268,7 @@ class AttendanceUseCases:
             attendance_data = attendance.dict(exclude_unset=True)
             
             if "model_used" in attendance_data:
-                valid_models = ["respiratory", "tuberculosis", "osteoporosis", "breast"]
+                valid_models = ["respiratory", "tuberculosis", "osteoporosis", "breast", "screening"]
                 if attendance_data["model_used"] not in valid_models:
                     logger.error(f"Error updating attendance: Invalid model '{attendance_data['model_used']}'")
                     raise_http_error(422, f"Invalid model. Should be one of: {', '.join(valid_models)}")
@@ -1,4 +1,5 @@
 from fastapi import HTTPException
+from typing import List
 from ..utils.logger import get_logger
 from ..interfaces.create_health_unit import CreateHealthUnit
 from ..interfaces.update_health_unit import UpdateHealthUnit
@@ -111,6 +112,24 @@ class HealthUnitUseCases:
             logger.error(f"Error retrieving health unit: {e}")
             raise_http_error(500, "Error retrieving health unit")
     
+    async def lookup_health_units(self, unit_ids: List[str], audit_data=None):
+        """Resolve a list of health unit IDs to their display fields in one query."""
+        try:
+            units = await self.health_unit_repository.get_health_units_by_ids(unit_ids)
+            found_ids = {unit["id"] for unit in units}
+
+            return {
+                "detail": {
+                    "message": "Health units retrieved successfully",
+                    "health_units": units,
+                    "not_found": [unit_id for unit_id in dict.fromkeys(unit_ids) if unit_id not in found_ids],
+                    "status_code": 200
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error looking up health units: {e}")
+            raise_http_error(500, "Error retrieving health units")
+
     async def update_health_unit(self, unit_id: str, health_unit: UpdateHealthUnit, audit_data=None):
         """Update health unit information."""
         try:
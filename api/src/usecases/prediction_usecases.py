@@ -1,19 +1,40 @@
-from typing import Dict, List
-import numpy as np
-from PIL import Image, UnidentifiedImageError, ImageDraw, ImageFont
+from typing import Dict, List, Optional
+import asyncio
+import base64
+import json
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, UnidentifiedImageError
 import os
-import io
-import cv2
 import torch
 import torch.nn.functional as F
-import torchvision.transforms as T
-from torchvision.transforms import ToTensor
 from torchvision.ops import nms
 from fastapi import HTTPException
 from ..utils.logger import get_logger
 from ..neural_network_weights.load_models import load_model_respiratory_diseases, load_model_breast_cancer, load_model_tuberculosis, load_model_osteoporosis
 from ..utils.load_files import load_file_to_dictionary
-
+from ..utils.inference_backend import OnnxRuntimeBackend, create_inference_backend, exported_model_path
+from ..utils.cascade import (
+    CascadeScreen, cascade_record, parse_cascade_bands, positive_probability, record_decision
+)
+from ..utils.detection_profiles import (
+    DETECTION_PROFILES, DEFAULT_POST_NMS_THRESHOLD, build_profile_detectors, parse_profile_mapping
+)
+from ..utils.tiled_detection import detect_tiled
+from ..utils.runtime_config import configure_runtime
+from ..utils.annotation import IMAGE_FORMATS, annotate_detections, encode_image
+from ..utils.cache import TTLCache
+from ..utils.image_ingest import decode_image
+from ..utils.preprocessing import (
+    PreprocessingEngine, ClassifierPreprocessor, DetectorPreprocessor, ImagePreprocessor,
+    StageTimer, record_timings
+)
+from ..repositories.prediction_repository import PredictionRepository
+from ..config.settings import Settings
+
+settings = Settings()
 logger = get_logger(__name__)
 
 # Load models globally to avoid reloading them on each request
@@ -21,29 +42,327 @@ try:
     logger.info("Initializing AI models...")
     device = torch.device('cuda') if torch.cuda.is_available() else torch.device('cpu')
     logger.info(f"Using device: {device}")
+    logger.info(f"Inference backend: {settings.INFERENCE_BACKEND}")
+
+    # Threads por chamada de inferência, antes de qualquer modelo rodar (workers x slots cabem nos núcleos)
+    thread_layout = configure_runtime(settings)
+    ort_intra_op_threads = settings.ORT_INTRA_OP_THREADS or thread_layout["intra_op_threads"]
+
+    int8_models = {name.strip() for name in settings.INFERENCE_INT8_MODELS.split(",") if name.strip()}
+
+    def _load(model_name: str, kind: str, load_eager):
+        """Model behind the configured backend (eager PyTorch if there is no usable export)."""
+        backend = "onnx-int8" if model_name in int8_models else settings.INFERENCE_BACKEND
+        return create_inference_backend(
+            model_name, kind, backend, load_eager, device,
+            settings.INFERENCE_MODELS_DIR,
+            ort_intra_op_threads, settings.ORT_INTER_OP_THREADS,
+            shared_weights=settings.INFERENCE_SHARED_WEIGHTS
+        )
     
     # Model for respiratory diagnosis
-    model = load_model_respiratory_diseases()
+    model = _load("respiratory", "yolo", load_model_respiratory_diseases)
     logger.info("Respiratory model loaded successfully")
     
     # Model for breast cancer with Faster R-CNN
-    model_breast_cancer_faster_rcnn = load_model_breast_cancer(device)
+    model_breast_cancer_faster_rcnn = _load("breast", "detector", lambda: load_model_breast_cancer(device))
+    # One configured detector per profile (fast / accurate), sharing the weights
+    breast_detectors = build_profile_detectors(model_breast_cancer_faster_rcnn)
     logger.info("Breast cancer model loaded successfully")
     
     # Model for tuberculosis
-    model_tb = load_model_tuberculosis(device)
+    model_tb = _load("tuberculosis", "classifier", lambda: load_model_tuberculosis(device))
     logger.info("Tuberculosis model loaded successfully")
 
     # Model for osteoporosis
-    model_osteoporosis = load_model_osteoporosis(device)
+    model_osteoporosis = _load("osteoporosis", "classifier", lambda: load_model_osteoporosis(device))
     logger.info("Osteoporosis model loaded successfully")
+
+    cascade_bands = parse_cascade_bands(settings.CASCADE_BANDS)
+
+    def _cascade_screen(model_name: str, backend) -> Optional[CascadeScreen]:
+        """First stage of a classifier's cascade: its tiny screen export, else the model at reduced size."""
+        screen_path = exported_model_path(settings.INFERENCE_MODELS_DIR, f"{model_name}-screen", "onnx")
+        default_size = (settings.CASCADE_SCREEN_SIZE, settings.CASCADE_SCREEN_SIZE)
+        if os.path.exists(screen_path):
+            screen = OnnxRuntimeBackend(
+                screen_path, "classifier",
+                ort_intra_op_threads, settings.ORT_INTER_OP_THREADS, name="onnx-screen"
+            )
+            shape = screen.session.get_inputs()[0].shape[2:]
+            size = tuple(shape) if all(isinstance(side, int) for side in shape) else default_size
+            return CascadeScreen(screen, size, cascade_bands[model_name])
+        # Grafos ONNX têm a entrada fixa em 224x224; só eager/TorchScript aceitam outra resolução
+        if backend.name not in ("eager", "torchscript"):
+            logger.warning(f"No screen model for '{model_name}' at {screen_path}; cascade disabled with backend '{backend.name}'")
+            return None
+        threads = torch.get_num_threads()
+        try:
+            # Em uma thread: nenhum pool OpenMP é criado antes do fork (servidor com preload, gunicorn.conf.py)
+            torch.set_num_threads(1)
+            with torch.no_grad():
+                backend(torch.zeros(1, 3, *default_size, device=device))
+        except Exception as e:
+            logger.warning(f"Model '{model_name}' does not accept {default_size} inputs; cascade disabled: {str(e)}")
+            return None
+        finally:
+            torch.set_num_threads(threads)
+        return CascadeScreen(backend, default_size, cascade_bands[model_name])
+
+    # Primeiro estágio da cascata de cada classificador (None = cascata indisponível)
+    cascade_screens = {
+        "tuberculosis": _cascade_screen("tuberculosis", model_tb),
+        "osteoporosis": _cascade_screen("osteoporosis", model_osteoporosis),
+    }
+    cascade_models = {name.strip() for name in settings.CASCADE_MODELS.split(",") if name.strip()}
+    logger.info(f"Cascade enabled by default for: {', '.join(sorted(cascade_models)) or 'none'}")
 except Exception as e:
     logger.error(f"Error loading models: {str(e)}")
     raise
 
+# Input resolution each model actually consumes. Clients may downscale uploads to
+# max_upload_dimension (longest side) before sending without changing the result
+# materially; anything larger is resized away on the server anyway.
+MODEL_INPUT_SPECS = {
+    "respiratory": {
+        "input_size": [640, 640],  # YOLO letterboxes to its own imgsz
+        "max_upload_dimension": 640,
+        "preserves_aspect_ratio": True,
+    },
+    "breast": {
+        "input_size": None,  # Variable: longest side capped, Faster R-CNN handles the rest
+        "max_upload_dimension": 1024,
+        "preserves_aspect_ratio": True,
+    },
+    "tuberculosis": {
+        "input_size": [224, 224],
+        "max_upload_dimension": 448,  # 2x margin over the 224x224 resize
+        "preserves_aspect_ratio": False,
+    },
+    "osteoporosis": {
+        "input_size": [224, 224],
+        "max_upload_dimension": 448,
+        "preserves_aspect_ratio": False,
+    },
+}
+
+# Preprocessing built once per model; uploads are decoded once per request
+preprocessing_engine = PreprocessingEngine({
+    "respiratory": ImagePreprocessor(MODEL_INPUT_SPECS["respiratory"]["max_upload_dimension"]),
+    "breast": DetectorPreprocessor(DETECTION_PROFILES[settings.BREAST_DETECTION_PROFILE]["max_side"], device),
+    **{
+        f"breast:{name}": DetectorPreprocessor(profile["max_side"], device)
+        for name, profile in DETECTION_PROFILES.items()
+    },
+    "tuberculosis": ClassifierPreprocessor(tuple(MODEL_INPUT_SPECS["tuberculosis"]["input_size"]), device),
+    "osteoporosis": ClassifierPreprocessor(tuple(MODEL_INPUT_SPECS["osteoporosis"]["input_size"]), device),
+    **{
+        f"{name}:screen": ClassifierPreprocessor(screen.input_size, device)
+        for name, screen in cascade_screens.items() if screen
+    },
+}, max_pixels=settings.IMAGE_MAX_PIXELS)
+
+
+# Decode and inference are blocking (PIL/torch release the GIL): they run on this pool so
+# the event loop stays free and a screening request can run several models at once
+inference_executor = ThreadPoolExecutor(max_workers=settings.INFERENCE_WORKERS, thread_name_prefix="inference")
+
+
+async def run_inference(func, *args):
+    """Runs a blocking preprocessing/inference call on the inference pool."""
+    return await asyncio.get_running_loop().run_in_executor(inference_executor, func, *args)
+
+
+# Imagens de exibição das detecções sem anotação, para renderizar sob demanda (e a renderização, depois de feita).
+# O cache é de cada worker: só o worker que fez a detecção a encontra aqui. Detecções persistidas
+# (persist=true) usam o prediction_id como detection_id e qualquer worker as renderiza a partir
+# da predição guardada (render_breast_annotation).
+annotation_cache = TTLCache(
+    "breast_annotations", settings.BREAST_ANNOTATION_CACHE_TTL_SECONDS, settings.BREAST_ANNOTATION_CACHE_MAX_ENTRIES
+)
+
+
+breast_profile_by_health_unit = parse_profile_mapping(settings.BREAST_DETECTION_PROFILE_BY_HEALTH_UNIT)
+
+
+def resolve_detection_profile(profile: Optional[str] = None, health_unit_id: Optional[str] = None) -> str:
+    """
+    Breast detection profile for a request: the one asked for, else the health
+    unit's (BREAST_DETECTION_PROFILE_BY_HEALTH_UNIT), else BREAST_DETECTION_PROFILE.
+    """
+    if profile:
+        if profile not in DETECTION_PROFILES:
+            raise HTTPException(
+                status_code=422,
+                detail={
+                    "message": f"Invalid detection profile. Should be one of: {', '.join(DETECTION_PROFILES)}",
+                    "status_code": 422
+                }
+            )
+        return profile
+    unit_profile = breast_profile_by_health_unit.get(str(health_unit_id)) if health_unit_id else None
+    if unit_profile in DETECTION_PROFILES:
+        return unit_profile
+    return settings.BREAST_DETECTION_PROFILE
+
+
+def _finish_timings(model_name: str, timer: StageTimer):
+    """Logs and aggregates the stage timings of one prediction (see /api/metrics)."""
+    record_timings(model_name, timer)
+    logger.info(f"{model_name} prediction timings (ms): {timer.as_dict()}")
+
+def _classify(model_name: str, backend, image: Image.Image, timer: StageTimer,
+              cascade: Optional[bool] = None):
+    """
+    Softmax probabilities of a classifier for a decoded image.
+
+    With the cascade on (per request, else CASCADE_MODELS) the screen runs first
+    and its result stands when its positive probability is outside the model's
+    band; otherwise the full model decides.
+
+    Returns:
+        tuple: probabilities (1 x classes) and the cascade audit entry (None without cascade)
+    """
+    use_cascade = cascade if cascade is not None else model_name in cascade_models
+    screen = cascade_screens.get(model_name) if use_cascade else None
+    if use_cascade and screen is None:
+        logger.warning(f"Cascade requested for '{model_name}' but no screen is available; running the full model")
+
+    if screen:
+        screen_tensor = preprocessing_engine.prepare(f"{model_name}:screen", image, timer)
+        with timer.stage("inference_screen"), torch.no_grad():
+            screen_probs = F.softmax(screen.backend(screen_tensor), dim=1)
+        screen_positive = positive_probability(model_name, screen_probs)
+        if screen.decides(screen_positive, screen_probs.shape[1]):
+            record_decision(model_name, "screen")
+            return screen_probs, cascade_record("screen", screen_positive, screen.band, screen.backend.name)
+
+    # Resize + ToTensor + Normalize (transformação construída uma vez na carga)
+    img_tensor = preprocessing_engine.prepare(model_name, image, timer)
+    with timer.stage("inference"), torch.no_grad():
+        probs = F.softmax(backend(img_tensor), dim=1)
+
+    if not screen:
+        return probs, None
+    record_decision(model_name, "full")
+    return probs, cascade_record("full", screen_positive, screen.band, screen.backend.name)
+
+
+WARMUP_MODELS = ("respiratory", "breast", "tuberculosis", "osteoporosis")
+
+
+def _synthetic_image(width: int, height: int) -> Image.Image:
+    """Gaussian noise image: gives detectors proposals to score and suppress, unlike a flat image."""
+    return Image.effect_noise((width, height), 64).convert("RGB")
+
+
+def _warm_up_once(model_name: str):
+    """One pass of a model over synthetic inputs at every shape production feeds it."""
+    timer = StageTimer()  # Descartado: o aquecimento não entra nas métricas
+    with torch.no_grad():
+        if model_name == "respiratory":
+            side = MODEL_INPUT_SPECS["respiratory"]["max_upload_dimension"]
+            model(preprocessing_engine.prepare("respiratory", _synthetic_image(side, side), timer))
+        elif model_name == "breast":
+            for name, profile in DETECTION_PROFILES.items():
+                tiling = profile.get("tiling")
+                if tiling:
+                    # O passo grosso é o do perfil coarse_profile; aqui só o lote de tiles em escala 1:1
+                    size = tiling["tile_size"]
+                    breast_detectors[name]([torch.rand(3, size, size, device=device) for _ in range(tiling["batch_size"])])
+                else:
+                    # Mamografias são retrato: lado maior na altura
+                    side = profile["max_side"]
+                    _, img_tensor = preprocessing_engine.prepare(f"breast:{name}", _synthetic_image(side * 4 // 5, side), timer)
+                    breast_detectors[name]([img_tensor])
+        else:
+            backend = model_tb if model_name == "tuberculosis" else model_osteoporosis
+            side = MODEL_INPUT_SPECS[model_name]["max_upload_dimension"]
+            image = _synthetic_image(side, side)
+            backend(preprocessing_engine.prepare(model_name, image, timer))
+            screen = cascade_screens.get(model_name)
+            if screen:
+                screen.backend(preprocessing_engine.prepare(f"{model_name}:screen", image, timer))
+
+
+def warm_up_model(model_name: str, rounds: int) -> List[float]:
+    """
+    Runs a model `rounds` times on synthetic inputs so torch/ultralytics pay their
+    lazy allocator and kernel setup before the first request (blocking; run it
+    on the inference pool). Nothing is recorded in the prediction metrics.
+
+    Returns:
+        list: duration in ms of each round
+    """
+    round_ms = []
+    for _ in range(max(1, rounds)):
+        start = time.perf_counter()
+        _warm_up_once(model_name)
+        round_ms.append((time.perf_counter() - start) * 1000)
+    logger.info(f"{model_name} warm-up (ms per round): {[round(ms, 1) for ms in round_ms]}")
+    return round_ms
+
+
 class PredictionUseCases:
     def __init__(self):
-        pass  # Models are already loaded globally
+        # Models are already loaded globally
+        self.prediction_repository = PredictionRepository()
+
+    async def store_prediction(self, professional_id: str, model_used: str, model_result, image_data: bytes,
+                               details: Optional[Dict] = None) -> Optional[Dict]:
+        """
+        Persists the uploaded image and the model result for a short time so an
+        attendance can reference them by prediction_id. `details` keeps what is
+        needed to render the result again (e.g. the breast detections).
+
+        Returns:
+            dict: prediction_id and its time to live, or None if it could not be stored
+        """
+        if not isinstance(model_result, str):
+            model_result = json.dumps(model_result)
+        prediction_id = await self.prediction_repository.save_prediction(
+            professional_id,
+            model_used,
+            model_result,
+            base64.b64encode(image_data).decode('utf-8'),
+            settings.PREDICTION_ARTIFACT_TTL_SECONDS,
+            json.dumps(details) if details is not None else None
+        )
+        if not prediction_id:
+            return None
+        return {
+            "prediction_id": prediction_id,
+            "prediction_expires_in": settings.PREDICTION_ARTIFACT_TTL_SECONDS
+        }
+
+    def _predict_respiratory_image(self, image: Image.Image, timer: StageTimer) -> Dict:
+        """Runs the YOLO model on a decoded image (blocking; runs on the inference pool)."""
+        image = preprocessing_engine.prepare("respiratory", image, timer)
+
+        # Realiza a predição usando o modelo
+        with timer.stage("inference"):
+            prediction = model(image)
+
+        if not prediction[0]:
+            logger.error("Failed to process prediction - empty result")
+            raise HTTPException(
+                status_code=400, 
+                detail={
+                    "message": "An error occurred while processing the image. Please check if the image is in the correct format and try again.",
+                    "status_code": 400
+                }
+            )
+
+        # Salva os resultados em um arquivo temporário (um por chamada: predições rodam em paralelo)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results_path = os.path.join(tmp_dir, 'results.txt')
+            prediction[0].save_txt(results_path)
+
+            # Carrega os resultados do arquivo para um dicionário
+            result_dict = load_file_to_dictionary(results_path)
+
+        _finish_timings("respiratory", timer)
+        return result_dict
 
     async def predict_respiratory(self, image_data: bytes):
         """
@@ -57,9 +376,10 @@ class PredictionUseCases:
         """
         try:
             logger.info("Starting image prediction for respiratory diagnosis")
-            
-            # Carrega a imagem a partir dos bytes
-            image = Image.open(io.BytesIO(image_data))
+            timer = StageTimer()
+
+            # Decodifica já reduzida ao tamanho que o YOLO usa (o YOLO faz o próprio letterbox)
+            image = await run_inference(preprocessing_engine.decode, image_data, ["respiratory"], timer)
 
             if not image:
                 logger.error("Failed to process image - invalid image")
@@ -70,33 +390,22 @@ class PredictionUseCases:
                         "status_code": 400
                     }
                 )
-            
-            # Realiza a predição usando o modelo
-            prediction = model(image)
-
-            if not prediction[0]:
-                logger.error("Failed to process prediction - empty result")
-                raise HTTPException(
-                    status_code=400, 
-                    detail={
-                        "message": "An error occurred while processing the image. Please check if the image is in the correct format and try again.",
-                        "status_code": 400
-                    }
-                )
 
-            # Salva os resultados em um arquivo temporário
-            prediction[0].save_txt('results.txt')
+            result_dict = await run_inference(self._predict_respiratory_image, image, timer)
 
-            # Carrega os resultados do arquivo para um dicionário
-            result_dict = load_file_to_dictionary('results.txt')
-            
-            # Remove o arquivo temporário
-            if os.path.exists('results.txt'):
-                os.remove('results.txt')
-                
             logger.info("Respiratory image prediction completed successfully")
             return result_dict
 
+        except Image.DecompressionBombError as e:
+            logger.error(f"Rejected oversized image: {str(e)}")
+            raise HTTPException(
+                status_code=413,
+                detail={
+                    "message": "Image dimensions exceed the allowed limit.",
+                    "status_code": 413
+                }
+            )
+
         except UnidentifiedImageError:
             logger.error("Error identifying image format")
             raise HTTPException(
@@ -120,214 +429,177 @@ class PredictionUseCases:
                 }
             )
 
-    async def detect_breast_cancer(self, image_data: bytes):
+    def _detect_breast_cancer_image(self, image: Image.Image, timer: StageTimer,
+                                    profile: Optional[str] = None, annotated: bool = True,
+                                    image_format: Optional[str] = None) -> Dict:
         """
-        Detects breast cancer in a mammography using Faster R-CNN.
-        
-        Args:
-            image_data: bytes of the image to be analyzed
-            
-        Returns:
-            dict: Dictionary with detections and annotated image
+        Runs Faster R-CNN on a decoded image (blocking; runs on the inference pool).
+        `profile` is a key of DETECTION_PROFILES (default: BREAST_DETECTION_PROFILE).
+        With `annotated` the result carries the annotated image encoded as
+        `image_format` (default: ANNOTATED_IMAGE_FORMAT), otherwise the display
+        image the boxes refer to (see detect_breast_cancer).
         """
-        try:
-            logger.info("Starting breast cancer detection with Faster R-CNN")
-            
-            # Carrega a imagem a partir dos bytes
-            image = Image.open(io.BytesIO(image_data)).convert('RGB')
-            
-            # Normaliza o tamanho da imagem
-            max_dimension = 1024  # Dimensão máxima permitida
-            width, height = image.size
-            
-            # Calcula a nova dimensão mantendo a proporção
-            if width > max_dimension or height > max_dimension:
-                if width > height:
-                    new_width = max_dimension
-                    new_height = int((height * max_dimension) / width)
-                else:
-                    new_height = max_dimension
-                    new_width = int((width * max_dimension) / height)
-                
-                # Redimensiona a imagem mantendo a qualidade
-                image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                
-            image_np = np.array(image)
-
-            if image_np.size == 0:
-                logger.error("Empty or unprocessable image")
-                raise HTTPException(
-                    status_code=400, 
-                    detail={
-                        "message": "The image is empty or cannot be processed.",
-                        "status_code": 400
-                    }
-                )
+        profile = profile or settings.BREAST_DETECTION_PROFILE
+        profile_settings = DETECTION_PROFILES[profile]
+        if image.width == 0 or image.height == 0:
+            logger.error("Empty or unprocessable image")
+            raise HTTPException(
+                status_code=400, 
+                detail={
+                    "message": "The image is empty or cannot be processed.",
+                    "status_code": 400
+                }
+            )
 
-            # Prepara a imagem para o modelo
-            transform = ToTensor()
-            img_tensor = transform(image).to(device)
+        tiling_stats = None
+        if profile_settings.get("tiling"):
+            # Passo na resolução de exibição + tiles em resolução cheia dentro do orçamento de latência
+            tiling = {**profile_settings["tiling"], "budget_ms": settings.BREAST_TILED_BUDGET_MS}
+            image, boxes, labels, scores, tiling_stats = detect_tiled(
+                breast_detectors[tiling["coarse_profile"]], breast_detectors[profile],
+                image, tiling, device, timer
+            )
+        else:
+            # Limita o lado maior (mantendo a proporção) e prepara o tensor para o modelo
+            image, img_tensor = preprocessing_engine.prepare(f"breast:{profile}", image, timer)
 
-            # Realiza a predição
-            with torch.no_grad():
-                prediction = model_breast_cancer_faster_rcnn([img_tensor])
+            # Realiza a predição (limiares de score/NMS e propostas do RPN já configurados no modelo do perfil)
+            with timer.stage("inference"), torch.no_grad():
+                prediction = breast_detectors[profile]([img_tensor])
 
             # Processa as predições
             boxes = prediction[0]['boxes']
             labels = prediction[0]['labels']
             scores = prediction[0]['scores']
 
-            # Aplica limiar de confiança
-            score_threshold = 0.7
-            keep = scores >= score_threshold
+        if model_breast_cancer_faster_rcnn.name != "eager":
+            # Modelos exportados têm os limiares da exportação: filtra aqui com os do perfil
+            keep = scores >= profile_settings["score_threshold"]
 
             boxes = boxes[keep]
             labels = labels[keep]
             scores = scores[keep]
 
             # Aplica Non-Maximum Suppression para remover detecções sobrepostas
-            nms_threshold = 0.7
-            indices = nms(boxes, scores, nms_threshold)
+            indices = nms(boxes, scores, profile_settings["nms_threshold"] or DEFAULT_POST_NMS_THRESHOLD)
 
             boxes = boxes[indices]
             labels = labels[indices]
             scores = scores[indices]
 
-            # Converte para numpy para processamento posterior
-            boxes = boxes.cpu().numpy()
-            labels = labels.cpu().numpy()
-            scores = scores.cpu().numpy()
+        # Converte para numpy para processamento posterior
+        boxes = boxes.cpu().numpy()
+        labels = labels.cpu().numpy()
+        scores = scores.cpu().numpy()
+
+        # Detecções em pixels da imagem retornada (image_size)
+        detections = []
+        bounding_boxes = []
+        for box, label, score in zip(boxes, labels, scores):
+            xmin, ymin, xmax, ymax = (int(value) for value in box)
+            detections.append({
+                "class_id": int(label),
+                "confidence": float(score),
+                "bbox": [xmin, ymin, xmax, ymax]
+            })
+
+            # Formato esperado pelos atendimentos
+            bounding_boxes.append({
+                "x": xmin,
+                "y": ymin,
+                "width": xmax - xmin,
+                "height": ymax - ymin,
+                "confidence": float(score),
+                "observations": f"Mass detected with {score:.2f} confidence"
+            })
+
+        result = {
+            "detections": detections,
+            "bounding_boxes": bounding_boxes,
+            "image_size": [image.width, image.height],
+            "profile": profile,
+            "tiling": tiling_stats
+        }
+        if annotated:
+            # Desenha e codifica a imagem anotada (direto do PIL, fonte carregada uma vez)
+            with timer.stage("annotate"):
+                annotated_image = annotate_detections(image, detections)
+            with timer.stage("encode"):
+                result["image_base64"], result["image_format"] = self._encode_annotated(annotated_image, image_format)
+        else:
+            # Só caixas e scores: o cliente desenha a sobreposição; a imagem fica para renderização sob demanda
+            result["display_image"] = image
+
+        _finish_timings("breast", timer)
+
+        logger.info(f"Breast cancer detection completed successfully ({profile} profile). {len(detections)} detections found.")
+        return result
+
+    @staticmethod
+    def _encode_annotated(image: Image.Image, image_format: Optional[str] = None):
+        """Annotated image bytes and format, with the configured encoder (ANNOTATED_IMAGE_*)."""
+        image_format = image_format or settings.ANNOTATED_IMAGE_FORMAT
+        if image_format not in IMAGE_FORMATS:
+            logger.warning(f"Unknown annotated image format '{image_format}'; using JPEG")
+            image_format = "jpeg"
+        try:
+            return encode_image(image, image_format, settings.ANNOTATED_IMAGE_QUALITY)
+        except OSError as e:
+            logger.error(f"Failed to encode the annotated image: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail={
+                    "message": "Failed to encode the image.",
+                    "status_code": 500
+                }
+            )
 
-            # Prepara lista para armazenar as detecções
-            detections = []
-            bounding_boxes = []
+    async def detect_breast_cancer(self, image_data: bytes, profile: Optional[str] = None,
+                                   annotated: bool = True, owner_id: Optional[str] = None,
+                                   image_format: Optional[str] = None):
+        """
+        Detects breast cancer in a mammography using Faster R-CNN.
+        
+        Args:
+            image_data: bytes of the image to be analyzed
+            profile: detection profile (see resolve_detection_profile)
+            annotated: render the annotated image; otherwise return only boxes and
+                scores, with a detection_id to render it later (render_breast_annotation)
+            owner_id: user allowed to fetch the later rendering
+            image_format: encoding of the annotated image (default: ANNOTATED_IMAGE_FORMAT)
             
-            if len(boxes) > 0:
-                # Anota a imagem
-                image_with_boxes = image.copy()
-                draw = ImageDraw.Draw(image_with_boxes)
-
-                labels_map = {1: 'Mass'}
-
-                # Calcula dimensões mínimas garantidas para visualização
-                image_width, image_height = image.size
-                min_line_width = max(3, int(min(image_width, image_height) * 0.005))
-                min_font_size = max(16, int(min(image_width, image_height) * 0.02))
-
-                for box, label, score in zip(boxes, labels, scores):
-                    xmin, ymin, xmax, ymax = box
-                    xmin, ymin, xmax, ymax = int(xmin), int(ymin), int(xmax), int(ymax)
-
-                    # Calcula a largura e altura da caixa delimitadora
-                    box_width = xmax - xmin
-                    box_height = ymax - ymin
-
-                    # Define espessura da linha proporcional à imagem, com mínimo garantido
-                    line_width = max(min_line_width, int(min(box_width, box_height) * 0.02))
-
-                    # Define tamanho da fonte proporcional à imagem, com mínimo garantido
-                    font_size = max(min_font_size, int(min(box_width, box_height) * 0.1))
-
-                    try:
-                        font = ImageFont.truetype("arial.ttf", size=font_size)
-                    except IOError:
-                        # Se arial.ttf não estiver disponível, tenta DejaVuSans
-                        try:
-                            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", size=font_size)
-                        except IOError:
-                            font = ImageFont.load_default()
-
-                    # Desenha a caixa delimitadora com borda dupla para maior destaque
-                    # Borda externa preta
-                    draw.rectangle([(xmin-line_width, ymin-line_width), 
-                                  (xmax+line_width, ymax+line_width)], 
-                                  outline='black', width=line_width+2)
-                    # Borda interna colorida
-                    draw.rectangle([(xmin, ymin), (xmax, ymax)], 
-                                 outline='red', width=line_width)
-
-                    # Obtém o nome da classe
-                    class_name = labels_map.get(label, 'desconhecido')
-
-                    # Cria o texto com a pontuação
-                    text = f"{score:.2f}"
-
-                    # Calcula a posição e o tamanho do texto
-                    text_size = draw.textbbox((0, 0), text, font=font)
-                    text_width = text_size[2] - text_size[0]
-                    text_height = text_size[3] - text_size[1]
-
-                    # Adiciona padding ao texto para melhor legibilidade
-                    padding = max(4, int(text_height * 0.2))
-
-                    # Coordenadas para o fundo do texto
-                    text_xmin = xmin
-                    text_ymin = max(0, ymin - text_height - padding * 2)  # Garante que não saia da imagem
-                    text_xmax = xmin + text_width + padding * 2
-                    text_ymax = text_ymin + text_height + padding * 2
-
-                    # Se o texto ficaria fora da imagem no topo, coloca abaixo da caixa
-                    if text_ymin < 0:
-                        text_ymin = min(ymax, image_height - text_height - padding * 2)
-                        text_ymax = text_ymin + text_height + padding * 2
-
-                    # Desenha um contorno preto ao redor do fundo do texto
-                    draw.rectangle([(text_xmin-2, text_ymin-2), (text_xmax+2, text_ymax+2)], 
-                                 fill='yellow')
-                    # Desenha o retângulo de fundo para o texto
-                    draw.rectangle([(text_xmin, text_ymin), (text_xmax, text_ymax)], 
-                                 fill='red')
-
-                    # Escreve o texto com contorno preto para maior contraste
-                    for offset in [(1,1), (-1,-1), (1,-1), (-1,1)]:
-                        draw.text((text_xmin + padding + offset[0], text_ymin + padding + offset[1]),
-                                text, fill='black', font=font)
-                    # Texto principal em branco
-                    draw.text((text_xmin + padding, text_ymin + padding),
-                             text, fill='white', font=font)
-
-                    # Adiciona a detecção à lista
-                    detections.append({
-                        "class_id": int(label),
-                        "confidence": float(score),
-                        "bbox": [xmin, ymin, xmax, ymax]
-                    })
-                    
-                    # Adiciona a bounding box para o formato esperado pela API
-                    bounding_boxes.append({
-                        "x": xmin,
-                        "y": ymin,
-                        "width": box_width,
-                        "height": box_height,
-                        "confidence": float(score),
-                        "observations": f"Mass detected with {score:.2f} confidence"
-                    })
-
-                # Converte a imagem anotada para formato OpenCV
-                annotated_image = np.array(image_with_boxes)
-                annotated_image = cv2.cvtColor(annotated_image, cv2.COLOR_RGB2BGR)
-            else:
-                annotated_image = cv2.cvtColor(image_np, cv2.COLOR_RGB2BGR)
-
-            # Codifica a imagem em bytes
-            success, img_encoded = cv2.imencode('.jpg', annotated_image, [cv2.IMWRITE_JPEG_QUALITY, 95])
-            if not success:
-                logger.error("Failed to encode the annotated image")
-                raise HTTPException(
-                    status_code=500, 
-                    detail={
-                        "message": "Failed to encode the image.",
-                        "status_code": 500
-                    }
-                )
-            img_bytes = img_encoded.tobytes()
+        Returns:
+            dict: Dictionary with detections and annotated image (or detection_id)
+        """
+        try:
+            profile = profile or settings.BREAST_DETECTION_PROFILE
+            logger.info(f"Starting breast cancer detection with Faster R-CNN ({profile} profile)")
+            timer = StageTimer()
 
-            logger.info(f"Breast cancer detection completed successfully. {len(detections)} detections found.")
-            return {
-                "image_base64": img_bytes,
-                "detections": detections,
-                "bounding_boxes": bounding_boxes
-            }
+            # Decodifica em escala reduzida (JPEG) e corrige a orientação EXIF
+            image = await run_inference(preprocessing_engine.decode, image_data, [f"breast:{profile}"], timer)
+
+            result = await run_inference(
+                self._detect_breast_cancer_image, image, timer, profile, annotated, image_format
+            )
+            if not annotated:
+                result["detection_id"] = uuid.uuid4().hex
+                annotation_cache.set(result["detection_id"], {
+                    "owner_id": owner_id,
+                    "image": result.pop("display_image"),
+                    "detections": result["detections"],
+                })
+            return result
+
+        except Image.DecompressionBombError as e:
+            logger.error(f"Rejected oversized image: {str(e)}")
+            raise HTTPException(
+                status_code=413,
+                detail={
+                    "message": "Image dimensions exceed the allowed limit.",
+                    "status_code": 413
+                }
+            )
 
         except UnidentifiedImageError:
             logger.error("Error identifying image format for breast cancer detection")
@@ -352,57 +624,124 @@ class PredictionUseCases:
                 }
             )
 
-    async def predict_tuberculosis(self, image_data: bytes):
+    async def render_breast_annotation(self, detection_id: str, owner_id: Optional[str] = None,
+                                       image_format: Optional[str] = None):
+        """
+        Annotated image of a detection made with annotated=False, rendered on the
+        first request for each format and cached with it (BREAST_ANNOTATION_CACHE_TTL_SECONDS).
+        The cache is per worker; a persisted detection (detection_id = prediction_id)
+        is rebuilt from the stored prediction by any worker.
+
+        Returns:
+            tuple: image bytes and format, or None if the detection expired or belongs to another user
+        """
+        entry = annotation_cache.get(detection_id)
+        if entry is None and owner_id:
+            # Feita em outro worker (ou expirada aqui): renderiza a partir da predição persistida
+            entry = await self._load_stored_breast_annotation(detection_id, owner_id)
+            if entry is not None:
+                annotation_cache.set(detection_id, entry)
+        if entry is None or entry["owner_id"] != owner_id:
+            return None
+        image_format = image_format or settings.ANNOTATED_IMAGE_FORMAT
+        rendered = entry.setdefault("rendered", {})
+        if image_format not in rendered:
+            rendered[image_format] = await run_inference(
+                lambda: self._encode_annotated(annotate_detections(entry["image"], entry["detections"]), image_format)
+            )
+        return rendered[image_format]
+
+    def link_breast_annotation(self, detection_id: str, prediction_id: str) -> str:
+        """Re-keys a cached detection by the prediction_id it was persisted under and returns it."""
+        entry = annotation_cache.get(detection_id)
+        if entry is not None:
+            annotation_cache.invalidate(detection_id)
+            annotation_cache.set(prediction_id, entry)
+        return prediction_id
+
+    async def _load_stored_breast_annotation(self, prediction_id: str, owner_id: str) -> Optional[Dict]:
+        """Annotation cache entry rebuilt from a persisted breast detection, or None."""
+        source = await self.prediction_repository.get_prediction_source(prediction_id, owner_id)
+        if not source or source["model_used"] != "breast" or not source["details"]:
+            return None
+        details = json.loads(source["details"])
+        image_size = tuple(details["image_size"])
+
+        def decode():
+            # Mesma imagem de exibição da detecção (as caixas estão em pixels de image_size)
+            image = decode_image(
+                base64.b64decode(source["image_base64"]), min_size=image_size, max_pixels=settings.IMAGE_MAX_PIXELS
+            )
+            if image.size != image_size:
+                image = image.resize(image_size, Image.Resampling.LANCZOS)
+            return image
+
+        try:
+            image = await run_inference(decode)
+        except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+            logger.error(f"Failed to decode stored breast prediction {prediction_id}: {str(e)}")
+            return None
+        return {"owner_id": owner_id, "image": image, "detections": details["detections"]}
+
+    def _predict_tuberculosis_image(self, image: Image.Image, timer: StageTimer,
+                                    cascade: Optional[bool] = None) -> Dict:
+        """Runs the tuberculosis classifier on a decoded image (blocking; runs on the inference pool)."""
+        # Roda o modelo (ou só o screen da cascata, quando ele decide)
+        probs, cascade_info = _classify("tuberculosis", model_tb, image, timer, cascade)
+        pred_idx = probs.argmax(dim=1)
+
+        # Mapeia o índice da classe para o nome da classe
+        classes = ["negative", "positive"]
+        pred_class = classes[pred_idx.item()]
+
+        # Extrai as probabilidades
+        prob_negative = probs[0,0].item() * 100
+        prob_positive = probs[0,1].item() * 100
+
+        logger.info(f"Tuberculosis prediction completed: {pred_class} ({prob_positive:.2f}% positive)")
+        
+        result = {
+            "class_pred": pred_class,
+            "probabilities": {
+                "negative": round(prob_negative, 2),
+                "positive": round(prob_positive, 2) 
+            }
+        }
+        if cascade_info:
+            # Estágio que decidiu, para auditar falsos negativos da cascata
+            result["cascade"] = cascade_info
+        _finish_timings("tuberculosis", timer)
+        return result
+
+    async def predict_tuberculosis(self, image_data: bytes, cascade: Optional[bool] = None):
         """
         Predicts if an image contains signs of tuberculosis.
         
         Args:
             image_data: bytes of the image to be analyzed
+            cascade: run the cascade screen first (None = CASCADE_MODELS)
             
         Returns:
             dict: Dictionary with the predicted class and probabilities
         """
         try:
             logger.info("Starting tuberculosis prediction")
-            
-            # Carrega a imagem a partir dos bytes
-            image = Image.open(io.BytesIO(image_data)).convert("RGB")
-
-            # Define as transformações para pre-processamento
-            transform = T.Compose([
-                T.Resize((224,224)),
-                T.ToTensor(),
-                T.Normalize(mean=[0.485, 0.456, 0.406],
-                            std=[0.229, 0.224, 0.225])
-            ])
-
-            # Prepara a imagem para o modelo
-            img_tensor = transform(image).unsqueeze(0).to(device)
+            timer = StageTimer()
 
-            # Roda o modelo
-            with torch.no_grad():
-                logits = model_tb(img_tensor)
-                probs = F.softmax(logits, dim=1)
-                _, pred_idx = torch.max(logits, dim=1)
-
-            # Mapeia o índice da classe para o nome da classe
-            classes = ["negative", "positive"]
-            pred_class = classes[pred_idx.item()]
+            # Decodifica em escala reduzida, só o necessário para o Resize(224)
+            image = await run_inference(preprocessing_engine.decode, image_data, ["tuberculosis"], timer)
 
-            # Extrai as probabilidades
-            prob_negative = probs[0,0].item() * 100
-            prob_positive = probs[0,1].item() * 100
+            return await run_inference(self._predict_tuberculosis_image, image, timer, cascade)
 
-            logger.info(f"Tuberculosis prediction completed: {pred_class} ({prob_positive:.2f}% positive)")
-            
-            result = {
-                "class_pred": pred_class,
-                "probabilities": {
-                    "negative": round(prob_negative, 2),
-                    "positive": round(prob_positive, 2) 
+        except Image.DecompressionBombError as e:
+            logger.error(f"Rejected oversized image: {str(e)}")
+            raise HTTPException(
+                status_code=413,
+                detail={
+                    "message": "Image dimensions exceed the allowed limit.",
+                    "status_code": 413
                 }
-            }
-            return result
+            )
 
         except UnidentifiedImageError:
             logger.error("Error identifying image format for tuberculosis detection")
@@ -425,59 +764,67 @@ class PredictionUseCases:
             )
     
 
-    async def predict_osteoporosis(self, image_data: bytes):
+    def _predict_osteoporosis_image(self, image: Image.Image, timer: StageTimer,
+                                    cascade: Optional[bool] = None) -> Dict:
+        """Runs the osteoporosis classifier on a decoded image (blocking; runs on the inference pool)."""
+        # Roda o modelo (ou só o screen da cascata, quando ele decide)
+        probs, cascade_info = _classify("osteoporosis", model_osteoporosis, image, timer, cascade)
+        pred_idx = probs.argmax(dim=1)
+
+        # Mapeia o índice da classe para o nome da classe
+        classes = ["Normal", "Osteopenia", "Osteoporosis"]
+        pred_class = classes[pred_idx.item()]
+
+        # Extrai as probabilidades para cada classe
+        prob_normal = probs[0,0].item() * 100
+        prob_osteopenia = probs[0,1].item() * 100
+        prob_osteoporosis = probs[0,2].item() * 100
+
+        logger.info(f"Osteoporosis prediction completed: {pred_class} (Normal: {prob_normal:.2f}%, Osteopenia: {prob_osteopenia:.2f}%, Osteoporosis: {prob_osteoporosis:.2f}%)")
+        
+        result = {
+            "class_pred": pred_class,
+            "probabilities": {
+                "Normal": round(prob_normal, 2),
+                "Osteopenia": round(prob_osteopenia, 2),
+                "Osteoporosis": round(prob_osteoporosis, 2)
+            }
+        }
+        if cascade_info:
+            # Estágio que decidiu, para auditar falsos negativos da cascata
+            result["cascade"] = cascade_info
+        _finish_timings("osteoporosis", timer)
+        return result
+
+    async def predict_osteoporosis(self, image_data: bytes, cascade: Optional[bool] = None):
         """
         Predicts if an image contains signs of osteoporosis and classifies it as Normal, Osteopenia or Osteoporosis.
         
         Args:
             image_data: bytes of the image to be analyzed
+            cascade: run the cascade screen first (None = CASCADE_MODELS)
             
         Returns:
             dict: Dictionary with the predicted class and probabilities
         """
         try:
             logger.info("Starting osteoporosis prediction")
-            
-            # Carrega a imagem a partir dos bytes
-            image = Image.open(io.BytesIO(image_data)).convert("RGB")
-
-            # Define as transformações para pre-processamento
-            transform = T.Compose([
-                T.Resize((224,224)),
-                T.ToTensor(),
-                T.Normalize(mean=[0.485, 0.456, 0.406],
-                            std=[0.229, 0.224, 0.225])
-            ])
-
-            # Prepara a imagem para o modelo
-            img_tensor = transform(image).unsqueeze(0).to(device)
-
-            # Roda o modelo
-            with torch.no_grad():
-                logits = model_osteoporosis(img_tensor)
-                probs = F.softmax(logits, dim=1)
-                _, pred_idx = torch.max(logits, dim=1)
+            timer = StageTimer()
 
-            # Mapeia o índice da classe para o nome da classe
-            classes = ["Normal", "Osteopenia", "Osteoporosis"]
-            pred_class = classes[pred_idx.item()]
+            # Decodifica em escala reduzida, só o necessário para o Resize(224)
+            image = await run_inference(preprocessing_engine.decode, image_data, ["osteoporosis"], timer)
 
-            # Extrai as probabilidades para cada classe
-            prob_normal = probs[0,0].item() * 100
-            prob_osteopenia = probs[0,1].item() * 100
-            prob_osteoporosis = probs[0,2].item() * 100
+            return await run_inference(self._predict_osteoporosis_image, image, timer, cascade)
 
-            logger.info(f"Osteoporosis prediction completed: {pred_class} (Normal: {prob_normal:.2f}%, Osteopenia: {prob_osteopenia:.2f}%, Osteoporosis: {prob_osteoporosis:.2f}%)")
-            
-            result = {
-                "class_pred": pred_class,
-                "probabilities": {
-                    "Normal": round(prob_normal, 2),
-                    "Osteopenia": round(prob_osteopenia, 2),
-                    "Osteoporosis": round(prob_osteoporosis, 2)
+        except Image.DecompressionBombError as e:
+            logger.error(f"Rejected oversized image: {str(e)}")
+            raise HTTPException(
+                status_code=413,
+                detail={
+                    "message": "Image dimensions exceed the allowed limit.",
+                    "status_code": 413
                 }
-            }
-            return result
+            )
 
         except UnidentifiedImageError:
             logger.error("Error identifying image format for osteoporosis detection")
@@ -500,6 +847,103 @@ class PredictionUseCases:
             )
     
 
+    async def predict_screening(self, image_data: bytes, models: List[str]) -> Dict:
+        """
+        Runs several models on one upload. The image is decoded once, at the
+        largest scale any of the requested models needs, and the models run
+        concurrently on the inference pool.
+
+        Args:
+            image_data: bytes of the image to be analyzed
+            models: names of the models to run (keys of MODEL_INPUT_SPECS)
+
+        Returns:
+            dict: results and errors by model, plus timings (decode and per model, in ms)
+        """
+        try:
+            logger.info(f"Starting screening with models: {', '.join(models)}")
+            decode_timer = StageTimer()
+            image = await run_inference(preprocessing_engine.decode, image_data, models, decode_timer)
+            record_timings("screening", decode_timer)
+
+            runners = {
+                "respiratory": self._predict_respiratory_image,
+                "breast": self._detect_breast_cancer_image,
+                "tuberculosis": self._predict_tuberculosis_image,
+                "osteoporosis": self._predict_osteoporosis_image,
+            }
+            timers = {name: StageTimer() for name in models}
+            outcomes = await asyncio.gather(
+                *(run_inference(runners[name], image, timers[name]) for name in models),
+                return_exceptions=True
+            )
+
+            # Falha de um modelo não descarta o resultado dos demais
+            results = {}
+            errors = {}
+            for name, outcome in zip(models, outcomes):
+                if isinstance(outcome, HTTPException):
+                    errors[name] = outcome.detail.get("message") if isinstance(outcome.detail, dict) else str(outcome.detail)
+                elif isinstance(outcome, Exception):
+                    logger.error(f"Unexpected error running model '{name}' in screening: {str(outcome)}")
+                    errors[name] = "Internal error processing the prediction"
+                else:
+                    results[name] = outcome
+
+            if not results:
+                logger.error(f"Screening failed for every model: {errors}")
+                raise HTTPException(
+                    status_code=500,
+                    detail={
+                        "message": "None of the requested models could process the image.",
+                        "errors": errors,
+                        "status_code": 500
+                    }
+                )
+
+            logger.info(f"Screening completed: {len(results)} of {len(models)} models succeeded")
+            return {
+                "results": results,
+                "errors": errors,
+                "timings": {
+                    "decode": decode_timer.as_dict().get("decode"),
+                    "models": {name: timers[name].as_dict() for name in models}
+                }
+            }
+
+        except Image.DecompressionBombError as e:
+            logger.error(f"Rejected oversized image: {str(e)}")
+            raise HTTPException(
+                status_code=413,
+                detail={
+                    "message": "Image dimensions exceed the allowed limit.",
+                    "status_code": 413
+                }
+            )
+
+        except UnidentifiedImageError:
+            logger.error("Error identifying image format for screening")
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "message": "Invalid or corrupted image.",
+                    "status_code": 400
+                }
+            )
+
+        except HTTPException as http_exc:
+            raise http_exc
+
+        except Exception as e:
+            logger.error(f"Unexpected error during screening: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail={
+                    "message": "Internal server error during image processing.",
+                    "status_code": 500
+                }
+            )
+
     def get_available_classes(self) -> Dict[str, List[str]]:
         # Nota: Para 'respiratory', precisaríamos saber as classes exatas do YOLO.
         # Se forem fixas, podemos adicionar aqui. Se dinâmicas, seria mais complexo.
@@ -514,4 +958,33 @@ class PredictionUseCases:
             "tuberculosis": tuberculosis_classes_example,
             "osteoporosis": osteoporosis_classes_example,
             "breast": breast_classes_example
-        }
\ No newline at end of file
+        }
+
+    def get_model_input_specs(self) -> Dict[str, Dict]:
+        """Returns the input resolution each model consumes (see MODEL_INPUT_SPECS) and its backend."""
+        backends = {
+            "respiratory": model,
+            "breast": model_breast_cancer_faster_rcnn,
+            "tuberculosis": model_tb,
+            "osteoporosis": model_osteoporosis,
+        }
+        specs = {name: {**spec, "backend": backends[name].name} for name, spec in MODEL_INPUT_SPECS.items()}
+        specs["breast"]["detection_profiles"] = list(DETECTION_PROFILES)
+        # O limite depende do perfil que vai rodar (em tiles vale enviar a resolução cheia):
+        # clientes que reduzem no navegador devem usar o do perfil que pedem
+        specs["breast"]["max_upload_dimension_by_profile"] = {
+            name: max(MODEL_INPUT_SPECS["breast"]["max_upload_dimension"], profile["max_side"])
+            for name, profile in DETECTION_PROFILES.items()
+        }
+        specs["breast"]["max_upload_dimension"] = (
+            specs["breast"]["max_upload_dimension_by_profile"][settings.BREAST_DETECTION_PROFILE]
+        )
+        specs["breast"]["default_detection_profile"] = settings.BREAST_DETECTION_PROFILE
+        for name, screen in cascade_screens.items():
+            specs[name]["cascade"] = {
+                "available": screen is not None,
+                "default": name in cascade_models,
+                "screen_input_size": list(screen.input_size) if screen else None,
+                "band": [round(side * 100, 2) for side in screen.band] if screen else None,
+            }
+        return specs
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List
 from fastapi import HTTPException
 from ..utils.verify_email import is_email_valid
 from ..utils.logger import get_logger
@@ -260,6 +260,30 @@ class UserUseCases:
             raise_http_error(500, "Error retrieving user")
             
     
+    async def lookup_users(self, user_ids: List[str], current_user_id: str, current_user_profile: str, audit_data=None):
+        """
+        Resolve a list of user IDs to their display fields in one query.
+        Non-administrators can only resolve their own ID.
+        """
+        try:
+            if current_user_profile not in ["administrator", "general_administrator"]:
+                user_ids = [user_id for user_id in user_ids if user_id == current_user_id]
+
+            users = await self.user_repository.get_users_by_ids(user_ids)
+            found_ids = {user["id"] for user in users}
+
+            return {
+                "detail": {
+                    "message": "Users retrieved successfully",
+                    "users": users,
+                    "not_found": [user_id for user_id in dict.fromkeys(user_ids) if user_id not in found_ids],
+                    "status_code": 200
+                }
+            }
+        except Exception as e:
+            logger.error(f"Error looking up users: {e}")
+            raise_http_error(500, "Error retrieving users")
+
     async def update_user(self, current_user_id: str, current_user_profile: str, user_id_to_update: str, user_update_data: UpdateUser, audit_data: Dict = None) -> Dict:
         """
         Atualiza informações do usuário, tratando admin_id corretamente na mudança de perfil
@@ -0,0 +1,112 @@
+"""
+Server-side rendering of breast detections over the image they were found on.
+
+Fonts are resolved and loaded once per size (the previous renderer reloaded the
+TrueType file for every box). Clients that draw the overlay themselves (SVG or
+canvas from the boxes and scores) never need this; it backs the annotated
+response mode and the cached annotated-image endpoint. The encoder (JPEG or
+WebP, quality) is set by ANNOTATED_IMAGE_FORMAT / ANNOTATED_IMAGE_QUALITY and
+can be negotiated per request through Accept.
+"""
+import io
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from PIL import Image, ImageDraw, ImageFont, features
+
+FONT_CANDIDATES = ("arial.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf")
+# Formato -> (formato PIL, media type, extensão)
+IMAGE_FORMATS = {
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "webp": ("WEBP", "image/webp", "webp"),
+}
+IMAGE_MEDIA_TYPES = {media_type: name for name, (_, media_type, _) in IMAGE_FORMATS.items()}
+
+
+@lru_cache(maxsize=None)
+def _font_path():
+    """First TrueType font available, or None to use PIL's bitmap font."""
+    for candidate in FONT_CANDIDATES:
+        try:
+            ImageFont.truetype(candidate, size=10)
+            return candidate
+        except IOError:
+            continue
+    return None
+
+
+@lru_cache(maxsize=64)
+def load_font(size: int):
+    path = _font_path()
+    return ImageFont.truetype(path, size=size) if path else ImageFont.load_default()
+
+
+def annotate_detections(image: Image.Image, detections: List[Dict]) -> Image.Image:
+    """Copy of `image` with each detection's box and score drawn (bbox in image pixels)."""
+    if not detections:
+        return image
+
+    image_with_boxes = image.copy()
+    draw = ImageDraw.Draw(image_with_boxes)
+
+    # Calcula dimensões mínimas garantidas para visualização
+    image_width, image_height = image.size
+    min_line_width = max(3, int(min(image_width, image_height) * 0.005))
+    min_font_size = max(16, int(min(image_width, image_height) * 0.02))
+
+    for detection in detections:
+        xmin, ymin, xmax, ymax = detection["bbox"]
+        score = detection["confidence"]
+        box_width = xmax - xmin
+        box_height = ymax - ymin
+
+        # Espessura da linha e tamanho da fonte proporcionais à caixa, com mínimo garantido
+        line_width = max(min_line_width, int(min(box_width, box_height) * 0.02))
+        font = load_font(max(min_font_size, int(min(box_width, box_height) * 0.1)))
+
+        # Borda externa preta e borda interna vermelha para maior destaque
+        draw.rectangle([(xmin - line_width, ymin - line_width),
+                        (xmax + line_width, ymax + line_width)],
+                       outline='black', width=line_width + 2)
+        draw.rectangle([(xmin, ymin), (xmax, ymax)], outline='red', width=line_width)
+
+        # Texto com a pontuação, acima da caixa (ou abaixo, se sairia da imagem)
+        text = f"{score:.2f}"
+        text_size = draw.textbbox((0, 0), text, font=font)
+        text_width = text_size[2] - text_size[0]
+        text_height = text_size[3] - text_size[1]
+        padding = max(4, int(text_height * 0.2))
+
+        text_xmin = xmin
+        text_ymin = max(0, ymin - text_height - padding * 2)
+        text_xmax = xmin + text_width + padding * 2
+        text_ymax = text_ymin + text_height + padding * 2
+        if text_ymin < 0:
+            text_ymin = min(ymax, image_height - text_height - padding * 2)
+            text_ymax = text_ymin + text_height + padding * 2
+
+        draw.rectangle([(text_xmin - 2, text_ymin - 2), (text_xmax + 2, text_ymax + 2)], fill='yellow')
+        draw.rectangle([(text_xmin, text_ymin), (text_xmax, text_ymax)], fill='red')
+
+        # Contorno preto e texto principal em branco
+        for offset in [(1, 1), (-1, -1), (1, -1), (-1, 1)]:
+            draw.text((text_xmin + padding + offset[0], text_ymin + padding + offset[1]),
+                      text, fill='black', font=font)
+        draw.text((text_xmin + padding, text_ymin + padding), text, fill='white', font=font)
+
+    return image_with_boxes
+
+
+def encode_image(image: Image.Image, image_format: str = "jpeg", quality: int = 95) -> Tuple[bytes, str]:
+    """
+    Encodes the image as `image_format` (IMAGE_FORMATS) at `quality`.
+    Falls back to JPEG when PIL was built without WebP support.
+
+    Returns:
+        tuple: encoded bytes and the format actually used
+    """
+    if image_format == "webp" and not features.check("webp"):
+        image_format = "jpeg"
+    buffer = io.BytesIO()
+    image.save(buffer, format=IMAGE_FORMATS[image_format][0], quality=quality)
+    return buffer.getvalue(), image_format
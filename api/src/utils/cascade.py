@@ -0,0 +1,99 @@
+"""
+Cascaded triage for the classification models.
+
+A cheap first stage (screen) runs on every image: a tiny model exported as
+<model>-screen.onnx in INFERENCE_MODELS_DIR or, without one, the model itself at
+a reduced input size (CASCADE_SCREEN_SIZE). Its probability of a non-negative
+finding decides the result alone when it falls outside the model's uncertainty
+band (low, high). Inside the band the full model runs. For models with more
+than two classes (osteoporosis) the screen only settles confident negatives:
+a high positive probability does not say which grade, so every positive goes
+to the full model.
+
+Every cascaded result records which stage decided it ("screen" or "full"), so
+attendances can be audited for missed positives (scripts/audit_cascade.py).
+Decision counts are reported by cascade_metrics().
+"""
+import threading
+from typing import Dict, Optional, Tuple
+
+import torch
+
+# Banda de incerteza padrão: fora dela o resultado do screen é aceito
+DEFAULT_CASCADE_BANDS: Dict[str, Tuple[float, float]] = {
+    "tuberculosis": (0.05, 0.95),
+    "osteoporosis": (0.05, 0.95),
+}
+# Índice da classe negativa de cada modelo (mesma ordem de classes dos use cases)
+NEGATIVE_CLASS_INDEX = {"tuberculosis": 0, "osteoporosis": 0}
+
+
+class CascadeScreen:
+    """First stage of a model's cascade."""
+
+    def __init__(self, backend, input_size: Tuple[int, int], band: Tuple[float, float]):
+        self.backend = backend
+        self.input_size = input_size
+        self.band = band
+
+    def decides(self, positive_probability: float, num_classes: int = 2) -> bool:
+        return screen_decides(self.band, positive_probability, num_classes)
+
+
+def screen_decides(band: Tuple[float, float], positive_probability: float, num_classes: int = 2) -> bool:
+    """Whether the screen's result stands (see the module docstring for multi-class models)."""
+    low, high = band
+    if positive_probability < low:
+        return True
+    # Multiclasse: P(qualquer positivo) alta não separa os graus (ex.: Osteopenia x Osteoporosis)
+    return num_classes == 2 and positive_probability > high
+
+
+def parse_cascade_bands(value: str) -> Dict[str, Tuple[float, float]]:
+    """Parses "<model>=<low>:<high>,..." (CASCADE_BANDS) over the defaults."""
+    bands = dict(DEFAULT_CASCADE_BANDS)
+    for item in value.split(","):
+        if "=" not in item:
+            continue
+        model_name, band = item.split("=", 1)
+        low, high = band.split(":", 1)
+        bands[model_name.strip()] = (float(low), float(high))
+    return bands
+
+
+def positive_probability(model_name: str, probs: torch.Tensor) -> float:
+    """Probability of anything other than the negative class."""
+    return 1.0 - float(probs[0, NEGATIVE_CLASS_INDEX[model_name]])
+
+
+_stats_lock = threading.Lock()
+_decisions: Dict[str, Dict[str, int]] = {}
+
+
+def record_decision(model_name: str, stage: str):
+    with _stats_lock:
+        counts = _decisions.setdefault(model_name, {"screen": 0, "full": 0})
+        counts[stage] += 1
+
+
+def cascade_metrics() -> Dict[str, Dict]:
+    """Results decided by each stage, per model, and the share the screen settled alone."""
+    with _stats_lock:
+        return {
+            model_name: {
+                **counts,
+                "screen_rate": round(100 * counts["screen"] / max(1, counts["screen"] + counts["full"]), 2),
+            }
+            for model_name, counts in _decisions.items()
+        }
+
+
+def cascade_record(stage: str, screen_probability: float, band: Tuple[float, float],
+                   screen_backend: Optional[str] = None) -> Dict:
+    """Audit entry stored with the result."""
+    return {
+        "decided_by": stage,
+        "screen_positive_probability": round(screen_probability * 100, 2),
+        "band": [round(band[0] * 100, 2), round(band[1] * 100, 2)],
+        "screen": screen_backend,
+    }
@@ -0,0 +1,64 @@
+"""
+Client address of a request that may have come through a reverse proxy.
+
+Browser logins reach the API through the web tier, so request.client.host is
+the web server for every user. X-Forwarded-For is only believed when the peer
+is one of TRUSTED_PROXY_IPS (addresses or CIDR networks, comma separated): the
+chain is walked from the right, skipping trusted proxies, and the first
+untrusted hop is the client. Anything to the left of it may be forged.
+"""
+import ipaddress
+from typing import List, Optional
+
+from fastapi import Request
+
+from ..config.settings import Settings
+from .logger import get_logger
+
+settings = Settings()
+logger = get_logger(__name__)
+
+
+def parse_trusted_proxies(value: str) -> List:
+    """Networks from "10.0.0.5, 172.18.0.0/16"; invalid entries are logged and ignored."""
+    networks = []
+    for entry in value.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        try:
+            networks.append(ipaddress.ip_network(entry, strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid TRUSTED_PROXY_IPS entry: '{entry}'")
+    return networks
+
+
+trusted_proxies = parse_trusted_proxies(settings.TRUSTED_PROXY_IPS)
+
+
+def is_trusted_proxy(address: Optional[str]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except (TypeError, ValueError):
+        return False
+    return any(ip in network for network in trusted_proxies)
+
+
+def client_ip(request: Request) -> Optional[str]:
+    """
+    Address of the client behind any trusted proxies.
+
+    Returns:
+        str: the client address, or None when the request came from a trusted
+        proxy without a usable X-Forwarded-For (the proxy's own address is
+        never returned as the client)
+    """
+    peer = request.client.host if request.client else None
+    if not is_trusted_proxy(peer):
+        return peer
+
+    chain = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    for hop in reversed(chain):
+        if not is_trusted_proxy(hop):
+            return hop
+    return None
@@ -0,0 +1,79 @@
+"""
+HTTP content negotiation helpers (Accept header parsing and multipart/mixed bodies).
+"""
+import uuid
+from typing import List, Optional, Sequence, Tuple
+
+from fastapi.responses import Response
+
+
+def parse_accept(accept: Optional[str]) -> List[Tuple[str, float]]:
+    """(media range, q) pairs of an Accept header; an empty header accepts anything."""
+    if not accept:
+        return [("*/*", 1.0)]
+    ranges = []
+    for item in accept.split(","):
+        media_range, *params = [part.strip() for part in item.split(";")]
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        ranges.append((media_range.lower(), quality))
+    return ranges
+
+
+def _quality(ranges: List[Tuple[str, float]], media_type: str, explicit: bool = False) -> float:
+    """q of the most specific range matching media_type (explicit=True ignores wildcards)."""
+    main_type = media_type.split("/")[0]
+    best, specificity = 0.0, -1
+    for media_range, quality in ranges:
+        if media_range == media_type:
+            level = 2
+        elif not explicit and media_range == f"{main_type}/*":
+            level = 1
+        elif not explicit and media_range == "*/*":
+            level = 0
+        else:
+            continue
+        if level > specificity:
+            best, specificity = quality, level
+    return best
+
+
+def choose_media_type(accept: Optional[str], offered: Sequence[str], explicit: bool = False) -> Optional[str]:
+    """
+    Offered media type the client prefers (highest q; ties go to the first offered),
+    or None if it accepts none of them. With explicit=True only media types the
+    client names count, so wildcards fall back to the caller's default.
+    """
+    ranges = parse_accept(accept)
+    best, best_quality = None, 0.0
+    for media_type in offered:
+        quality = _quality(ranges, media_type, explicit)
+        if quality > best_quality:
+            best, best_quality = media_type, quality
+    return best
+
+
+def multipart_mixed_response(parts: Sequence[Tuple[str, bytes, Optional[str]]], status_code: int = 200) -> Response:
+    """multipart/mixed response from (content type, body, filename or None) parts."""
+    boundary = uuid.uuid4().hex
+    chunks = []
+    for content_type, body, filename in parts:
+        headers = f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+        if filename:
+            headers += f'Content-Disposition: inline; filename="{filename}"\r\n'
+        headers += f"Content-Length: {len(body)}\r\n\r\n"
+        chunks.extend([headers.encode("ascii"), body, b"\r\n"])
+    chunks.append(f"--{boundary}--\r\n".encode("ascii"))
+    return Response(
+        content=b"".join(chunks),
+        status_code=status_code,
+        media_type=f"multipart/mixed; boundary={boundary}"
+    )
@@ -0,0 +1,127 @@
+"""
+Detection profiles for the Faster R-CNN mammography model.
+
+A profile fixes, at model build time, what used to be either the model defaults
+or Python filtering after inference:
+
+- max_side: longest side of the decoded image handed to the model;
+- min_size / max_size: resize targets of the model's internal transform;
+- rpn_pre_nms_top_n / rpn_post_nms_top_n: RPN proposals kept before/after NMS;
+- detections_per_img, score_threshold, nms_threshold: ROI heads output;
+- tiling (optional): full-resolution tiled inference, see src.utils.tiled_detection.
+  The model settings then apply to the tiles; the coarse pass uses coarse_profile.
+
+None keeps the value the loaded model was built with. Each profile gets its own
+shallow copy of the model whose transform, RPN and ROI heads are copied too, so
+the weights are shared and concurrent requests with different profiles never
+touch each other's settings.
+
+Exported backends (TorchScript/ONNX) have these settings frozen at export time;
+for them only max_side applies and the score/NMS thresholds are applied after
+inference (see detect_breast_cancer).
+"""
+import copy
+from typing import Dict
+
+from .inference_backend import EagerBackend
+
+DETECTION_PROFILES: Dict[str, Dict] = {
+    "accurate": {
+        "max_side": 1024,
+        "min_size": None,
+        "max_size": None,
+        "rpn_pre_nms_top_n": None,
+        "rpn_post_nms_top_n": None,
+        "detections_per_img": None,
+        "score_threshold": 0.7,
+        "nms_threshold": None,
+    },
+    "fast": {
+        "max_side": 640,
+        "min_size": 512,
+        "max_size": 640,
+        "rpn_pre_nms_top_n": 300,
+        "rpn_post_nms_top_n": 100,
+        "detections_per_img": 20,
+        "score_threshold": 0.7,
+        "nms_threshold": None,
+    },
+    "tiled": {
+        "max_side": 4096,  # Decodifica até 4096 px (limita memória); tiles vão ao modelo em escala 1:1
+        "min_size": 1024,
+        "max_size": 1024,
+        "rpn_pre_nms_top_n": None,
+        "rpn_post_nms_top_n": None,
+        "detections_per_img": None,
+        "score_threshold": 0.7,
+        "nms_threshold": None,
+        "tiling": {
+            "coarse_profile": "accurate",
+            "coarse_max_side": 1024,
+            "tile_size": 1024,
+            "overlap": 128,
+            "batch_size": 4,
+            "merge_iou": 0.5,
+            "foreground_level": 30,  # Nível de cinza acima do qual o pixel conta como tecido
+            "min_foreground": 0.05,
+            "budget_ms": None,  # BREAST_TILED_BUDGET_MS
+        },
+    },
+}
+# NMS aplicado depois da inferência quando o perfil não define outro (backends exportados)
+DEFAULT_POST_NMS_THRESHOLD = 0.7
+
+
+def _shallow_copy(module):
+    """Copy of a module that shares parameters but owns its attributes and child list."""
+    clone = copy.copy(module)
+    clone._modules = module._modules.copy()
+    return clone
+
+
+def configure_detector(model, profile: Dict):
+    """torchvision Faster R-CNN sharing `model`'s weights, with the profile's settings."""
+    clone = _shallow_copy(model)
+
+    transform = _shallow_copy(model.transform)
+    if profile.get("min_size"):
+        transform.min_size = (profile["min_size"],)
+    if profile.get("max_size"):
+        transform.max_size = profile["max_size"]
+
+    rpn = _shallow_copy(model.rpn)
+    if profile.get("rpn_pre_nms_top_n"):
+        rpn._pre_nms_top_n = dict(model.rpn._pre_nms_top_n, testing=profile["rpn_pre_nms_top_n"])
+    if profile.get("rpn_post_nms_top_n"):
+        rpn._post_nms_top_n = dict(model.rpn._post_nms_top_n, testing=profile["rpn_post_nms_top_n"])
+
+    roi_heads = _shallow_copy(model.roi_heads)
+    if profile.get("score_threshold") is not None:
+        roi_heads.score_thresh = profile["score_threshold"]
+    if profile.get("nms_threshold") is not None:
+        roi_heads.nms_thresh = profile["nms_threshold"]
+    if profile.get("detections_per_img"):
+        roi_heads.detections_per_img = profile["detections_per_img"]
+
+    clone.transform = transform
+    clone.rpn = rpn
+    clone.roi_heads = roi_heads
+    return clone.eval()
+
+
+def build_profile_detectors(backend, profiles: Dict[str, Dict] = DETECTION_PROFILES) -> Dict:
+    """One detector per profile. Exported backends are shared as they are."""
+    if backend.name != "eager":
+        return {name: backend for name in profiles}
+    return {name: EagerBackend(configure_detector(backend.model, profile), "detector")
+            for name, profile in profiles.items()}
+
+
+def parse_profile_mapping(value: str) -> Dict[str, str]:
+    """Parses "<health_unit_id>=<profile>,..." (BREAST_DETECTION_PROFILE_BY_HEALTH_UNIT)."""
+    mapping = {}
+    for item in value.split(","):
+        if "=" in item:
+            unit_id, profile = item.split("=", 1)
+            mapping[unit_id.strip()] = profile.strip()
+    return mapping
@@ -0,0 +1,103 @@
+"""
+Shared image decoding for the prediction use cases.
+
+Uploads are decoded at the smallest scale that still covers what the model
+consumes. For JPEG, PIL's draft mode lets libjpeg decode straight to 1/2, 1/4
+or 1/8 scale, so a 40 MP mammogram headed for a 1024 px model never gets a
+full-resolution pixel buffer. Other formats are decoded in full and then
+box-reduced by an integer factor before any further resizing.
+
+The pixel count is checked against the header before any pixels are allocated,
+and EXIF orientation is applied so portrait captures reach the models upright.
+"""
+import io
+import math
+from typing import Optional, Tuple
+
+from PIL import Image
+
+DEFAULT_MAX_PIXELS = 100_000_000
+EXIF_ORIENTATION_TAG = 0x0112
+# Same mapping as ImageOps.exif_transpose; applied by hand because reduce() drops EXIF
+ORIENTATION_TRANSPOSE = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+# Orientations that swap width and height (90/270 degree rotations)
+TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+
+def _requested_size(width: int, height: int, min_size: Optional[Tuple[int, int]],
+                    max_side: Optional[int], transposed: bool) -> Optional[Tuple[int, int]]:
+    """
+    Smallest (width, height) in stored orientation the caller still needs.
+    With both min_size and max_side, the image must satisfy both (per-axis max).
+    None means the full resolution is needed.
+    """
+    candidates = []
+    if min_size:
+        requested_width, requested_height = min_size
+        if transposed:
+            requested_width, requested_height = requested_height, requested_width
+        candidates.append((requested_width, requested_height))
+    if max_side:
+        scale = max_side / max(width, height)
+        if scale >= 1:
+            return None
+        candidates.append((math.ceil(width * scale), math.ceil(height * scale)))
+    if not candidates:
+        return None
+    return max(c[0] for c in candidates), max(c[1] for c in candidates)
+
+
+def decode_image(image_data: bytes, min_size: Optional[Tuple[int, int]] = None,
+                 max_side: Optional[int] = None, mode: str = "RGB",
+                 max_pixels: int = DEFAULT_MAX_PIXELS) -> Image.Image:
+    """
+    Decodes an uploaded image at reduced scale when the target size allows.
+
+    Args:
+        image_data: encoded image bytes
+        min_size: (width, height) the image will be resized to afterwards
+        max_side: longest side the image will be downscaled to afterwards (aspect kept)
+        mode: PIL mode of the returned image
+        max_pixels: decompression bomb guard, checked before decoding
+
+    Returns:
+        PIL.Image: upright image, at least as large as requested, in `mode`
+
+    Raises:
+        PIL.UnidentifiedImageError: the bytes are not a readable image
+        PIL.Image.DecompressionBombError: the header declares more than max_pixels
+    """
+    image = Image.open(io.BytesIO(image_data))  # Reads the header only
+    width, height = image.size
+    if width * height > max_pixels:
+        raise Image.DecompressionBombError(
+            f"Image size ({width}x{height}) exceeds the limit of {max_pixels} pixels"
+        )
+
+    orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+    requested = _requested_size(width, height, min_size, max_side,
+                                orientation in TRANSPOSED_ORIENTATIONS)
+
+    if requested and image.format == "JPEG":
+        # libjpeg picks the largest 1/2^n scale that keeps both sides >= requested
+        image.draft(mode, requested)
+    image.load()
+
+    if requested and image.format != "JPEG":
+        factor = min(image.width // requested[0], image.height // requested[1])
+        if factor >= 2:
+            image = image.reduce(factor)
+
+    if orientation in ORIENTATION_TRANSPOSE:
+        image = image.transpose(ORIENTATION_TRANSPOSE[orientation])
+    if image.mode != mode:
+        image = image.convert(mode)
+    return image
@@ -0,0 +1,200 @@
+"""
+Pluggable inference backends for the prediction models.
+
+The use cases call a backend instead of the PyTorch module directly, so the same
+preprocessing and post-processing run whether the model executes as:
+
+- "eager": the PyTorch module returned by the loaders (default);
+- "torchscript": a module exported by scripts/export_models.py, frozen and
+  optimized for inference on load;
+- "onnx": an ONNX graph executed by ONNX Runtime's CPU execution provider, with
+  graph optimizations enabled and explicit intra/inter-op thread counts;
+- "onnx-int8": the int8 ONNX graph written by scripts/quantize_models.py (static
+  or dynamic quantization), run like "onnx". Classifiers only; enabled per model
+  with INFERENCE_INT8_MODELS.
+
+Exported files live in INFERENCE_MODELS_DIR as <model>.<ext> (see EXPORT_EXTENSIONS).
+A model without an exported file, or whose export fails to load, falls back to
+eager PyTorch with a warning, so a partial export never takes the API down.
+Eager models can map their weights from a file shared by all workers
+(INFERENCE_SHARED_WEIGHTS, see src.utils.shared_weights).
+
+Model kinds:
+- "classifier": NCHW float tensor in, logits tensor out;
+- "detector": list with one CHW tensor in, torchvision-style [{"boxes", "labels", "scores"}] out;
+- "yolo": ultralytics model, PIL image in, ultralytics Results out (exports are
+  loaded back through ultralytics, which runs ONNX/TorchScript files itself).
+"""
+import os
+from typing import Callable
+
+import torch
+
+from .logger import get_logger
+from .shared_weights import map_shared_weights, shared_weights_path, torch_module
+
+logger = get_logger(__name__)
+
+BACKENDS = ("eager", "torchscript", "onnx", "onnx-int8")
+EXPORT_EXTENSIONS = {"torchscript": "torchscript", "onnx": "onnx", "onnx-int8": "int8.onnx"}
+
+
+def exported_model_path(models_dir: str, model_name: str, backend: str) -> str:
+    """Where scripts/export_models.py writes (and the API reads) an exported model."""
+    return os.path.join(models_dir, f"{model_name}.{EXPORT_EXTENSIONS[backend]}")
+
+
+class EagerBackend:
+    """The PyTorch module as loaded, run under no_grad."""
+
+    name = "eager"
+
+    def __init__(self, model, kind: str):
+        self.model = model
+        self.kind = kind
+
+    def __call__(self, inputs):
+        if self.kind == "yolo":
+            return self.model(inputs)
+        with torch.no_grad():
+            return self.model(inputs)
+
+
+class TorchScriptBackend:
+    """TorchScript module exported with torch.jit.trace (classifiers) or torch.jit.script (detector)."""
+
+    name = "torchscript"
+
+    def __init__(self, path: str, kind: str, device: torch.device):
+        self.kind = kind
+        module = torch.jit.load(path, map_location=device).eval()
+        if kind == "classifier":
+            # Congela os pesos e funde conv+bn; só vale para grafos sem controle de fluxo
+            module = torch.jit.optimize_for_inference(module)
+        self.model = module
+
+    def __call__(self, inputs):
+        with torch.inference_mode():
+            outputs = self.model(inputs)
+        if self.kind == "detector" and isinstance(outputs, tuple):
+            # Detectores do torchvision em TorchScript retornam (losses, detections)
+            outputs = outputs[1]
+        return outputs
+
+
+class OnnxRuntimeBackend:
+    """ONNX graph (fp32 or int8) on ONNX Runtime's CPUExecutionProvider."""
+
+    def __init__(self, path: str, kind: str, intra_op_threads: int = 0, inter_op_threads: int = 1,
+                 name: str = "onnx"):
+        import onnxruntime as ort  # Dependência opcional, só exigida com INFERENCE_BACKEND=onnx
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        options.intra_op_num_threads = intra_op_threads  # 0 = um por núcleo físico
+        options.inter_op_num_threads = inter_op_threads
+        self.kind = kind
+        self.name = name
+        self.path = path
+        self._options = options
+        self._create_session()
+        self.input_name = self.session.get_inputs()[0].name
+
+    def _create_session(self):
+        import onnxruntime as ort
+
+        self.session = ort.InferenceSession(self.path, sess_options=self._options, providers=["CPUExecutionProvider"])
+        self._session_pid = os.getpid()
+
+    def __call__(self, inputs):
+        if os.getpid() != self._session_pid:
+            # Worker criado por fork (servidor com preload): o pool de threads do ORT não sobrevive ao fork
+            self._create_session()
+        if self.kind == "detector":
+            # Exportado com uma imagem por chamada: listas (tiles) rodam uma a uma
+            outputs = []
+            for image in inputs:
+                boxes, labels, scores = self.session.run(None, {self.input_name: image.detach().cpu().numpy()})
+                outputs.append({
+                    "boxes": torch.from_numpy(boxes),
+                    "labels": torch.from_numpy(labels),
+                    "scores": torch.from_numpy(scores),
+                })
+            return outputs
+        # ORT espera NCHW contíguo; o tensor do preprocessamento é channels-last
+        (logits,) = self.session.run(None, {self.input_name: inputs.detach().cpu().contiguous().numpy()})
+        return torch.from_numpy(logits)
+
+
+class YoloExportBackend(EagerBackend):
+    """Ultralytics model loaded from an exported file (ultralytics runs ORT/TorchScript itself)."""
+
+    def __init__(self, path: str, backend: str):
+        from ultralytics import YOLO
+
+        super().__init__(YOLO(path), "yolo")
+        self.name = backend
+
+
+def create_inference_backend(model_name: str, kind: str, backend: str, load_eager: Callable,
+                             device: torch.device, models_dir: str,
+                             ort_intra_op_threads: int = 0, ort_inter_op_threads: int = 1,
+                             shared_weights: bool = False):
+    """
+    Builds the backend configured by INFERENCE_BACKEND ("eager", "torchscript" or "onnx")
+    or INFERENCE_INT8_MODELS ("onnx-int8").
+
+    Args:
+        model_name: name of the model (file name of its export)
+        kind: "classifier", "detector" or "yolo"
+        backend: requested backend ("onnx-int8" only for classifiers)
+        load_eager: loads the PyTorch model; only called when eager is used
+        device: torch device for eager and TorchScript models
+        models_dir: directory with the exported models
+        shared_weights: map the eager model's weights from <model>.weights.pt (src.utils.shared_weights)
+    """
+    if backend not in BACKENDS:
+        logger.warning(f"Unknown inference backend '{backend}'. Falling back to eager PyTorch.")
+        backend = "eager"
+    if backend == "onnx-int8" and kind != "classifier":
+        logger.warning(f"Int8 quantization is only available for classifiers, not '{model_name}'. Falling back to eager PyTorch.")
+        backend = "eager"
+
+    if backend != "eager":
+        path = exported_model_path(models_dir, model_name, backend)
+        if not os.path.exists(path):
+            logger.warning(f"No {backend} export for model '{model_name}' at {path}. Falling back to eager PyTorch.")
+        else:
+            try:
+                if kind == "yolo":
+                    instance = YoloExportBackend(path, backend)
+                elif backend == "torchscript":
+                    instance = TorchScriptBackend(path, kind, device)
+                else:
+                    instance = OnnxRuntimeBackend(path, kind, ort_intra_op_threads, ort_inter_op_threads, name=backend)
+                logger.info(f"Model '{model_name}' running on {backend} backend ({path})")
+                return instance
+            except Exception as e:
+                logger.error(f"Failed to load {backend} export of model '{model_name}': {e}. Falling back to eager PyTorch.")
+
+    instance = EagerBackend(load_eager(), kind)
+    if shared_weights:
+        _map_eager_weights(instance, model_name, models_dir, device)
+    return instance
+
+
+def _map_eager_weights(instance: EagerBackend, model_name: str, models_dir: str, device: torch.device):
+    """Swaps the eager model's private weights for the memory-mapped shared file, if there is one."""
+    path = shared_weights_path(models_dir, model_name)
+    if device.type != "cpu":
+        logger.warning(f"Shared weights only apply to CPU models; '{model_name}' keeps its {device} copy.")
+        return
+    if not os.path.exists(path):
+        logger.warning(f"No shared weights for model '{model_name}' at {path}; run scripts/export_shared_weights.py. Using private weights.")
+        return
+    try:
+        mapped = map_shared_weights(torch_module(instance.model, instance.kind), path)
+        logger.info(f"Model '{model_name}' weights memory-mapped from {path} ({mapped / (1024 * 1024):.1f} MB)")
+    except Exception as e:
+        logger.error(f"Failed to map shared weights of model '{model_name}': {e}. Using private weights.")
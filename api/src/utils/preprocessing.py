@@ -0,0 +1,181 @@
+"""
+Preprocessing engine shared by the prediction models.
+
+Each model gets a preprocessor built once at startup (target size, normalization
+constants already on the device). An upload is decoded once, at the smallest
+scale that satisfies every model that will consume it, and each preprocessor
+turns that image into model input with as few full-frame copies as possible:
+
+    PIL (reduced decode) -> resize -> uint8 HWC array -> torch.from_numpy view
+    -> permute to NCHW view (channels-last strides) -> one float32 copy
+    -> in-place normalization
+
+Per-stage timings are recorded per model and reported by preprocessing_metrics().
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+
+from .image_ingest import decode_image, DEFAULT_MAX_PIXELS
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class StageTimer:
+    """Collects wall-clock durations of the named stages of one request."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def as_dict(self) -> Dict[str, float]:
+        return {name: round(ms, 2) for name, ms in self.stages.items()}
+
+
+def _uint8_hwc_tensor(image: Image.Image, device: torch.device) -> torch.Tensor:
+    """Pixels of an RGB image as a uint8 HWC tensor sharing the NumPy buffer (on CPU)."""
+    return torch.from_numpy(np.array(image, dtype=np.uint8)).to(device)
+
+
+class ClassifierPreprocessor:
+    """Fixed-size classifier input: Resize(size) + ToTensor + Normalize, built once."""
+
+    def __init__(self, size: Tuple[int, int], device: torch.device,
+                 mean=IMAGENET_MEAN, std=IMAGENET_STD):
+        self.size = tuple(size)
+        self.device = device
+        # ToTensor's /255 folded into the constants: (x - 255*mean) / (255*std)
+        self.mean = torch.tensor(mean, dtype=torch.float32, device=device).view(1, 3, 1, 1).mul_(255)
+        self.std = torch.tensor(std, dtype=torch.float32, device=device).view(1, 3, 1, 1).mul_(255)
+
+    @property
+    def decode_request(self) -> Dict:
+        return {"min_size": self.size}
+
+    def __call__(self, image: Image.Image, timer: StageTimer) -> torch.Tensor:
+        with timer.stage("resize"):
+            # Same filter torchvision's Resize applies to PIL images
+            resized = image.resize(self.size, Image.Resampling.BILINEAR)
+        with timer.stage("to_tensor"):
+            tensor = _uint8_hwc_tensor(resized, self.device).permute(2, 0, 1).unsqueeze(0)
+            tensor = tensor.to(dtype=torch.float32, memory_format=torch.channels_last)
+        with timer.stage("normalize"):
+            tensor.sub_(self.mean).div_(self.std)
+        return tensor
+
+
+class DetectorPreprocessor:
+    """
+    Detector input: longest side capped at max_side (LANCZOS, aspect kept) and a
+    CHW float tensor in [0, 1]. Returns the resized image too, for annotation.
+    """
+
+    def __init__(self, max_side: int, device: torch.device):
+        self.max_side = max_side
+        self.device = device
+
+    @property
+    def decode_request(self) -> Dict:
+        return {"max_side": self.max_side}
+
+    def __call__(self, image: Image.Image, timer: StageTimer) -> Tuple[Image.Image, torch.Tensor]:
+        with timer.stage("resize"):
+            width, height = image.size
+            if width > self.max_side or height > self.max_side:
+                if width > height:
+                    size = (self.max_side, int((height * self.max_side) / width))
+                else:
+                    size = (int((width * self.max_side) / height), self.max_side)
+                image = image.resize(size, Image.Resampling.LANCZOS)
+        with timer.stage("to_tensor"):
+            tensor = _uint8_hwc_tensor(image, self.device).permute(2, 0, 1)
+            tensor = tensor.to(dtype=torch.float32).div_(255)
+        return image, tensor
+
+
+class ImagePreprocessor:
+    """For models that do their own resizing (YOLO): only the decode size is constrained."""
+
+    def __init__(self, max_side: int):
+        self.max_side = max_side
+
+    @property
+    def decode_request(self) -> Dict:
+        return {"max_side": self.max_side}
+
+    def __call__(self, image: Image.Image, timer: StageTimer) -> Image.Image:
+        return image
+
+
+_stats_lock = threading.Lock()
+_stage_stats: Dict[str, Dict[str, Dict[str, float]]] = {}
+
+
+def record_timings(model: str, timer: StageTimer):
+    """Adds one request's stage timings to the per-model aggregates."""
+    with _stats_lock:
+        model_stats = _stage_stats.setdefault(model, {})
+        for name, ms in timer.stages.items():
+            stats = model_stats.setdefault(name, {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+            stats["count"] += 1
+            stats["total_ms"] += ms
+            stats["max_ms"] = max(stats["max_ms"], ms)
+
+
+def preprocessing_metrics() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Average and max duration of every recorded stage, per model."""
+    with _stats_lock:
+        return {
+            model: {
+                name: {
+                    "count": int(stats["count"]),
+                    "avg_ms": round(stats["total_ms"] / stats["count"], 2),
+                    "max_ms": round(stats["max_ms"], 2),
+                }
+                for name, stats in model_stats.items()
+            }
+            for model, model_stats in _stage_stats.items()
+        }
+
+
+class PreprocessingEngine:
+    """Decodes uploads once and prepares them for any registered model."""
+
+    def __init__(self, preprocessors: Dict, max_pixels: int = DEFAULT_MAX_PIXELS):
+        self.preprocessors = preprocessors
+        self.max_pixels = max_pixels
+
+    def _decode_request(self, models: Iterable[str]) -> Dict:
+        """Merges the decode requirements of several models (the largest one wins)."""
+        min_size = None
+        max_side = None
+        for model in models:
+            request = self.preprocessors[model].decode_request
+            if "min_size" in request:
+                size = request["min_size"]
+                min_size = size if min_size is None else (max(min_size[0], size[0]), max(min_size[1], size[1]))
+            if "max_side" in request:
+                max_side = max(max_side or 0, request["max_side"])
+        return {"min_size": min_size, "max_side": max_side}
+
+    def decode(self, image_data: bytes, models: Iterable[str], timer: StageTimer) -> Image.Image:
+        """Decodes the upload once, large enough for every model in `models`."""
+        with timer.stage("decode"):
+            return decode_image(image_data, max_pixels=self.max_pixels, **self._decode_request(models))
+
+    def prepare(self, model: str, image: Image.Image, timer: StageTimer):
+        """Model input for a decoded image (see each preprocessor for the return type)."""
+        return self.preprocessors[model](image, timer)
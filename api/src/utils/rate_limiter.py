@@ -0,0 +1,216 @@
+import time
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException
+from ..config.settings import Settings
+from ..repositories.user_repository import UserRepository
+from ..utils.logger import get_logger
+
+settings = Settings()
+logger = get_logger(__name__)
+
+
+def _consume(tokens: float, updated_at: float, now: float, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+    """Refills a bucket for the elapsed time and tries to take one token from it."""
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_per_second)
+    if tokens >= 1:
+        return True, tokens - 1
+    return False, tokens
+
+
+class RateLimitStore:
+    """
+    Storage backend for token buckets.
+    Implementations must refill and consume a bucket atomically.
+    """
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        """
+        Tries to consume one token from the bucket identified by key.
+
+        Returns:
+            tuple: (allowed, tokens left after the operation)
+        """
+        raise NotImplementedError
+
+    async def reset(self, key: str):
+        """Removes the bucket, restoring it to full capacity."""
+        raise NotImplementedError
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """Per-process token buckets. Suitable for single-worker deployments."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated_at, capacity, refill_per_second): cada bucket é julgado pelos próprios limites
+        self.buckets: Dict[str, Tuple[float, float, float, float]] = {}
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at, _, _ = self.buckets.get(key, (capacity, now, capacity, refill_per_second))
+        allowed, tokens = _consume(tokens, updated_at, now, capacity, refill_per_second)
+
+        if key not in self.buckets and len(self.buckets) >= self.max_keys:
+            self._evict(now)
+            if len(self.buckets) >= self.max_keys:
+                # Nenhum bucket cheio para descartar: os limites em curso valem mais que o novo
+                logger.warning(f"Rate limit store full ({self.max_keys} buckets); not tracking '{key}'")
+                return allowed, tokens
+        self.buckets[key] = (tokens, now, capacity, refill_per_second)
+        return allowed, tokens
+
+    async def reset(self, key: str):
+        self.buckets.pop(key, None)
+
+    def _evict(self, now: float):
+        """
+        Drops the buckets that have refilled to their own capacity: recreating
+        them full changes nothing. Partly used or empty buckets are never dropped.
+        """
+        full = [
+            key for key, (tokens, updated_at, capacity, refill_per_second) in self.buckets.items()
+            if tokens + (now - updated_at) * refill_per_second >= capacity
+        ]
+        for key in full:
+            del self.buckets[key]
+
+
+class PostgresRateLimitStore(RateLimitStore):
+    """
+    Token buckets shared by every worker through a PostgreSQL table.
+    Uses the users repository's connection pool instead of opening its own.
+    """
+
+    def __init__(self):
+        self.user_repository = UserRepository()
+        self.pool = None
+
+    async def init_pool(self):
+        """Borrow the users connection pool and create the buckets table if necessary."""
+        if not self.pool:
+            await self.user_repository.init_pool()
+            async with self.user_repository.pool.acquire() as conn:
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS login_rate_limits (
+                        bucket_key TEXT PRIMARY KEY,
+                        tokens DOUBLE PRECISION NOT NULL,
+                        updated_at DOUBLE PRECISION NOT NULL
+                    )
+                """)
+            self.pool = self.user_repository.pool
+            logger.info("Rate limit table ready (users connection pool).")
+
+    async def take(self, key: str, capacity: float, refill_per_second: float) -> Tuple[bool, float]:
+        await self.init_pool()
+        now = time.time()
+        async with self.pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    "INSERT INTO login_rate_limits (bucket_key, tokens, updated_at) VALUES ($1, $2, $3) "
+                    "ON CONFLICT (bucket_key) DO NOTHING",
+                    key, float(capacity), now
+                )
+                bucket = await conn.fetchrow(
+                    "SELECT tokens, updated_at FROM login_rate_limits WHERE bucket_key = $1 FOR UPDATE",
+                    key
+                )
+                allowed, tokens = _consume(bucket["tokens"], bucket["updated_at"], now, capacity, refill_per_second)
+                await conn.execute(
+                    "UPDATE login_rate_limits SET tokens = $2, updated_at = $3 WHERE bucket_key = $1",
+                    key, tokens, now
+                )
+                return allowed, tokens
+
+    async def reset(self, key: str):
+        await self.init_pool()
+        async with self.pool.acquire() as conn:
+            await conn.execute("DELETE FROM login_rate_limits WHERE bucket_key = $1", key)
+
+
+def create_rate_limit_store(backend: str) -> RateLimitStore:
+    """Builds the store configured by LOGIN_RATE_LIMIT_BACKEND ("memory" or "postgres")."""
+    if backend == "postgres":
+        return PostgresRateLimitStore()
+    if backend != "memory":
+        logger.warning(f"Unknown rate limit backend '{backend}'. Falling back to in-memory store.")
+    return InMemoryRateLimitStore()
+
+
+class LoginRateLimiter:
+    """
+    Token bucket limiter for login attempts, keyed by client IP and by email.
+    Runs before any user lookup or password verification.
+    """
+
+    def __init__(self, store: Optional[RateLimitStore] = None):
+        self.store = store or create_rate_limit_store(settings.LOGIN_RATE_LIMIT_BACKEND)
+        self.ip_capacity = settings.LOGIN_RATE_LIMIT_IP_CAPACITY
+        self.ip_refill = settings.LOGIN_RATE_LIMIT_IP_REFILL_PER_MINUTE / 60
+        self.email_capacity = settings.LOGIN_RATE_LIMIT_EMAIL_CAPACITY
+        self.email_refill = settings.LOGIN_RATE_LIMIT_EMAIL_REFILL_PER_MINUTE / 60
+        self.rejected = {"ip": 0, "email": 0}
+        self.store_errors = 0
+
+    async def check(self, ip_address: Optional[str], email: str):
+        """
+        Consumes one token from the IP bucket and one from the email bucket.
+        Without a client address (request from a trusted proxy that did not
+        forward one) only the email bucket applies: the proxy's own address is
+        shared by every user behind it.
+
+        Raises:
+            HTTPException: 429 if either bucket is empty
+        """
+        email = (email or "").strip().lower()
+        buckets = [("email", f"login:email:{email}", self.email_capacity, self.email_refill)]
+        if ip_address:
+            buckets.insert(0, ("ip", f"login:ip:{ip_address}", self.ip_capacity, self.ip_refill))
+        else:
+            logger.warning(f"Login without a client address (trusted proxy sent no X-Forwarded-For); IP limit skipped for {email}")
+
+        for scope, key, capacity, refill in buckets:
+            try:
+                allowed, tokens = await self.store.take(key, capacity, refill)
+            except Exception as e:
+                # Fail open: a broken limiter must not lock every user out
+                self.store_errors += 1
+                logger.error(f"Rate limit store error for {scope} bucket: {e}")
+                continue
+
+            if not allowed:
+                self.rejected[scope] += 1
+                retry_after = max(1, int((1 - tokens) / refill) + 1)
+                logger.warning(
+                    f"Login rate limit exceeded: scope={scope} ip={ip_address} email={email} "
+                    f"retry_after={retry_after}s rejected_total={self.rejected[scope]}"
+                )
+                raise HTTPException(
+                    status_code=429,
+                    detail={
+                        "message": f"Too many login attempts. Try again in {retry_after} seconds.",
+                        "status_code": 429
+                    },
+                    headers={"Retry-After": str(retry_after)}
+                )
+
+    async def reset_email(self, email: str):
+        """Restores the email bucket after a successful login."""
+        email = (email or "").strip().lower()
+        try:
+            await self.store.reset(f"login:email:{email}")
+        except Exception as e:
+            self.store_errors += 1
+            logger.error(f"Rate limit store error while resetting email bucket: {e}")
+
+    def metrics(self) -> Dict:
+        """Counters of rejected login attempts since process start."""
+        return {
+            "backend": type(self.store).__name__,
+            "rejected_by_ip": self.rejected["ip"],
+            "rejected_by_email": self.rejected["email"],
+            "rejected_total": self.rejected["ip"] + self.rejected["email"],
+            "store_errors": self.store_errors
+        }
+
+
+login_rate_limiter = LoginRateLimiter()
@@ -0,0 +1,63 @@
+"""
+Startup readiness of the API process.
+
+Liveness (/api/health/live) only says the process answers. Readiness
+(/api/health/ready) flips to "ready" once the startup phase in src.main has run
+every model on synthetic inputs at production shapes (torch/ultralytics pay
+their lazy allocator and kernel setup there instead of on the first request)
+and created the database connection pools, so load balancers only route to warm
+workers.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+STARTING = "starting"
+WARMING = "warming"
+WAITING_FOR_DATABASE = "waiting_for_database"
+READY = "ready"
+FAILED = "failed"
+
+
+class Readiness:
+    """Startup state of this process, updated by the startup task and read by the health endpoints."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._state = STARTING
+        self._started_at = time.monotonic()
+        self._ready_at: Optional[float] = None
+        self._error: Optional[str] = None
+        self._warmup_ms: Dict[str, List[float]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self._state == READY
+
+    def set_state(self, state: str, error: Optional[str] = None):
+        with self._lock:
+            self._state = state
+            self._error = error
+            if state == READY:
+                self._ready_at = time.monotonic()
+
+    def record_warmup(self, model: str, round_ms: List[float]):
+        """Duration of each warm-up round of a model (the first one carries the cold-start cost)."""
+        with self._lock:
+            self._warmup_ms[model] = [round(ms, 2) for ms in round_ms]
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            status = {
+                "status": self._state,
+                "uptime_seconds": round(time.monotonic() - self._started_at, 1),
+                "warmup_ms": dict(self._warmup_ms),
+            }
+            if self._ready_at is not None:
+                status["startup_seconds"] = round(self._ready_at - self._started_at, 1)
+            if self._error:
+                status["error"] = self._error
+            return status
+
+
+readiness = Readiness()
@@ -0,0 +1,157 @@
+"""
+CPU thread layout of the inference runtime.
+
+Left alone, torch (and ONNX Runtime with intra_op_num_threads=0) gives every
+worker process one intra-op thread per core, and every inference pool slot
+runs its own team of those threads: N workers x INFERENCE_WORKERS slots x C
+threads on a C-core box oversubscribe each other under load. This module
+sizes them from the CPUs the process may actually use:
+
+- the affinity mask (taskset, cpusets) and the cgroup CPU quota (container
+  limits, v2 cpu.max or v1 cfs_quota_us), whichever is smaller;
+- split across the server workers (WEB_CONCURRENCY), then across the inference
+  pool slots of each worker: intra-op threads = cpus // workers // slots.
+
+TORCH_INTRA_OP_THREADS / TORCH_INTER_OP_THREADS override the computed values
+(0 = computed). With INFERENCE_CPU_AFFINITY each gunicorn worker is pinned to
+its own slice of the CPUs (gunicorn.conf.py passes the worker index). The
+chosen layout is logged at startup and reported in /api/metrics.
+"""
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+import torch
+
+from .logger import get_logger
+
+logger = get_logger(__name__)
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+_layout: Dict = {}
+
+
+def affinity_cpus() -> List[int]:
+    """CPUs this process may run on (all of them where affinity is unsupported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """CPUs allowed by the cgroup quota (e.g. 2.5), or None without a quota."""
+    cpu_max = _read(CGROUP_V2_CPU_MAX)
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota, period = _read(CGROUP_V1_QUOTA), _read(CGROUP_V1_PERIOD)
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def effective_cpus() -> Tuple[int, str]:
+    """
+    Number of CPUs worth of threads this process should run and where the
+    limit comes from ("affinity" or "cgroup").
+    """
+    cpus = len(affinity_cpus())
+    limit = cgroup_cpu_limit()
+    # Quota fracionária arredonda para baixo: threads acima da cota só geram throttling
+    if limit is not None and math.floor(limit) < cpus:
+        return max(1, math.floor(limit)), "cgroup"
+    return cpus, "affinity"
+
+
+def plan_thread_layout(cpus: int, workers: int, inference_slots: int,
+                       intra_op_threads: int = 0, inter_op_threads: int = 0) -> Dict:
+    """
+    Threads per inference call so that workers x slots x threads fits in `cpus`
+    (at least one each). Non-zero `intra_op_threads` / `inter_op_threads` win.
+    """
+    workers = max(1, workers)
+    inference_slots = max(1, inference_slots)
+    cpus_per_worker = max(1, cpus // workers)
+    return {
+        "cpus": cpus,
+        "workers": workers,
+        "inference_slots": inference_slots,
+        "cpus_per_worker": cpus_per_worker,
+        "intra_op_threads": intra_op_threads or max(1, cpus_per_worker // inference_slots),
+        # Um pedido roda um modelo por vez: o paralelismo entre operadores só disputaria núcleos
+        "inter_op_threads": inter_op_threads or 1,
+    }
+
+
+def worker_cpu_slice(cpus: List[int], worker_index: int, workers: int) -> List[int]:
+    """
+    The `worker_index`-th of `workers` contiguous slices of `cpus`, like
+    numpy.array_split: the leftover CPUs go one each to the first slices, so
+    every CPU is used (one CPU each, wrapping, when there are more workers than CPUs).
+    """
+    workers = max(1, workers)
+    if workers >= len(cpus):
+        return [cpus[worker_index % len(cpus)]]
+    per_worker, extra = divmod(len(cpus), workers)
+    worker_index %= workers
+    start = worker_index * per_worker + min(worker_index, extra)
+    return cpus[start:start + per_worker + (1 if worker_index < extra else 0)]
+
+
+def configure_runtime(settings, worker_index: Optional[int] = None) -> Dict:
+    """
+    Applies the thread layout to torch for this process, pins it to its CPU
+    slice when INFERENCE_CPU_AFFINITY is on and `worker_index` is known, and
+    logs the result. Call before the first inference of the process (again in
+    each forked worker: the thread count is per process).
+
+    Returns:
+        dict: the layout applied (also available from runtime_layout())
+    """
+    cpus, source = effective_cpus()
+    layout = plan_thread_layout(
+        cpus, settings.WEB_CONCURRENCY, settings.INFERENCE_WORKERS,
+        settings.TORCH_INTRA_OP_THREADS, settings.TORCH_INTER_OP_THREADS
+    )
+    layout.update({"pid": os.getpid(), "cpu_source": source, "cgroup_cpu_limit": cgroup_cpu_limit(),
+                   "worker_index": worker_index, "affinity": None})
+
+    if settings.INFERENCE_CPU_AFFINITY and worker_index is not None and hasattr(os, "sched_setaffinity"):
+        cpu_slice = worker_cpu_slice(affinity_cpus(), worker_index, layout["workers"])
+        # Só a thread atual; as criadas depois (OpenMP, pool de inferência) herdam a máscara
+        os.sched_setaffinity(0, cpu_slice)
+        layout["affinity"] = cpu_slice
+
+    torch.set_num_threads(layout["intra_op_threads"])
+    try:
+        torch.set_num_interop_threads(layout["inter_op_threads"])
+    except RuntimeError:
+        # Só pode ser definido uma vez por processo, antes do primeiro uso (o worker herda o do master)
+        layout["inter_op_threads"] = torch.get_num_interop_threads()
+
+    _layout.clear()
+    _layout.update(layout)
+    logger.info(
+        f"Thread layout: {layout['cpus']} CPUs ({source}), {layout['workers']} workers x "
+        f"{layout['inference_slots']} inference slots x {layout['intra_op_threads']} intra-op threads, "
+        f"{layout['inter_op_threads']} inter-op, affinity {layout['affinity'] or 'not pinned'}"
+    )
+    return layout
+
+
+def runtime_layout() -> Dict:
+    """Thread layout applied to this process (empty before configure_runtime)."""
+    return dict(_layout)
@@ -0,0 +1,81 @@
+"""
+Memory-mapped model weights shared between worker processes.
+
+scripts/export_shared_weights.py writes each PyTorch model's state_dict to
+INFERENCE_MODELS_DIR/<model>.weights.pt. With INFERENCE_SHARED_WEIGHTS on, the
+eager backend maps that file (torch.load(mmap=True)) and assigns the mapped
+tensors to the model instead of copying them, so the weights live in the page
+cache: every worker of the node that maps the same file shares the same
+read-only pages, whether the workers were forked from a preloaded master
+(gunicorn.conf.py) or started on their own.
+
+Check with scripts/report_worker_memory.py: after warm-up, each worker's USS
+should stay a small fraction of its RSS.
+
+Only CPU eager models are mapped (GPU weights are copied to the device anyway,
+and exported backends keep their own copy). Requires torch >= 2.1.
+"""
+import os
+from typing import Dict
+
+import psutil
+import torch
+
+WEIGHTS_EXTENSION = "weights.pt"
+
+
+def shared_weights_path(models_dir: str, model_name: str) -> str:
+    return os.path.join(models_dir, f"{model_name}.{WEIGHTS_EXTENSION}")
+
+
+def torch_module(model, kind: str) -> torch.nn.Module:
+    """
+    nn.Module holding the weights of a loaded model (ultralytics wraps it in .model).
+
+    YOLO models are fused (conv+bn) first. Ultralytics' predictor fuses on the
+    first call and fusing allocates new weights, which would give every worker a
+    private copy at warm-up; fused here, the file holds the fused weights and
+    the predictor finds nothing left to fuse.
+    """
+    if kind == "yolo":
+        model.fuse()  # Não faz nada se já estiver fundido
+        return model.model
+    return model
+
+
+def save_shared_weights(module: torch.nn.Module, path: str):
+    """Writes the state_dict with contiguous tensors, mappable by map_shared_weights."""
+    state = {name: tensor.detach().contiguous() for name, tensor in module.state_dict().items()}
+    torch.save(state, path)
+
+
+def map_shared_weights(module: torch.nn.Module, path: str) -> int:
+    """
+    Replaces the module's parameters and buffers with tensors memory-mapped from `path`.
+
+    Returns:
+        int: bytes of weights now backed by the mapped file
+    """
+    state = torch.load(path, map_location="cpu", mmap=True, weights_only=True)
+    # assign=True: os tensores mapeados viram os parâmetros (sem cópia para memória privada)
+    module.load_state_dict(state, strict=True, assign=True)
+    module.eval()
+    return sum(tensor.numel() * tensor.element_size() for tensor in state.values())
+
+
+def memory_usage() -> Dict[str, float]:
+    """
+    Memory of this process in MB: rss, uss (pages only this process holds), pss
+    (shared pages split among the processes mapping them) and shared (rss - uss).
+    """
+    info = psutil.Process().memory_full_info()
+    to_mb = 1 / (1024 * 1024)
+    usage = {
+        "pid": os.getpid(),
+        "rss_mb": round(info.rss * to_mb, 1),
+        "uss_mb": round(info.uss * to_mb, 1),
+        "shared_mb": round((info.rss - info.uss) * to_mb, 1),
+    }
+    if hasattr(info, "pss"):  # Só no Linux
+        usage["pss_mb"] = round(info.pss * to_mb, 1)
+    return usage
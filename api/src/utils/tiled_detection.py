@@ -0,0 +1,127 @@
+"""
+Tiled high-resolution inference for the breast detector.
+
+Downscaling a mammogram to 1024 px loses small masses, and a single full-resolution
+pass is too slow and memory-hungry on CPU. The tiled mode works in two stages:
+
+1. coarse pass: the whole image at the display resolution (coarse_max_side), same
+   as the "accurate" profile, so the result never has less coverage than before;
+2. refinement: the full-resolution image split into overlapping tiles of
+   tile_size, run through the detector in batches of batch_size. Tiles that are
+   mostly background (fraction of pixels above foreground_level, measured on a
+   1/8 scale grayscale copy, below min_foreground) are skipped. The rest are
+   run in order of tissue content until the latency budget (budget_ms,
+   including the coarse pass) would be exceeded.
+
+Boxes from every stage are mapped to display coordinates and merged with
+class-aware batched NMS (merge_iou).
+"""
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import torch
+from PIL import Image
+from torchvision.ops import batched_nms
+
+from .preprocessing import DetectorPreprocessor, StageTimer
+
+MASK_REDUCTION = 8  # Escala da máscara de tecido usada para descartar tiles de fundo
+
+
+def plan_tiles(width: int, height: int, tile_size: int, overlap: int) -> List[Tuple[int, int, int, int]]:
+    """(x0, y0, x1, y1) of overlapping tiles covering the image; edge tiles are shifted inside."""
+    stride = max(1, tile_size - overlap)
+
+    def starts(length):
+        if length <= tile_size:
+            return [0]
+        positions = list(range(0, length - tile_size, stride))
+        positions.append(length - tile_size)
+        return positions
+
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in starts(height)
+        for x in starts(width)
+    ]
+
+
+def tissue_fraction(mask: np.ndarray, tile: Tuple[int, int, int, int]) -> float:
+    """Share of foreground pixels of a tile, looked up on the reduced mask."""
+    x0, y0, x1, y1 = (value // MASK_REDUCTION for value in tile)
+    region = mask[y0:max(y1, y0 + 1), x0:max(x1, x0 + 1)]
+    return float(region.mean()) if region.size else 0.0
+
+
+def _detections(output: Dict, offset_x: float = 0, offset_y: float = 0, scale: float = 1.0):
+    boxes = output["boxes"].detach().cpu().float()
+    if len(boxes):
+        boxes = (boxes + torch.tensor([offset_x, offset_y, offset_x, offset_y])) * scale
+    return boxes, output["labels"].detach().cpu(), output["scores"].detach().cpu().float()
+
+
+def detect_tiled(coarse_detector, tile_detector, image: Image.Image, tiling: Dict,
+                 device: torch.device, timer: StageTimer):
+    """
+    Runs the coarse pass and the budgeted tile refinement on a full-resolution image.
+
+    Returns:
+        tuple: display image, boxes/labels/scores in display coordinates, tiling stats
+    """
+    start = time.perf_counter()
+
+    # Passo grosso: imagem inteira na resolução de exibição
+    display_image, display_tensor = DetectorPreprocessor(tiling["coarse_max_side"], device)(image, timer)
+    scale = display_image.width / image.width
+    with timer.stage("inference"), torch.no_grad():
+        coarse = coarse_detector([display_tensor])[0]
+    coarse_boxes, coarse_labels, coarse_scores = _detections(coarse)
+    all_boxes, all_labels, all_scores = [coarse_boxes], [coarse_labels], [coarse_scores]
+
+    stats = {"tiles_total": 0, "tiles_background": 0, "tiles_run": 0, "tiles_over_budget": 0}
+    if scale < 1:
+        with timer.stage("tiling"):
+            mask = np.asarray(image.convert("L").reduce(MASK_REDUCTION)) > tiling["foreground_level"]
+            tiles = plan_tiles(image.width, image.height, tiling["tile_size"], tiling["overlap"])
+            stats["tiles_total"] = len(tiles)
+            scored = [(tissue_fraction(mask, tile), tile) for tile in tiles]
+            candidates = [tile for fraction, tile in sorted(scored, key=lambda item: -item[0])
+                          if fraction >= tiling["min_foreground"]]
+            stats["tiles_background"] = len(tiles) - len(candidates)
+            # Uma cópia uint8 da imagem cheia; cada tile vira float só no lote em que roda
+            pixels = torch.from_numpy(np.array(image, dtype=np.uint8)).permute(2, 0, 1)
+
+        budget_ms = tiling["budget_ms"]
+        batch_size = tiling["batch_size"]
+        last_batch_ms = 0.0
+        for index in range(0, len(candidates), batch_size):
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if budget_ms and elapsed_ms + last_batch_ms > budget_ms:
+                stats["tiles_over_budget"] = len(candidates) - index
+                break
+            batch = candidates[index:index + batch_size]
+            batch_start = time.perf_counter()
+            tensors = [
+                pixels[:, y0:y1, x0:x1].to(device=device, dtype=torch.float32).div_(255)
+                for x0, y0, x1, y1 in batch
+            ]
+            with timer.stage("inference_tiles"), torch.no_grad():
+                outputs = tile_detector(tensors)
+            for (x0, y0, _, _), output in zip(batch, outputs):
+                boxes, labels, scores = _detections(output, x0, y0, scale)
+                all_boxes.append(boxes)
+                all_labels.append(labels)
+                all_scores.append(scores)
+            stats["tiles_run"] += len(batch)
+            last_batch_ms = (time.perf_counter() - batch_start) * 1000
+
+    with timer.stage("merge"):
+        boxes = torch.cat(all_boxes)
+        labels = torch.cat(all_labels)
+        scores = torch.cat(all_scores)
+        if len(boxes):
+            keep = batched_nms(boxes, scores, labels, tiling["merge_iou"])
+            boxes, labels, scores = boxes[keep], labels[keep], scores[keep]
+
+    return display_image, boxes, labels, scores, stats
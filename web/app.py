@@ -1,8 +1,9 @@
 # web/app.py (Estrutura Corrigida Sugerida)
 
 from fasthtml.common import *
-from config import SERVER_HOST, SERVER_PORT, SESSION_SECRET_KEY
+from config import SERVER_HOST, SERVER_PORT, SESSION_SECRET_KEY, SESSION_TTL
 from middlewares.auth_middleware import auth_middleware
+from middlewares.session_middleware import ServerSideSessionMiddleware
 from starlette.responses import Response as HTTPResponse, RedirectResponse
 
 # Importa páginas
@@ -22,6 +23,9 @@ from pages.health_units.edit import edit_health_unit_page
 from services.health_units_service import HealthUnitsService
 from services.users_service import UsersService
 from services.attendance_service import AttendanceService
+from services.prediction_service import PredictionService
+from services.http_client import http_client_lifespan
+from utils.assets import serve_asset
 from pages.predict.respiratory import prediction_respiratory_page
 from pages.predict.breast_cancer import prediction_breast_cancer_page
 from pages.predict.tuberculosis import prediction_tuberculosis_page
@@ -41,7 +45,12 @@ beforeware = Beforeware(auth_middleware, skip=skip_paths)
 app = FastHTML(
     debug=True,
     secret_key=SESSION_SECRET_KEY,
+    # Sessão no servidor: o cookie leva só um id assinado
+    sess_cls=ServerSideSessionMiddleware,
+    max_age=SESSION_TTL,
     before=beforeware,
+    # Pool de conexões HTTP com a API compartilhado por todos os serviços
+    lifespan=http_client_lifespan,
     # Adicione outros hdrs globais se necessário, como CSS do layout
     # hdrs=(...)
 )
@@ -49,6 +58,11 @@ app = FastHTML(
 # Define as rotas
 rt = app.route
 
+# --- Arquivos estáticos (CSS/JS com hash, pré-comprimidos) ---
+@rt('/static/{path:path}')
+async def get_static(request, path: str):
+    return serve_asset(request, path)
+
 # --- Rotas Públicas ---
 @rt('/login')
 async def get_login(request):
@@ -233,6 +247,19 @@ async def get_predict_breast_cancer(request):
 @rt('/predict/breast-cancer')
 async def post_predict_breast_cancer(request):
     return await prediction_breast_cancer_page(request)
+@rt('/predict/breast-cancer/annotated/{detection_id}')
+async def get_breast_annotation(request, detection_id: str):
+    """Repassa a imagem anotada renderizada pela API (sob demanda, em cache lá)."""
+    session = request.scope.get("session", {})
+    token = session.get('token')
+    if not token:
+        return HTTPResponse(status_code=401, content="Not Authorized")
+    # Bytes repassados como vieram (JPEG ou WebP conforme o Accept do navegador), sem base64
+    annotation = await PredictionService.get_breast_annotation(token, detection_id, request.headers.get("accept"))
+    if annotation is None:
+        return HTTPResponse(status_code=404, content="Annotated image expired. Run the detection again.")
+    image, media_type = annotation
+    return HTTPResponse(content=image, media_type=media_type, headers={"Cache-Control": "private, max-age=600", "Vary": "Accept"})
 
 @rt('/predict/tuberculosis')
 async def get_predict_tuberculosis(request):
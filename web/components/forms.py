@@ -309,4 +309,30 @@ def LoginForm(error=None):
         method="post",
         action="/login",
         style="max-width: 400px; margin: 2rem auto; padding: 2rem; background: white; border-radius: 8px; box-shadow: 0 4px 12px rgba(0,0,0,0.1);"
-    )
\ No newline at end of file
+    )
+
+# --- Campo de upload de imagem para as páginas de predição ---
+def ImageUploadField(label, max_dimension=None):
+    """
+    Campo de arquivo + opção de enviar em resolução cheia.
+    Com max_dimension (informado pela API para o modelo), o script
+    js/upload-downscale.js reduz a imagem no navegador antes do upload.
+    """
+    file_input = Input(id="image_file", name="image_file", type="file", accept="image/*", required=True,
+                       data_max_dimension=str(max_dimension) if max_dimension else None)
+    return Div(
+        Div(
+            Label(label, For="image_file"),
+            file_input,
+            Small("Upload JPEG, PNG, GIF, or BMP images."),
+            cls="form-group"
+        ),
+        Div(
+            Label(
+                Input(type="checkbox", id="full_resolution", name="full_resolution", value="true"),
+                f" Upload at full resolution (images are otherwise reduced to {max_dimension}px before upload)",
+                For="full_resolution"
+            ),
+            cls="form-group"
+        ) if max_dimension else ""
+    )
@@ -1,5 +1,6 @@
 # web/components/ui.py
 from fasthtml.common import *
+from urllib.parse import urlencode
 
 
 _OriginalHtmlTable = Table
@@ -44,30 +45,70 @@ def Table(headers, rows, id=None, cls=""): # Sua função wrapper customizada
         cls=f"table-container {cls}"
     )
 
-def Pagination(page, total_pages, base_url):
-    """Componente de paginação"""
+def Pagination(page, total_pages, base_url, params=None, target=None):
+    """
+    Componente de paginação.
+    params: filtros mantidos nos links; target: seletor do elemento que o HTMX
+    substitui (links com hx-get + hx-push-url). Sem target, links comuns.
+    """
     if total_pages <= 1:
         return ""
-    
+
+    filters = {k: v for k, v in (params or {}).items() if v}
+
+    def page_link(label, page_number):
+        url = f"{base_url}?{urlencode({**filters, 'page': page_number})}"
+        if target:
+            return A(label, href=url, hx_get=url, hx_target=target, hx_swap="outerHTML", hx_push_url="true")
+        return A(label, href=url)
+
     items = []
-    
+
     # Botão anterior
     if page > 1:
-        items.append(Li(A("Previous", href=f"{base_url}?page={page-1}")))
+        items.append(Li(page_link("Previous", page-1)))
     else:
         items.append(Li(A("Previous", href="#", cls="disabled")))
-    
+
     # Páginas
     for i in range(max(1, page-2), min(total_pages+1, page+3)):
         if i == page:
-            items.append(Li(A(i, href=f"{base_url}?page={i}"), cls="active"))
+            items.append(Li(page_link(i, i), cls="active"))
         else:
-            items.append(Li(A(i, href=f"{base_url}?page={i}")))
-    
+            items.append(Li(page_link(i, i)))
+
     # Botão próximo
     if page < total_pages:
-        items.append(Li(A("Next", href=f"{base_url}?page={page+1}")))
+        items.append(Li(page_link("Next", page+1)))
     else:
         items.append(Li(A("Next", href="#", cls="disabled")))
-    
-    return Ul(*items, cls="pagination")
\ No newline at end of file
+
+    return Ul(*items, cls="pagination")
+
+def DetectionOverlay(image_src, bounding_boxes, image_size, alt="", cls=""):
+    """
+    Imagem com as detecções desenhadas por cima em uma camada SVG (o navegador renderiza).
+    bounding_boxes: x/y/width/height/confidence em pixels de image_size ([largura, altura]),
+    que pode diferir da resolução de image_src: o viewBox faz a escala.
+    """
+    width, height = image_size
+    font_size = max(12, int(min(width, height) * 0.03))
+    shapes = []
+    for box in bounding_boxes:
+        x, y, w, h = box.get('x', 0), box.get('y', 0), box.get('width', 0), box.get('height', 0)
+        # Rótulo acima da caixa, ou dentro dela se não houver espaço no topo
+        text_y = y - font_size * 0.3 if y > font_size else y + font_size
+        shapes.append(
+            f'<rect x="{x}" y="{y}" width="{w}" height="{h}" class="detection-box"/>'
+            f'<text x="{x + 2}" y="{text_y:.0f}" font-size="{font_size}" class="detection-label">'
+            f'{box.get("confidence", 0):.2f}</text>'
+        )
+    svg = (
+        f'<svg class="detection-overlay-layer" viewBox="0 0 {width} {height}" '
+        f'preserveAspectRatio="none" aria-hidden="true">{"".join(shapes)}</svg>'
+    )
+    return Div(
+        Img(src=image_src, alt=alt, cls="prediction-image-preview"),
+        NotStr(svg),
+        cls=f"detection-overlay {cls}"
+    )
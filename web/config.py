@@ -14,4 +14,29 @@ SERVER_HOST = os.getenv("SERVER_HOST", "0.0.0.0")
 SERVER_PORT = int(os.getenv("SERVER_PORT", "5000"))
 
 # Configurações de segurança
-SESSION_SECRET_KEY = os.getenv("SESSION_SECRET_KEY", "c4d61c27a742917ed6d84e28110f2837")
\ No newline at end of file
+SESSION_SECRET_KEY = os.getenv("SESSION_SECRET_KEY", "c4d61c27a742917ed6d84e28110f2837")
+
+# Cliente HTTP compartilhado com a API (keep-alive / pool de conexões)
+API_HTTP2 = os.getenv("API_HTTP2", "false").lower() == "true"
+API_MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", "100"))
+API_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("API_MAX_KEEPALIVE_CONNECTIONS", "20"))
+API_KEEPALIVE_EXPIRY = float(os.getenv("API_KEEPALIVE_EXPIRY", "30"))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "5"))
+API_TIMEOUT = float(os.getenv("API_TIMEOUT", "10"))
+API_PREDICTION_TIMEOUT = float(os.getenv("API_PREDICTION_TIMEOUT", "60"))
+
+
+# Sessões no servidor: o cookie guarda apenas um id opaco
+SESSION_BACKEND = os.getenv("SESSION_BACKEND", "memory")  # "memory" ou "file"
+SESSION_FILE_DIR = os.getenv("SESSION_FILE_DIR", "/tmp/medai_sessions")
+SESSION_TTL = int(os.getenv("SESSION_TTL", str(12 * 3600)))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "10000"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(256 * 1024 * 1024)))
+SESSION_PURGE_EVERY_WRITES = int(os.getenv("SESSION_PURGE_EVERY_WRITES", "200"))  # Backend "file"
+# Artefatos de predição (imagens) guardados por referência
+PREDICTION_ARTIFACT_TTL = int(os.getenv("PREDICTION_ARTIFACT_TTL", "1800"))
+
+# Upload de imagens (repassado em streaming para a API de predição)
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(50 * 1024 * 1024)))
+# Acima disso, a cópia local usada para a miniatura vai para disco
+UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv("UPLOAD_SPOOL_MAX_MEMORY", str(1024 * 1024)))
@@ -0,0 +1,91 @@
+# web/middlewares/session_middleware.py
+import json
+import secrets
+from typing import Optional
+
+from itsdangerous import BadSignature, TimestampSigner
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+
+from config import SESSION_TTL
+from utils.session_store import SessionBackend, session_backend
+
+
+class ServerSideSessionMiddleware:
+    """
+    Substitui o SessionMiddleware do Starlette (cookie com os dados assinados).
+    O cookie carrega apenas um id opaco assinado; os dados ficam no SessionBackend.
+    Aceita os mesmos argumentos que o FastHTML repassa via sess_cls.
+    """
+
+    def __init__(self, app, secret_key, session_cookie="session_", max_age=SESSION_TTL,
+                 path="/", same_site="lax", https_only=False, domain=None,
+                 backend: Optional[SessionBackend] = None):
+        self.app = app
+        self.signer = TimestampSigner(str(secret_key))
+        self.session_cookie = session_cookie
+        self.max_age = max_age
+        self.backend = backend or session_backend
+        self.security_flags = f"httponly; samesite={same_site}"
+        if https_only:
+            self.security_flags += "; secure"
+        if domain is not None:
+            self.security_flags += f"; domain={domain}"
+        self.path = path
+
+    @staticmethod
+    def _snapshot(session: dict) -> str:
+        return json.dumps(session, sort_keys=True, default=str)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        connection = HTTPConnection(scope)
+        session_id = None
+        scope["session"] = {}
+
+        signed_id = connection.cookies.get(self.session_cookie)
+        if signed_id:
+            try:
+                session_id = self.signer.unsign(signed_id, max_age=self.max_age).decode("utf-8")
+                data = await self.backend.get(f"session:{session_id}")
+                if data is not None:
+                    scope["session"] = data
+                else:
+                    session_id = None  # Expirou no servidor
+            except BadSignature:
+                session_id = None
+
+        initial = self._snapshot(scope["session"])
+
+        async def send_wrapper(message):
+            nonlocal session_id
+            if message["type"] == "http.response.start":
+                session = scope["session"]
+                headers = MutableHeaders(scope=message)
+                if session:
+                    if session_id is None:
+                        session_id = secrets.token_urlsafe(32)
+                        await self.backend.set(f"session:{session_id}", session, self.max_age)
+                    elif self._snapshot(session) != initial:
+                        await self.backend.set(f"session:{session_id}", session, self.max_age)
+                    else:
+                        await self.backend.touch(f"session:{session_id}", self.max_age)
+                    cookie_value = self.signer.sign(session_id).decode("utf-8")
+                    headers.append(
+                        "Set-Cookie",
+                        f"{self.session_cookie}={cookie_value}; path={self.path}; "
+                        f"Max-Age={self.max_age}; {self.security_flags}"
+                    )
+                elif session_id is not None:
+                    # Sessão esvaziada (logout): remove do servidor e expira o cookie
+                    await self.backend.delete(f"session:{session_id}")
+                    headers.append(
+                        "Set-Cookie",
+                        f"{self.session_cookie}=null; path={self.path}; "
+                        f"expires=Thu, 01 Jan 1970 00:00:00 GMT; {self.security_flags}"
+                    )
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
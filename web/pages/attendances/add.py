@@ -1,14 +1,16 @@
 # web/pages/attendances/add.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 # Importações necessárias
 from components.layout import MainLayout
 from components.ui import Card, Alert, Img # Importa Img para preview
 from components.forms import AttendanceForm # O formulário de atendimento
 from services.attendance_service import AttendanceService
-from services.health_units_service import HealthUnitsService
 from services.auth_service import AuthService
+from services.data_loader import get_loader
 import base64 # Para lidar com a imagem
 import json # Para ler/escrever resultados na sessão
+from utils.session_store import save_artifact, load_artifact, delete_artifact
 
 async def add_attendance_page(request):
     """Renderiza a página para adicionar atendimento, com possível pré-preenchimento a partir da sessão."""
@@ -26,10 +28,16 @@ async def add_attendance_page(request):
         session['message_type'] = "error"
         return RedirectResponse('/', status_code=303)
 
+    # Unidades de saúde são necessárias em qualquer caso: a busca começa já
+    # e corre em paralelo com a leitura da sessão/formulário
+    health_units_request = get_loader(request).health_units()
+
     error_message = None
     prefilled_data = {} # Guarda dados pré-preenchidos da predição ou de erro POST
     image_preview_b64 = None # Guarda base64 da imagem para preview (se houver)
     image_preview_filename = None # Guarda nome do arquivo para preview
+    image_ref = None # Referência da imagem no session store (não vai no cookie)
+    prediction_id = None # Predição guardada na API: o atendimento usa a imagem de lá
 
     # --- Lógica GET: Verifica predição anterior na sessão ---
     if request.method == "GET":
@@ -41,11 +49,13 @@ async def add_attendance_page(request):
                 # Guarda o resultado como string (o form pode ter campo hidden para isso)
                 prefilled_data['model_result'] = str(prediction_session_data.get('model_result', ''))
                 # Guarda info da imagem para preview e possível reuso no POST
-                image_preview_b64 = prediction_session_data.get('image_base64')
+                image_ref = prediction_session_data.get('image_ref')
+                image_preview_b64 = await load_artifact(image_ref)
                 image_preview_filename = prediction_session_data.get('image_filename')
-                # Armazena temporariamente na sessão caso precise re-renderizar após erro no POST
-                if image_preview_b64: session['_temp_image_b64'] = image_preview_b64
+                # Guarda apenas a referência na sessão para o POST seguinte
+                if image_preview_b64: session['_temp_image_ref'] = image_ref
                 if image_preview_filename: session['_temp_image_filename'] = image_preview_filename
+                if prediction_session_data.get('prediction_id'): session['_temp_prediction_id'] = prediction_session_data['prediction_id']
 
             except Exception as e:
                 print(f"Erro ao processar dados da sessão 'last_prediction': {e}")
@@ -58,7 +68,7 @@ async def add_attendance_page(request):
         # Idealmente, buscar apenas unidades do admin do profissional
         # Ajuste no serviço ou na API para aceitar admin_id como filtro seria o ideal
         # Por ora, busca todas e o usuário seleciona.
-        health_units_result = await HealthUnitsService.get_health_units(token) # Passar admin_id aqui se a API suportar
+        health_units_result = await health_units_request # Passar admin_id aqui se a API suportar
         if health_units_result.get("success"):
             health_units = health_units_result.get("health_units", [])
             if not health_units and not error_message: # Não sobrescreve erro anterior
@@ -95,9 +105,9 @@ async def add_attendance_page(request):
                 if contents:
                     image_base64_to_send = base64.b64encode(contents).decode("utf-8")
                     filename_to_send = image_file.filename
-                    # Guarda na sessão temporária para re-renderizar se der erro
-                    session['_temp_image_b64'] = image_base64_to_send
-                    session['_temp_image_filename'] = filename_to_send
+                    # Guarda por referência para reaproveitar se der erro
+                    await delete_artifact(session.get('_temp_image_ref'))
+                    image_ref = await save_artifact(image_base64_to_send)
                     # Atualiza preview para a nova imagem
                     image_preview_b64 = image_base64_to_send
                     image_preview_filename = filename_to_send
@@ -105,7 +115,9 @@ async def add_attendance_page(request):
                     error_message = "Uploaded file is empty."
         else:
             # Se não houve upload, tenta usar a imagem da sessão temporária (vindo do GET ou de erro POST anterior)
-            image_base64_to_send = session.get('_temp_image_b64')
+            image_ref = session.get('_temp_image_ref')
+            prediction_id = session.get('_temp_prediction_id')
+            image_base64_to_send = await load_artifact(image_ref)
             filename_to_send = session.get('_temp_image_filename')
             # Mantém preview com a imagem vinda da sessão
             image_preview_b64 = image_base64_to_send
@@ -113,13 +125,14 @@ async def add_attendance_page(request):
 
 
         # Limpa a sessão temporária após tentar usar/guardar
-        if '_temp_image_b64' in session: del session['_temp_image_b64']
+        if '_temp_image_ref' in session: del session['_temp_image_ref']
         if '_temp_image_filename' in session: del session['_temp_image_filename']
+        if '_temp_prediction_id' in session: del session['_temp_prediction_id']
 
         # Validações
         if not error_message and not all([health_unit_id, model_used]):
              error_message = "Health unit and AI model are required."
-        if not error_message and not image_base64_to_send:
+        if not error_message and not (image_base64_to_send or prediction_id):
              # Pode acontecer se veio da predição mas falhou em guardar na sessão, ou se não fez upload
              error_message = "Medical image is required (upload or from previous prediction)."
 
@@ -133,12 +146,15 @@ async def add_attendance_page(request):
                 "model_result": model_result_str, # Envia a string JSON ou o que tiver
                 "expected_result": expected_result,
                 "correct_diagnosis": False, # Valor inicial padrão
-                "image_base64": image_base64_to_send,
+                # Com prediction_id a API reaproveita a imagem da predição e a imagem não é reenviada
+                "image_base64": None if prediction_id else image_base64_to_send,
+                "prediction_id": prediction_id,
                 "observation": observation
             }
 
             create_result = await AttendanceService.create_attendance(token, attendance_data)
             if create_result.get("success"):
+                await delete_artifact(image_ref)
                 session['message'] = "Attendance record created successfully"
                 session['message_type'] = "success"
                 # Redireciona para o dashboard do profissional após sucesso
@@ -148,6 +164,11 @@ async def add_attendance_page(request):
 
         # Se deu erro no POST, recria prefilled_data com os dados submetidos para repopular o form
         if error_message:
+             # Mantém a referência da imagem para a próxima tentativa
+             if image_base64_to_send and image_ref:
+                 session['_temp_image_ref'] = image_ref
+                 if filename_to_send: session['_temp_image_filename'] = filename_to_send
+             if prediction_id: session['_temp_prediction_id'] = prediction_id
              prefilled_data = {
                  'health_unit_id': health_unit_id,
                  'model_used': model_used,
@@ -204,42 +225,7 @@ async def add_attendance_page(request):
 
     # Adiciona CSS (mantido como antes)
     content.append(
-        Style("""
-            .page-header { margin-bottom: 1.5rem; }
-            .form-group { margin-bottom: 1.25rem; }
-            .form-group label { display: block; margin-bottom: 0.5rem; font-weight: 500; color: #374151; }
-            .form-group input, .form-group select, .form-group textarea {
-                 width: 100%; padding: 0.6rem 0.75rem; border: 1px solid #d1d5db;
-                 border-radius: 0.375rem; box-shadow: inset 0 1px 2px rgba(0, 0, 0, 0.05);
-                 box-sizing: border-box; font-size: 1rem; line-height: 1.5;
-             }
-             /* Estilo específico para o input de arquivo */
-             .form-group input[type=file] {
-                  padding: 0.4rem; /* Padding menor para input file */
-                  box-shadow: none;
-                  border: 1px dashed #d1d5db; /* Borda tracejada */
-                  background-color: #f9fafb;
-             }
-             .form-group input[type=file]::file-selector-button {
-                  margin-right: 0.8rem;
-                  border: thin solid grey;
-                  background: #eee;
-                  padding: 0.4rem 0.8rem;
-                  border-radius: 0.2rem;
-                  cursor: pointer;
-                  transition: background-color 0.2s;
-             }
-            .form-group input[type=file]::file-selector-button:hover {
-                 background-color: #ddd;
-             }
-            .form-group input:focus, .form-group select:focus, .form-group textarea:focus {
-                  border-color: var(--primary-color, #2563eb); outline: none;
-                  box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.2);
-             }
-            .form-group .btn-secondary { margin-left: 1rem; }
-            .image-preview-container { margin-top: 0.5rem; text-align: center; }
-            .preview-note { font-size: 0.85em; color: #6b7280; text-align: center; margin-top: 0.5rem; }
-        """)
+        stylesheet("css/attendances-add.css")
     )
 
     # *** ALTERADO: Passar user_profile para MainLayout ***
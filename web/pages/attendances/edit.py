@@ -1,5 +1,6 @@
 # web/pages/attendances/edit.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 from components.layout import MainLayout
 from components.ui import Card, Alert, Img # Adicionado Img
 from components.forms import AttendanceForm
@@ -222,22 +223,7 @@ async def edit_attendance_page(request):
 
     # CSS específico para esta página (mantido como antes)
     content.append(
-        Style("""
-            .page-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1.5rem; }
-            .page-actions { display: flex; gap: 0.5rem; }
-            .current-image { text-align: center; margin-bottom: 1rem; }
-            .image-preview-container { margin-top: 1rem; padding: 1rem; background-color: #f8f9fa; border-radius: 0.25rem; display: flex; justify-content: center; }
-            .preview-note { font-size: 0.85em; color: #6b7280; text-align: center; margin-top: 0.5rem; }
-            .diagnosis-result { padding: 0.5rem 0; }
-            .form-group input[type=file] { /* Ajuste para input de arquivo na edição */
-                 padding: 0.4rem; box-shadow: none; border: 1px dashed #d1d5db; background-color: #f9fafb;
-            }
-            .form-group input[type=file]::file-selector-button {
-                 margin-right: 0.8rem; border: thin solid grey; background: #eee; padding: 0.4rem 0.8rem;
-                 border-radius: 0.2rem; cursor: pointer; transition: background-color 0.2s;
-            }
-            .form-group input[type=file]::file-selector-button:hover { background-color: #ddd; }
-        """)
+        stylesheet("css/attendances-edit.css")
     )
 
     # *** ALTERADO: Passar user_profile para MainLayout ***
@@ -1,14 +1,15 @@
 # web/pages/attendances/list.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 # Importar datetime e NotStr
 from datetime import datetime
 from fasthtml.components import NotStr
 # Importar componentes e serviços
 from components.layout import MainLayout
 from components.ui import Card, Table, Alert, Pagination # Pagination está aqui, usaremos
-from services.attendance_service import AttendanceService
-from services.health_units_service import HealthUnitsService
 from services.auth_service import AuthService
+from services.data_loader import get_loader
+from utils.htmx import is_htmx, fragment
 
 # --- Definições dos Ícones SVG (mantidos como antes) ---
 # Ícone de Olho (View) - Exemplo Bootstrap Icons
@@ -33,8 +34,68 @@ delete_icon_svg = """
 """
 # --------------------------------
 
+def _attendance_rows(attendances, health_unit_names, user_profile, user_id):
+    """Monta as linhas (Tr) da tabela de atendimentos."""
+    rows = []
+    for attendance in attendances:
+        attendance_id = attendance.get("id")
+        attendance_date_str = attendance.get("attendance_date", "")
+        attendance_date_formatted = attendance_date_str
+        if isinstance(attendance_date_str, str) and attendance_date_str:
+            try:
+                date_obj = datetime.fromisoformat(attendance_date_str.replace('Z', '+00:00'))
+                attendance_date_formatted = date_obj.strftime("%d/%m/%Y %H:%M")
+            except ValueError: pass
+
+        model_result = attendance.get("model_result", "N/A")
+        correct_diagnosis = attendance.get("correct_diagnosis")
+        # Tenta carregar model_result como JSON para pegar a classe principal (se for TB ou Osteo)
+        try:
+             result_dict = json.loads(model_result) if isinstance(model_result, str) and model_result.startswith('{') else {}
+             display_result = result_dict.get("class_pred", model_result) # Mostra 'class_pred' ou o texto original
+        except:
+             display_result = model_result # Mantém original se não for JSON válido
+
+        diagnosis_display = Span(display_result) # Começa com o resultado
+        if correct_diagnosis is not None:
+             # Ajusta o display se tivermos informação de correção
+             diag_text = "Correct" if correct_diagnosis else "Incorrect"
+             diag_class = "diagnosis-correct" if correct_diagnosis else "diagnosis-incorrect"
+             diagnosis_display = Span(f"{display_result} ", Span(f"({diag_text})", cls=diag_class))
+
+
+        health_unit_id = attendance.get("health_unit_id", "")
+        health_unit_name = health_unit_names.get(health_unit_id, health_unit_id) # Mostra nome ou ID
+
+        cells = [
+            Td(attendance_date_formatted),
+            Td(health_unit_name),
+            Td(attendance.get("model_used", "").capitalize()),
+            Td(diagnosis_display),
+        ]
+
+        # Ações: View para todos (admin/prof), Edit/Delete conforme permissão da API
+        # A lógica exata de quem pode editar/deletar está na API/Serviço, aqui apenas mostramos os botões.
+        # Adicionamos uma verificação básica se o usuário logado é o profissional do atendimento OU admin
+        allow_edit_delete = (user_profile == "professional" and user_id == attendance.get("professional_id")) or AuthService.is_admin(user_profile)
+
+        actions = Td(
+            A(NotStr(view_icon_svg), href=f"/attendances/view/{attendance_id}", cls="btn-icon btn-view", title="View Details"),
+            A(NotStr(edit_icon_svg), href=f"/attendances/edit/{attendance_id}", cls="btn-icon btn-edit", title="Edit Attendance") if allow_edit_delete else "",
+            A(NotStr(delete_icon_svg), hx_post=f"/attendances/delete/{attendance_id}", hx_target=f"#attendance-row-{attendance_id}", hx_swap="outerHTML", hx_confirm="Are you sure you want to delete this attendance record?", cls="btn-icon btn-delete", title="Delete Attendance") if allow_edit_delete else "",
+            cls="actions-cell"
+        )
+        cells.append(actions)
+
+        rows.append(Tr(*cells, id=f"attendance-row-{attendance_id}"))
+    return rows
+
+
 async def attendances_list_page(request):
-    """Renderiza a página de listagem de atendimentos médicos"""
+    """
+    Renderiza a página de listagem de atendimentos médicos.
+    Requisições do HTMX (filtro/paginação) recebem só o bloco #attendances-results.
+    """
     session = request.scope.get("session", {})
     token = session.get('token')
     user_id = session.get('user_id')
@@ -47,6 +108,7 @@ async def attendances_list_page(request):
     per_page = int(query_params.get('per_page', '10')) # Mantém per_page
     health_unit_id_filter = query_params.get('health_unit_id') # Renomeia para evitar conflito
     model_used_filter = query_params.get('model_used') # Renomeia para evitar conflito
+    partial = is_htmx(request)
 
     # Verifica permissões
     # Somente profissional pode adicionar, admin pode ver/filtrar
@@ -64,12 +126,19 @@ async def attendances_list_page(request):
     health_units = []
     attendances = []
     pagination = {}
-    api_error = None
+    api_error = None # Erro do filtro (unidades)
+    results_error = None # Erro da lista de atendimentos
+
+    # Unidades (filtro) e atendimentos são independentes: busca em paralelo.
+    # No fragmento não há filtro: os nomes das unidades vêm do lookup em lote.
+    loader = get_loader(request)
+    health_units_request = None if partial else loader.health_units()
+    attendances_request = loader.attendances(health_unit_id_filter, model_used_filter, page, per_page)
 
-    # Obtém unidades de saúde para o filtro (sempre busca se for admin)
-    if can_view_list:
+    # Obtém unidades de saúde para o filtro
+    if health_units_request is not None:
         try:
-            health_units_result = await HealthUnitsService.get_health_units(token)
+            health_units_result = await health_units_request
             if health_units_result.get("success", False):
                 health_units = health_units_result.get("health_units", [])
             else:
@@ -78,23 +147,61 @@ async def attendances_list_page(request):
         except Exception as e:
             api_error = f"Error loading health units: {e}"
 
-    # Obtém a lista de atendimentos (somente se for admin)
-    if can_view_list:
-        try:
-            attendance_result = await AttendanceService.get_attendances(
-                token, health_unit_id_filter, model_used_filter, page, per_page
-            )
-            if attendance_result.get("success", False):
-                attendances = attendance_result.get("attendances", [])
-                pagination = attendance_result.get("pagination", {})
-            else:
-                 # Guarda erro da busca de atendimentos
-                 api_error = attendance_result.get("message", "Error loading attendance records")
-        except Exception as e:
-            api_error = f"Error loading attendances: {e}"
+    # Obtém a lista de atendimentos
+    try:
+        attendance_result = await attendances_request
+        if attendance_result.get("success", False):
+            attendances = attendance_result.get("attendances", [])
+            pagination = attendance_result.get("pagination", {})
+        else:
+             # Guarda erro da busca de atendimentos
+             results_error = attendance_result.get("message", "Error loading attendance records")
+    except Exception as e:
+        results_error = f"Error loading attendances: {e}"
     # ---------------------
 
     page_title = "Medical Attendances"
+
+    # --- Bloco de resultados (tabela + paginação), substituído pelo HTMX ---
+    if results_error:
+        results = Alert(results_error, type="error")
+    elif attendances:
+        # Dicionário para lookup rápido de nomes de unidade; unidades fora do filtro
+        # são resolvidas de uma vez pelo loader
+        health_unit_names = {unit["id"]: unit["name"] for unit in health_units}
+        missing_unit_ids = [a.get("health_unit_id") for a in attendances if a.get("health_unit_id") not in health_unit_names]
+        if missing_unit_ids:
+            for unit_id, unit in (await loader.health_units_by_id(missing_unit_ids)).items():
+                if unit: health_unit_names[unit_id] = unit.get("name", unit_id)
+
+        rows = _attendance_rows(attendances, health_unit_names, user_profile, user_id)
+        headers = ["Date", "Health Unit", "AI Model", "Diagnosis Result", "Actions"]
+        results = Card(
+            Div( # Div para container da tabela responsiva
+                 Table(headers, rows, id="attendances-table"),
+                 cls="table-container"
+            ),
+            # Paginação mantém os filtros e navega via HTMX
+            Pagination(
+                page=pagination.get("current_page", 1),
+                total_pages=pagination.get("total_pages", 1),
+                base_url="/attendances",
+                params={"health_unit_id": health_unit_id_filter, "model_used": model_used_filter,
+                        "per_page": per_page if per_page != 10 else None},
+                target="#attendances-results"
+            ),
+            title=f"Attendance Records ({pagination.get('total_count', 0)})"
+        )
+    else: # Não há atendimentos para os filtros atuais
+        results = Card(
+            P("No attendance records found. Please adjust filters or wait for new records.", cls="no-data"),
+            title="Attendance Records"
+        )
+    results = Div(results, id="attendances-results")
+
+    if partial:
+        return fragment(page_title, results)
+
     content = []
 
     # Adiciona notificação de erro da API ou mensagem da sessão
@@ -118,8 +225,9 @@ async def attendances_list_page(request):
         )
     )
 
-    # Seção de filtros (só para admins)
-    if can_view_list and health_units: # Mostra filtro se for admin e tiver unidades
+    # Seção de filtros (mostra se houver unidades). Com HTMX, troca só os resultados
+    # e atualiza a URL; sem JS, o form GET continua funcionando.
+    if health_units:
         filter_form = Form(
             Div(
                 Div(
@@ -141,6 +249,7 @@ async def attendances_list_page(request):
                         Option("Tuberculosis", value="tuberculosis", selected=model_used_filter == "tuberculosis"),
                         Option("Osteoporosis", value="osteoporosis", selected=model_used_filter == "osteoporosis"),
                         Option("Breast", value="breast", selected=model_used_filter == "breast"),
+                        Option("Screening", value="screening", selected=model_used_filter == "screening"),
                         id="model_used", name="model_used" # Nome do parâmetro da query
                     ),
                     cls="form-group"
@@ -150,6 +259,11 @@ async def attendances_list_page(request):
             ),
             method="get", # Filtro usa GET
             action="/attendances", # Submete para a própria página de lista
+            hx_get="/attendances",
+            hx_trigger="submit, change",
+            hx_target="#attendances-results",
+            hx_swap="outerHTML",
+            hx_push_url="true",
             cls="filter-form"
         )
         content.append(
@@ -160,134 +274,13 @@ async def attendances_list_page(request):
             )
         )
 
-    # Tabela de Atendimentos (se busca foi sucesso e for admin)
-    if can_view_list and not api_error: # Só mostra tabela se for admin e não deu erro na busca
-        if attendances:
-            rows = []
-            for attendance in attendances:
-                attendance_id = attendance.get("id")
-                attendance_date_str = attendance.get("attendance_date", "")
-                attendance_date_formatted = attendance_date_str
-                if isinstance(attendance_date_str, str) and attendance_date_str:
-                    try:
-                        date_obj = datetime.fromisoformat(attendance_date_str.replace('Z', '+00:00'))
-                        attendance_date_formatted = date_obj.strftime("%d/%m/%Y %H:%M")
-                    except ValueError: pass
-
-                model_result = attendance.get("model_result", "N/A")
-                correct_diagnosis = attendance.get("correct_diagnosis")
-                # Tenta carregar model_result como JSON para pegar a classe principal (se for TB ou Osteo)
-                try:
-                     result_dict = json.loads(model_result) if isinstance(model_result, str) and model_result.startswith('{') else {}
-                     display_result = result_dict.get("class_pred", model_result) # Mostra 'class_pred' ou o texto original
-                except:
-                     display_result = model_result # Mantém original se não for JSON válido
-
-                diagnosis_display = Span(display_result) # Começa com o resultado
-                if correct_diagnosis is not None:
-                     # Ajusta o display se tivermos informação de correção
-                     diag_text = "Correct" if correct_diagnosis else "Incorrect"
-                     diag_class = "diagnosis-correct" if correct_diagnosis else "diagnosis-incorrect"
-                     diagnosis_display = Span(f"{display_result} ", Span(f"({diag_text})", cls=diag_class))
-
-
-                health_unit_id = attendance.get("health_unit_id", "")
-                # Cria um dicionário para lookup rápido de nomes de unidade
-                health_unit_names = {unit["id"]: unit["name"] for unit in health_units}
-                health_unit_name = health_unit_names.get(health_unit_id, health_unit_id) # Mostra nome ou ID
-
-                cells = [
-                    Td(attendance_date_formatted),
-                    Td(health_unit_name),
-                    Td(attendance.get("model_used", "").capitalize()),
-                    Td(diagnosis_display),
-                ]
-
-                # Ações: View para todos (admin/prof), Edit/Delete conforme permissão da API
-                # A lógica exata de quem pode editar/deletar está na API/Serviço, aqui apenas mostramos os botões.
-                # Adicionamos uma verificação básica se o usuário logado é o profissional do atendimento OU admin
-                allow_edit_delete = (user_profile == "professional" and user_id == attendance.get("professional_id")) or AuthService.is_admin(user_profile)
-
-                actions = Td(
-                    A(NotStr(view_icon_svg), href=f"/attendances/view/{attendance_id}", cls="btn-icon btn-view", title="View Details"),
-                    A(NotStr(edit_icon_svg), href=f"/attendances/edit/{attendance_id}", cls="btn-icon btn-edit", title="Edit Attendance") if allow_edit_delete else "",
-                    A(NotStr(delete_icon_svg), hx_post=f"/attendances/delete/{attendance_id}", hx_target=f"#attendance-row-{attendance_id}", hx_swap="outerHTML", hx_confirm="Are you sure you want to delete this attendance record?", cls="btn-icon btn-delete", title="Delete Attendance") if allow_edit_delete else "",
-                    cls="actions-cell"
-                )
-                cells.append(actions)
-
-                rows.append(Tr(*cells, id=f"attendance-row-{attendance_id}"))
-
-            headers = ["Date", "Health Unit", "AI Model", "Diagnosis Result", "Actions"]
-            content.append(
-                Card(
-                    Div( # Div para container da tabela responsiva
-                         Table(headers, rows, id="attendances-table"),
-                         cls="table-container"
-                    ),
-                    # Adiciona Paginação
-                    Pagination(
-                        page=pagination.get("current_page", 1),
-                        total_pages=pagination.get("total_pages", 1),
-                        base_url="/attendances" # Ajuste se usar filtros na URL base da paginação
-                    ) if pagination.get("total_pages", 1) > 1 else "", # Só mostra paginação se tiver mais de 1 página
-                    title=f"Attendance Records ({pagination.get('total_count', 0)})"
-                )
-            )
-        elif can_view_list: # Se for admin e não houver atendimentos
-             content.append(
-                Card(
-                    P("No attendance records found. Please adjust filters or wait for new records.", cls="no-data"),
-                    title="Attendance Records"
-                )
-            )
-    # Nota: Se não for admin, a tabela nem é renderizada.
+    # Tabela de Atendimentos
+    content.append(results)
 
     # CSS (Combinado e ajustado)
     content.append(
-        Style("""
-            /* --- Estilos Gerais da Página --- */
-            .page-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1.5rem; border-bottom: 1px solid var(--border-color, #e5e7eb); padding-bottom: 1rem; }
-            .page-header h1 { margin-bottom: 0; }
-            .page-actions .btn { padding: 0.6rem 1.2rem; font-weight: 500; }
-            .no-data { text-align: center; padding: 2rem; color: #6b7280; }
-
-            /* --- Estilos Filtros --- */
-            .filter-card { margin-bottom: 1.5rem; background-color: #f9fafb; }
-            .filter-form .filter-inputs { display: flex; flex-wrap: wrap; gap: 1.5rem; align-items: flex-end; }
-            .filter-form .form-group { flex: 1; min-width: 200px; margin-bottom: 0; /* Remove margem inferior dentro do flex */ }
-            .filter-form label { font-size: 0.9em; margin-bottom: 0.3rem; color: #4b5563; }
-            .filter-form select { padding: 0.5rem; font-size: 0.95rem; }
-            .filter-form .btn-secondary { padding: 0.55rem 1rem; font-size: 0.95rem; margin-left: 1rem; /* Espaço antes do botão */}
-
-            /* --- Estilos Tabela e Ações --- */
-            .table-container { overflow-x: auto; }
-            table td { vertical-align: middle; }
-            .actions-cell { display: flex; gap: 0.75rem; align-items: center; justify-content: flex-start; /* Alinha à esquerda */ white-space: nowrap; padding-left: 0.5rem; /* Pequeno espaço à esquerda */}
-
-            /* --- Estilos Botões Ícone --- */
-            .btn-icon { display: inline-flex; align-items: center; justify-content: center; padding: 0.3rem; border-radius: 50%; border: 1px solid transparent; cursor: pointer; transition: all 0.2s; }
-            .btn-icon svg { width: 1em; height: 1em; vertical-align: middle; }
-            .btn-view { color: #0e7490; border-color: #a5f3fc; } /* Ciano */
-            .btn-view:hover { background-color: #ecfeff; border-color: #67e8f9; transform: scale(1.1); }
-            .btn-edit { color: #2563eb; border-color: #bfdbfe; } /* Azul */
-            .btn-edit:hover { background-color: #eff6ff; border-color: #93c5fd; transform: scale(1.1); }
-            .btn-delete { color: #dc2626; border-color: #fecaca; } /* Vermelho */
-            .btn-delete:hover { background-color: #fee2e2; border-color: #fca5a5; transform: scale(1.1); }
-
-            /* --- Estilos Status/Diagnóstico --- */
-            .diagnosis-correct { color: #059669; font-weight: 500; background-color: #d1fae5; padding: 0.2em 0.4em; border-radius: 0.25rem; font-size: 0.85em; margin-left: 0.3rem; vertical-align: middle; }
-            .diagnosis-incorrect { color: #b91c1c; font-weight: 500; background-color: #fee2e2; padding: 0.2em 0.4em; border-radius: 0.25rem; font-size: 0.85em; margin-left: 0.3rem; vertical-align: middle;}
-
-             /* --- Estilos Paginação --- */
-            .pagination { display: flex; list-style: none; padding: 0; margin: 1.5rem 0 0.5rem 0; justify-content: center; }
-            .pagination li { margin: 0 0.25rem; }
-            .pagination li a { display: block; padding: 0.5rem 0.75rem; border: 1px solid #e5e7eb; border-radius: 0.25rem; text-decoration: none; color: #374151; background-color: white; }
-            .pagination li a:hover { background-color: #f9fafb; }
-            .pagination li.active a { background-color: var(--primary-color, #2563eb); color: white; border-color: var(--primary-color, #2563eb); font-weight: 500; }
-            .pagination li a.disabled { color: #9ca3af; pointer-events: none; background-color: #f9fafb; }
-        """)
+        stylesheet("css/attendances-list.css")
     )
 
     # *** ALTERADO: Passar user_profile para MainLayout ***
-    return MainLayout(page_title, *content, active_page="attendances", user_profile=user_profile)
\ No newline at end of file
+    return MainLayout(page_title, *content, active_page="attendances", user_profile=user_profile)
@@ -1,11 +1,11 @@
 # web/pages/attendances/view.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 from components.layout import MainLayout
 from components.ui import Card, Alert, Img # Adicionado Img
 from services.attendance_service import AttendanceService
-from services.users_service import UsersService
-from services.health_units_service import HealthUnitsService
 from services.auth_service import AuthService
+from services.data_loader import get_loader
 from datetime import datetime
 import json # Para formatar o resultado
 
@@ -51,12 +51,14 @@ async def view_attendance_page(request):
     # ---------------------------------------
 
 
-    # Obtém informações adicionais: profissional e unidade de saúde
-    professional_result = await UsersService.get_user_by_id(token, attendance.get("professional_id", ""))
-    professional = professional_result.get("user", {}) if professional_result.get("success", False) else {}
-
-    health_unit_result = await HealthUnitsService.get_health_unit_by_id(token, attendance.get("health_unit_id", ""))
-    health_unit = health_unit_result.get("health_unit", {}) if health_unit_result.get("success", False) else {}
+    # Obtém informações adicionais: profissional e unidade de saúde (em paralelo)
+    loader = get_loader(request)
+    professional, health_unit = await loader.gather(
+        loader.user(attendance.get("professional_id", "")),
+        loader.health_unit(attendance.get("health_unit_id", ""))
+    )
+    professional = professional or {}
+    health_unit = health_unit or {}
 
     # Verifica permissões para editar e excluir (pode ser diferente da visualização)
     can_edit_delete = AuthService.is_admin(user_profile) or attendance.get("professional_id") == user_id
@@ -198,22 +200,7 @@ async def view_attendance_page(request):
 
     # CSS específico para esta página (mantido como antes, com ajustes para lista de boxes)
     content.append(
-        Style("""
-            .page-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1.5rem; }
-            .page-actions { display: flex; gap: 0.5rem; }
-            .info-container { display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 2rem; }
-            .basic-info p, .diagnosis-info p { margin-bottom: 0.5rem; } /* Espaçamento entre parágrafos */
-            .image-container { display: flex; justify-content: center; padding: 1rem; background-color: #f8f9fa; border-radius: 0.25rem; }
-            .medical-image { max-width: 100%; max-height: 500px; object-fit: contain; }
-            .badge { display: inline-block; padding: 0.25rem 0.6rem; border-radius: 0.25rem; font-weight: 500; font-size: 0.875rem; line-height: 1.2; vertical-align: middle;}
-            .badge-success { background-color: #d1fae5; color: #065f46; }
-            .badge-error { background-color: #fee2e2; color: #b91c1c; }
-            .badge-secondary { background-color: #e5e7eb; color: #4b5563; }
-            .bounding-boxes-info ul.boxes-list { list-style: none; padding-left: 0; margin-top: 1rem; }
-            .bounding-boxes-info li { margin-bottom: 1rem; padding: 1rem; background-color: #f9fafb; border-radius: 4px; border: 1px solid #eee; }
-            .bounding-boxes-info li p { margin-bottom: 0.3rem; font-size: 0.9rem;}
-            .observations-text { white-space: pre-wrap; line-height: 1.6; background-color: #fdfdff; padding: 1rem; border-radius: 4px; border: 1px solid #f0f0f5; }
-        """)
+        stylesheet("css/attendances-view.css")
     )
 
     # *** ALTERADO: Passar user_profile para MainLayout ***
@@ -1,5 +1,6 @@
 # web/pages/dashboard/dashboard.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 # Importações corrigidas/adicionadas
 from components.layout import MainLayout
 from components.ui import Card, Alert # Importa Alert junto com Card
@@ -130,65 +131,7 @@ async def dashboard_page(request):
 
     # Adiciona CSS
     content.append(
-        Style("""
-            .dashboard-header { margin-bottom: 2rem; }
-            .dashboard-grid {
-                display: grid;
-                grid-template-columns: repeat(auto-fill, minmax(280px, 1fr));
-                gap: 1.5rem;
-            }
-            .grid-item { /* Para garantir que os cards de admin fiquem no grid */
-                 /* Nenhum estilo específico necessário se o card já estiver ok */
-            }
-            .dashboard-card { /* Estilo para cards de admin (stats) */
-                min-height: 180px;
-                display: flex;
-                flex-direction: column;
-                background-color: white; /* Garante fundo branco */
-                padding: 1.5rem; /* Padding interno */
-                border-radius: 0.5rem; /* Bordas arredondadas */
-                box-shadow: 0 1px 3px rgba(0,0,0,0.1); /* Sombra */
-            }
-             .dashboard-card h3 {
-                 margin-top: 0; /* Remove margem do título */
-                 margin-bottom: 1rem;
-                 font-size: 1.1rem;
-                 color: #4b5563; /* Cor do título */
-             }
-            .stat-number { font-size: 2.2rem; font-weight: bold; color: var(--primary-color, #2563eb); }
-            .stat-main { margin-bottom: 1rem; }
-            .prediction-card { /* Estilo para cards de profissional (links) */
-                text-align: center;
-                transition: transform 0.2s ease-in-out, box-shadow 0.2s ease-in-out;
-                height: 100%;
-                display: flex;
-                flex-direction: column;
-                justify-content: center;
-                 background-color: white; /* Garante fundo branco */
-                 padding: 2rem 1.5rem; /* Mais padding */
-                 border-radius: 0.5rem;
-                 box-shadow: 0 1px 3px rgba(0,0,0,0.1);
-            }
-            .prediction-card:hover {
-                transform: translateY(-5px);
-                box-shadow: 0 6px 12px rgba(0, 0, 0, 0.1); /* Sombra maior no hover */
-            }
-            .prediction-card h3 {
-                 margin-top: 0.5rem;
-                 color: var(--primary-color, #2563eb);
-                 font-size: 1.2rem;
-            }
-            .card-description {
-                font-size: 0.9rem;
-                color: #6b7280;
-                margin-top: 0.5rem;
-                 line-height: 1.4;
-            }
-            .dashboard-grid a { /* Remove sublinhado dos cards clicáveis */
-                 text-decoration: none;
-                 color: inherit;
-            }
-        """)
+        stylesheet("css/dashboard.css")
     )
 
     # Renderiza o layout principal, passando o perfil para a navegação condicional
@@ -1,5 +1,6 @@
 # web/pages/health_units/add.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 from components.layout import MainLayout
 from components.ui import Card, Alert
 from components.forms import HealthUnitForm
@@ -143,51 +144,7 @@ async def add_health_unit_page(request):
 
     # Adiciona o CSS específico para esta página (mantido da versão anterior)
     content.append(
-        Style("""
-            .page-header {
-                margin-bottom: 1.5rem;
-            }
-            .info-card {
-                margin-top: 1.5rem;
-                background-color: #f8fafc; /* Um cinza bem claro */
-            }
-            .guidelines {
-                padding: 0.5rem 0;
-                font-size: 0.9rem;
-                color: #4b5563; /* Cinza um pouco mais escuro para texto */
-            }
-            .guidelines ul {
-                margin-left: 1.5rem;
-                margin-top: 0.5rem;
-                margin-bottom: 0.5rem;
-                list-style-type: disc; /* Estilo de marcador padrão */
-            }
-            .guidelines li {
-                margin-bottom: 0.5rem;
-            }
-            /* Estilos adicionais para melhorar a aparência do form-group, se necessário */
-            .form-group {
-                 margin-bottom: 1rem; /* Espaçamento entre grupos de formulário */
-            }
-            .form-group label {
-                display: block;
-                margin-bottom: 0.5rem; /* Espaço abaixo do label */
-                font-weight: 500; /* Peso da fonte para labels */
-            }
-            /* Ajusta inputs e selects para ocupar a largura e ter uma aparência consistente */
-            .form-group input, .form-group select {
-                width: 100%; /* Ocupa toda a largura disponível */
-                padding: 0.6rem; /* Preenchimento interno */
-                border: 1px solid #d1d5db; /* Cor da borda */
-                border-radius: 0.375rem; /* Bordas arredondadas */
-                box-shadow: inset 0 1px 2px rgba(0, 0, 0, 0.05); /* Sombra interna sutil */
-                box-sizing: border-box; /* Garante que padding não aumente a largura total */
-            }
-            /* Estilo para o botão Cancelar */
-            .btn-secondary {
-                 margin-left: 1rem; /* Espaço à esquerda do botão Cancelar */
-            }
-        """)
+        stylesheet("css/health-units-add.css")
     )
 
     # *** ALTERADO: Passar user_profile para MainLayout ***
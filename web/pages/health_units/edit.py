@@ -1,5 +1,6 @@
 # web/pages/health_units/edit.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 from components.layout import MainLayout
 from components.ui import Card, Alert
 from components.forms import HealthUnitForm # Usaremos o mesmo form de 'add'
@@ -136,50 +137,7 @@ async def edit_health_unit_page(request):
 
     # Adiciona o CSS (mantido como antes)
     content.append(
-        Style("""
-            .page-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 1.5rem;
-                border-bottom: 1px solid var(--border-color, #e5e7eb);
-                padding-bottom: 1rem;
-            }
-             .page-header h1 { margin-bottom: 0; }
-            .page-actions-header .btn { /* Estilo para o botão Voltar */
-                 padding: 0.5rem 1rem;
-                 font-size: 0.9rem;
-            }
-            /* Estilos gerais do formulário (reutilizados) */
-            .form-group {
-                 margin-bottom: 1.25rem; /* Aumenta um pouco o espaço */
-            }
-            .form-group label {
-                display: block;
-                margin-bottom: 0.5rem;
-                font-weight: 500;
-                color: #374151; /* Cinza um pouco mais escuro */
-            }
-            .form-group input, .form-group select, .form-group textarea {
-                width: 100%;
-                padding: 0.6rem 0.75rem; /* Ajusta padding */
-                border: 1px solid #d1d5db;
-                border-radius: 0.375rem;
-                box-shadow: inset 0 1px 2px rgba(0, 0, 0, 0.05);
-                box-sizing: border-box;
-                font-size: 1rem;
-                line-height: 1.5; /* Melhora leitura em textarea */
-            }
-             .form-group input:focus, .form-group select:focus, .form-group textarea:focus {
-                 border-color: var(--primary-color, #2563eb); /* Destaca borda no foco */
-                 outline: none; /* Remove outline padrão */
-                 box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.2); /* Adiciona sombra de foco */
-            }
-            /* Estilo para o botão Cancelar no final do form */
-            .form-group .btn-secondary {
-                 margin-left: 1rem;
-            }
-        """)
+        stylesheet("css/health-units-edit.css")
     )
 
     # *** ALTERADO: Passar current_user_profile para MainLayout ***
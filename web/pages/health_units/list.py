@@ -1,10 +1,12 @@
 # web/pages/health_units/list.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 from datetime import datetime
 from components.layout import MainLayout
-from components.ui import Card, Table, Alert # Removido Pagination se não estiver usando/implementado
+from components.ui import Card, Table, Alert, Pagination
 from services.health_units_service import HealthUnitsService
 from services.auth_service import AuthService
+from utils.htmx import is_htmx, fragment
 # Para usar SVG embutido precisamos do NotStr
 from fasthtml.components import NotStr
 
@@ -25,14 +27,29 @@ delete_icon_svg = """
 """
 # --------------------------------
 
+PER_PAGE = 20 # A API devolve a lista completa; a paginação é feita aqui
+
+
 async def health_units_list_page(request):
-    """Renderiza a página de listagem de unidades de saúde com ícones de ação"""
+    """
+    Renderiza a página de listagem de unidades de saúde com ícones de ação.
+    Requisições do HTMX (filtro/paginação) recebem só o bloco #health-units-results.
+    """
     session = request.scope.get("session", {})
     token = session.get('token')
     user_id = session.get('user_id')
     # *** ADICIONADO: Obter user_profile da sessão ***
     user_profile = session.get('user_profile')
 
+    # Filtro e página da query string
+    query_params = request.query_params
+    status_filter = query_params.get('status')
+    try:
+        page = max(1, int(query_params.get('page', '1')))
+    except ValueError:
+        page = 1
+    partial = is_htmx(request)
+
     # Verifica se o usuário pode gerenciar unidades de saúde
     can_manage = AuthService.is_admin(user_profile)
     is_general_admin = (user_profile == "general_administrator")
@@ -41,35 +58,21 @@ async def health_units_list_page(request):
     result = await HealthUnitsService.get_health_units(token)
 
     page_title = "Health Units Management"
-    content = []
-
-    # Adiciona notificação caso haja uma mensagem na sessão
-    if 'message' in session:
-        message = session.pop('message')
-        message_type = session.pop('message_type', 'success')
-        content.append(Alert(message, type=message_type))
-
-    # Cabeçalho da página
-    content.append(
-        Div(
-            H1(page_title),
-            Div(
-                # Botão "Add Health Unit" continua com texto
-                A("Add Health Unit", href="/health-units/add", cls="btn btn-primary"), # Usei btn-primary para destaque
-                cls="page-actions"
-            ) if can_manage else "",
-            cls="page-header"
-        )
-    )
 
-    # Conteúdo principal
+    # --- Bloco de resultados (tabela + paginação), substituído pelo HTMX ---
     if result["success"]:
         health_units = result["health_units"]
-
-        if health_units:
+        # Aplica o filtro e recorta a página atual
+        if status_filter:
+            health_units = [u for u in health_units if u.get("status") == status_filter]
+        total_pages = max(1, (len(health_units) + PER_PAGE - 1) // PER_PAGE)
+        page = min(page, total_pages)
+        page_units = health_units[(page - 1) * PER_PAGE:page * PER_PAGE]
+
+        if page_units:
             # Prepara as linhas da tabela
             rows = []
-            for unit in health_units:
+            for unit in page_units:
                 unit_id = unit.get("id") # ID da unidade atual
                 # Formata a data (opcional, mas recomendado)
                 created_at_str = unit.get("created_at", "")
@@ -126,120 +129,93 @@ async def health_units_list_page(request):
             headers = ["Name", "CNPJ", "Status", "Created At", "Actions"] # Adiciona cabeçalho "Actions"
 
             # Cria a tabela
-            content.append(
-                Card(
-                    Table(headers, rows, id="health-units-table"), # Componente Table estilizado
-                    title=f"Health Units List ({len(health_units)})"
-                )
+            results = Card(
+                Table(headers, rows, id="health-units-table"), # Componente Table estilizado
+                Pagination(
+                    page=page,
+                    total_pages=total_pages,
+                    base_url="/health-units",
+                    params={"status": status_filter},
+                    target="#health-units-results"
+                ),
+                title=f"Health Units List ({len(health_units)})"
             )
         else:
-            content.append(
-                Card(
-                    P("No health units found.", cls="no-data"),
-                    title="Health Units List"
-                )
+            results = Card(
+                P("No health units found.", cls="no-data"),
+                title="Health Units List"
             )
     else:
+        results = Card(
+            Alert(result.get("message", "Error loading health units"), type="error"),
+            title="Health Units List"
+        )
+    results = Div(results, id="health-units-results")
+
+    if partial:
+        return fragment(page_title, results)
+
+    content = []
+
+    # Adiciona notificação caso haja uma mensagem na sessão
+    if 'message' in session:
+        message = session.pop('message')
+        message_type = session.pop('message_type', 'success')
+        content.append(Alert(message, type=message_type))
+
+    # Cabeçalho da página
+    content.append(
+        Div(
+            H1(page_title),
+            Div(
+                # Botão "Add Health Unit" continua com texto
+                A("Add Health Unit", href="/health-units/add", cls="btn btn-primary"), # Usei btn-primary para destaque
+                cls="page-actions"
+            ) if can_manage else "",
+            cls="page-header"
+        )
+    )
+
+    # Filtro (HTMX troca só os resultados e atualiza a URL; sem JS, GET comum)
+    if result["success"]:
         content.append(
             Card(
-                Alert(result.get("message", "Error loading health units"), type="error"),
-                title="Health Units List"
+                Form(
+                    Div(
+                        Div(
+                            Label("Status", For="status"),
+                            Select(
+                                Option("All", value=""),
+                                Option("Active", value="active", selected=status_filter == "active"),
+                                Option("Inactive", value="inactive", selected=status_filter == "inactive"),
+                                id="status", name="status"
+                            ),
+                            cls="form-group"
+                        ),
+                        Button("Filter", type="submit", cls="btn btn-secondary"),
+                        cls="filter-inputs"
+                    ),
+                    method="get",
+                    action="/health-units",
+                    hx_get="/health-units",
+                    hx_trigger="submit, change",
+                    hx_target="#health-units-results",
+                    hx_swap="outerHTML",
+                    hx_push_url="true",
+                    cls="filter-form"
+                ),
+                title="Filter Health Units",
+                cls="filter-card"
             )
         )
 
+    # Conteúdo principal
+    content.append(results)
+
     # Adiciona CSS específico da página (mantido como antes)
     content.append(
-        Style("""
-            .page-header {
-                display: flex;
-                justify-content: space-between;
-                align-items: center;
-                margin-bottom: 1.5rem;
-                border-bottom: 1px solid var(--border-color, #e5e7eb); /* Adiciona linha separadora */
-                padding-bottom: 1rem;
-            }
-            .page-header h1 {
-                 margin-bottom: 0; /* Remove margem inferior do H1 */
-            }
-            .page-actions .btn { /* Estilo para o botão 'Add Health Unit' */
-                padding: 0.6rem 1.2rem; /* Aumenta um pouco o padding */
-                font-weight: 500;
-            }
-            .no-data {
-                text-align: center;
-                padding: 2rem;
-                color: #6b7280;
-            }
-            .table-container { /* Garante que a tabela seja responsiva */
-                overflow-x: auto;
-            }
-            /* Estilos para Célula de Ações */
-            .actions-cell {
-                display: flex;
-                gap: 0.75rem; /* Espaço entre os ícones */
-                align-items: center;
-                justify-content: center; /* Centraliza os ícones na célula */
-                white-space: nowrap; /* Impede que os ícones quebrem linha */
-            }
-            /* Estilos para Botões de Ícone */
-            .btn-icon {
-                display: inline-flex; /* Para alinhar o SVG corretamente */
-                align-items: center;
-                justify-content: center;
-                padding: 0.3rem; /* Padding pequeno ao redor do ícone */
-                border-radius: 50%; /* Faz o fundo redondo */
-                border: 1px solid transparent; /* Borda inicial transparente */
-                cursor: pointer;
-                transition: background-color 0.2s, border-color 0.2s, transform 0.1s;
-            }
-            .btn-icon svg {
-                width: 1em; /* Tamanho do ícone relativo ao font-size */
-                height: 1em;
-                vertical-align: middle; /* Alinha o SVG verticalmente */
-            }
-            /* Cores e Hover - Editar */
-            .btn-edit {
-                color: #2563eb; /* Azul (cor primária) */
-                border-color: #bfdbfe; /* Borda azul clara */
-            }
-            .btn-edit:hover {
-                background-color: #eff6ff; /* Fundo azul muito claro no hover */
-                border-color: #93c5fd;
-                transform: scale(1.1); /* Efeito leve de zoom */
-            }
-             /* Cores e Hover - Deletar */
-            .btn-delete {
-                color: #dc2626; /* Vermelho (cor de perigo) */
-                border-color: #fecaca; /* Borda vermelha clara */
-            }
-            .btn-delete:hover {
-                background-color: #fee2e2; /* Fundo vermelho muito claro no hover */
-                border-color: #fca5a5;
-                transform: scale(1.1); /* Efeito leve de zoom */
-            }
-            /* Estilos para o Status */
-            .status-active {
-                color: #059669; /* Verde escuro */
-                font-weight: 500;
-                background-color: #d1fae5; /* Fundo verde claro */
-                padding: 0.2em 0.6em;
-                border-radius: 0.25rem;
-                display: inline-block; /* Para o background funcionar */
-            }
-            .status-inactive {
-                color: #71717a; /* Cinza escuro */
-                font-weight: 500;
-                background-color: #f4f4f5; /* Fundo cinza claro */
-                padding: 0.2em 0.6em;
-                border-radius: 0.25rem;
-                display: inline-block; /* Para o background funcionar */
-            }
-            /* Garante alinhamento vertical nas células da tabela */
-            table td {
-                vertical-align: middle;
-            }
-        """)
+        stylesheet("css/health-units-list.css")
     )
 
     # *** ALTERADO: Passar user_profile para MainLayout ***
-    return MainLayout(page_title, *content, active_page="health-units", user_profile=user_profile)
\ No newline at end of file
+    return MainLayout(page_title, *content, active_page="health-units", user_profile=user_profile)
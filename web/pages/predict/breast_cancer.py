@@ -1,14 +1,17 @@
 # web/pages/predict/breast_cancer.py
 from fasthtml.common import *
+from utils.assets import stylesheet, script
 from components.layout import MainLayout
-from components.ui import Card, Alert, Img
+from components.ui import Card, Alert, Img, DetectionOverlay
+from components.forms import ImageUploadField
 from services.prediction_service import PredictionService
 from services.auth_service import AuthService
 # --- Importa a função de HISTOGRAMA ---
 from utils.plotting import generate_confidence_histogram
 # -------------------------------------
-import json, base64, io
-from PIL import Image, UnidentifiedImageError
+import json
+from utils.session_store import save_artifact
+from services.upload_proxy import StreamedUpload, UploadError
 
 async def prediction_breast_cancer_page(request):
     session = request.scope.get("session", {})
@@ -23,36 +26,45 @@ async def prediction_breast_cancer_page(request):
     error_message = None
     prediction_data = None
     original_filename = None
-    chart_base64 = None # Agora guarda o HISTOGRAMA
+    chart_svg = None # Agora guarda o HISTOGRAMA
+    image_to_preview_b64 = None
 
     if request.method == "POST":
-        form_data = await request.form()
-        uploaded_file = form_data.get('image_file')
-        if uploaded_file and uploaded_file.filename:
-             if uploaded_file.content_type not in ["image/jpeg", "image/png", "image/gif", "image/bmp"]: error_message = "Invalid file type."
+        # O arquivo é repassado à API em streaming, enquanto o navegador ainda envia
+        upload = None
+        try:
+            upload = await StreamedUpload.open(request, 'image_file')
+        except UploadError as upload_err:
+            error_message = str(upload_err)
+        if upload and upload.filename:
+             if upload.content_type not in ["image/jpeg", "image/png", "image/gif", "image/bmp"]: error_message = "Invalid file type."
              else:
-                 original_filename = uploaded_file.filename
-                 file_content = await uploaded_file.read()
-                 if not file_content: error_message = "Uploaded file is empty."
-                 else:
-                     result = await PredictionService.predict_breast_cancer(token, file_content, original_filename)
-                     if result.get("success"):
-                         prediction_data = result.get("data")
-                         if prediction_data:
-                             bounding_boxes = prediction_data.get('bounding_boxes', [])
-                             # --- Gera HISTOGRAMA de Confiança ---
-                             if bounding_boxes:
-                                 try:
-                                     # Chama a nova função de histograma
-                                     chart_base64 = generate_confidence_histogram(bounding_boxes, title="Confidence Distribution")
-                                     print("Histograma de confiança (Mama) gerado.")
-                                 except Exception as plot_err:
-                                     print(f"Erro ao gerar histograma de confiança (Mama): {plot_err}")
-                             # ------------------------------------
-                             session['last_prediction'] = {'model_used':'breast','model_result':json.dumps(bounding_boxes),'image_filename':original_filename,'image_base64':base64.b64encode(file_content).decode('utf-8')}
-                         else: error_message = "Detection successful but results incomplete."
-                     else: error_message = result.get("message", "Detection failed.")
-        else: error_message = "No image file uploaded."
+                 original_filename = upload.filename
+                 # Só caixas e scores: a sobreposição é desenhada na página (SVG) sobre a miniatura.
+                 # O perfil vai explícito: é o mesmo cujo limite foi usado para reduzir a imagem no navegador
+                 detection_profile, _ = await PredictionService.get_breast_upload_profile(token)
+                 result = await PredictionService.predict_breast_cancer(token, upload, original_filename, persist=True, annotated=False, profile=detection_profile)
+                 if result.get("success"):
+                     print(f"Upload (Mama) repassado: {upload.size} bytes, sha256={upload.sha256}")
+                     prediction_data = result.get("data")
+                     if prediction_data:
+                         bounding_boxes = prediction_data.get('bounding_boxes', [])
+                         # --- Gera HISTOGRAMA de Confiança ---
+                         if bounding_boxes:
+                             try:
+                                 # Chama a nova função de histograma
+                                 chart_svg = generate_confidence_histogram(bounding_boxes, title="Confidence Distribution")
+                                 print("Histograma de confiança (Mama) gerado.")
+                             except Exception as plot_err:
+                                 print(f"Erro ao gerar histograma de confiança (Mama): {plot_err}")
+                         # ------------------------------------
+                         # A imagem original fica na API (prediction_id); para o formulário basta a miniatura
+                         image_to_preview_b64 = await upload.thumbnail_b64()
+                         session['last_prediction'] = {'model_used':'breast','model_result':json.dumps(bounding_boxes),'image_filename':original_filename,'image_ref':await save_artifact(image_to_preview_b64) if image_to_preview_b64 else None,'prediction_id':prediction_data.get('prediction_id'),'image_sha256':upload.sha256}
+                     else: error_message = "Detection successful but results incomplete."
+                 else: error_message = result.get("message", "Detection failed.")
+        elif not error_message: error_message = "No image file uploaded."
+        if upload: upload.close()
 
 
     # --- Renderização ---
@@ -61,16 +73,29 @@ async def prediction_breast_cancer_page(request):
 
     # Formulário
     if not prediction_data:
+        # Resolução útil para o perfil que será pedido (API): a imagem é reduzida no navegador antes do upload
+        _, max_dimension = await PredictionService.get_breast_upload_profile(token)
         upload_form = Form(
-            Div(Label("Upload Mammogram Image", For="image_file"), Input(id="image_file", name="image_file", type="file", accept="image/*", required=True), Small("Upload JPEG, PNG, GIF, or BMP images."), cls="form-group"),
+            ImageUploadField("Upload Mammogram Image", max_dimension),
             Button("Analyze Image", type="submit", cls="btn btn-primary"),
             method="post", action="/predict/breast-cancer", enctype="multipart/form-data" )
         content.append(Card(upload_form, title="Image Upload"))
+        content.append(script("js/upload-downscale.js"))
 
     # Resultados
     if prediction_data:
         annotated_image_b64 = prediction_data.get('image_base64')
         bounding_boxes = prediction_data.get('bounding_boxes', [])
+        image_size = prediction_data.get('image_size')
+        detection_id = prediction_data.get('detection_id')
+
+        # Imagem anotada pela API (modo antigo) ou miniatura com as caixas em uma camada SVG
+        if annotated_image_b64:
+            annotated_view = Img(src=f"data:image/jpeg;base64,{annotated_image_b64}", alt=f"Annotated: {original_filename}", cls="prediction-image-preview")
+        elif image_to_preview_b64 and image_size:
+            annotated_view = DetectionOverlay(f"data:image/jpeg;base64,{image_to_preview_b64}", bounding_boxes, image_size, alt=f"Annotated: {original_filename}")
+        else:
+            annotated_view = P("Annotated image unavailable.")
 
         detection_summary_text = "No suspicious masses detected."
         detection_summary_cls = "text-success"
@@ -94,9 +119,9 @@ async def prediction_breast_cancer_page(request):
             P(detection_summary_text, cls=f"detection-summary {detection_summary_cls}")
         ]
         # Adiciona o histograma se foi gerado e existem boxes
-        if bounding_boxes and chart_base64:
+        if bounding_boxes and chart_svg:
             right_panel_content.append(
-                Div(Img(src=f"data:image/png;base64,{chart_base64}", alt="Detection Confidence Histogram", style="max-width:100%; height:auto; border: 1px solid #eee; margin-top:1rem; margin-bottom:1rem;"))
+                Div(NotStr(chart_svg), style="border: 1px solid #eee; margin-top:1rem; margin-bottom:1rem;")
             )
         elif bounding_boxes: # Se boxes existem mas gráfico falhou
             right_panel_content.append(P("Confidence histogram unavailable.", style="font-size:0.9em; color:#6b7280;"))
@@ -113,7 +138,9 @@ async def prediction_breast_cancer_page(request):
                 # Painel Esquerdo (Imagem Anotada)
                 Div(
                     H4("Annotated Image"),
-                    Div(Img(src=f"data:image/jpeg;base64,{annotated_image_b64}", alt=f"Annotated: {original_filename}", cls="prediction-image-preview") if annotated_image_b64 else P("Annotated image unavailable."), cls="image-preview-container"),
+                    Div(annotated_view, cls="image-preview-container"),
+                    # Versão renderizada no servidor, só quando pedida (em cache na API)
+                    A("Open server-rendered image", href=f"/predict/breast-cancer/annotated/{detection_id}", target="_blank", cls="annotated-image-link") if detection_id and bounding_boxes else "",
                     cls="result-left-panel"
                 ),
                 # Painel Direito (Detalhes e Histograma)
@@ -132,40 +159,7 @@ async def prediction_breast_cancer_page(request):
         content.append(Card(*result_card_content)) # Sem título no Card
 
     # CSS Completo
-    content.append(Style("""
-        /* --- Estilos Gerais do Formulário e Botões --- */
-        .form-group { margin-bottom: 1.25rem; }
-        .form-group label { display: block; margin-bottom: 0.5rem; font-weight: 500; color: #374151; }
-        .form-group input, .form-group select, .form-group textarea { width: 100%; padding: 0.6rem 0.75rem; border: 1px solid #d1d5db; border-radius: 0.375rem; box-shadow: inset 0 1px 2px rgba(0, 0, 0, 0.05); box-sizing: border-box; font-size: 1rem; line-height: 1.5; }
-        .form-group input[type=file] { padding: 0.4rem; box-shadow: none; border: 1px dashed #d1d5db; background-color: #f9fafb; }
-        .form-group input[type=file]::file-selector-button { margin-right: 0.8rem; border: thin solid grey; background: #eee; padding: 0.4rem 0.8rem; border-radius: 0.2rem; cursor: pointer; transition: background-color 0.2s; }
-        .form-group input[type=file]::file-selector-button:hover { background-color: #ddd; }
-        .form-group input:focus, .form-group select:focus, .form-group textarea:focus { border-color: var(--primary-color, #2563eb); outline: none; box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.2); }
-        .form-group small { display: block; margin-top: 0.25rem; font-size: 0.85em; color: #6b7280; }
-        .result-actions { margin-top: 1.5rem; padding-top: 1.5rem; border-top: 1px solid var(--border-color, #e5e7eb); display: flex; gap: 1rem; flex-wrap: wrap; justify-content: center;}
-        .btn { display: inline-block; background-color: var(--primary-color); color: white; padding: 0.6rem 1.2rem; border-radius: 0.375rem; text-decoration: none; font-weight: 500; border: none; cursor: pointer; transition: background-color 0.2s, transform 0.1s; text-align: center; line-height: 1.2; }
-        .btn:hover { background-color: var(--secondary-color); transform: translateY(-1px); }
-        .btn-success { background-color: var(--success-color, #10b981); border-color: var(--success-color, #10b981); color: white; }
-        .btn-success:hover { background-color: #059669; border-color: #059669; }
-        .btn-secondary { background-color: #6b7280; border-color: #6b7280; color: white; }
-        .btn-secondary:hover { background-color: #4b5563; border-color: #4b5563; }
-        .btn-outline { background-color: transparent; border: 1px solid #6b7280; color: #6b7280; }
-        .btn-outline:hover { background-color: #f3f4f6; color: #4b5563; }
-        /* --- Estilos para Layout Flex dos Resultados --- */
-        .result-container { display: flex; flex-wrap: wrap; gap: 2rem; padding: 0 1.5rem 1.5rem 1.5rem; align-items: flex-start; }
-        .result-left-panel { flex: 1 1 55%; min-width: 320px; text-align: center; }
-        .result-detections-container { flex: 1 1 40%; min-width: 280px; padding-top: 0.5rem; }
-        .result-left-panel h4, .result-detections-container h4 { margin-top: 0; margin-bottom: 1rem; font-weight: 600; color: #4b5563; font-size: 1.05em; }
-        /* --- Estilos para Preview da Imagem Anotada --- */
-        .image-preview-container { margin-bottom: 1rem; text-align: center; width: 100%; }
-        .prediction-image-preview { display: block; margin-left: auto; margin-right: auto; width: 100%; max-width: 500px; height: auto; border: 1px solid #ccc; box-shadow: 0 2px 5px rgba(0,0,0,0.1); border-radius: 4px; }
-        /* --- Estilos para Lista/Sumário de Detecções --- */
-        .result-detections-container ul { padding-left: 1.5rem; margin: 0.5rem 0 0 0; font-size: 0.9rem; list-style-type: square; }
-        .result-detections-container li { margin-bottom: 0.4rem; color: #374151; }
-        .detection-summary { font-weight: 600; margin-bottom: 1rem; font-size: 1.05em; }
-        .text-danger { color: #b91c1c; }
-        .text-success { color: #047857; }
-    """)
+    content.append(stylesheet("css/predict-breast-cancer.css")
     )
 
     # Renderiza o layout principal
@@ -1,4 +1,5 @@
 from fasthtml.common import *
+from utils.assets import stylesheet
 from components.layout import MainLayout
 from components.ui import Card, Alert
 from components.forms import UserForm
@@ -172,54 +173,7 @@ async def edit_user_page(request):
 
     # *** RESTAURADO: Bloco <Style> para o formulário ***
     content.append(
-        Style("""
-            .page-header {
-                margin-bottom: 1.5rem;
-            }
-            /* Estilos gerais do formulário (reutilizados) */
-            .form-group {
-                 margin-bottom: 1.25rem;
-            }
-            .form-group label {
-                display: block;
-                margin-bottom: 0.5rem;
-                font-weight: 500;
-                color: #374151;
-            }
-            .form-group input, .form-group select {
-                width: 100%;
-                padding: 0.6rem 0.75rem;
-                border: 1px solid #d1d5db;
-                border-radius: 0.375rem;
-                box-shadow: inset 0 1px 2px rgba(0, 0, 0, 0.05);
-                box-sizing: border-box;
-                font-size: 1rem;
-                line-height: 1.5;
-            }
-            /* Desabilita visualmente campos que não podem ser editados */
-            .form-group input[disabled], .form-group select[disabled] {
-                 background-color: #f3f4f6; /* Fundo cinza claro */
-                 cursor: not-allowed; /* Cursor de 'não permitido' */
-                 opacity: 0.7; /* Levemente transparente */
-            }
-            .form-group input:focus, .form-group select:focus {
-                 border-color: var(--primary-color, #2563eb);
-                 outline: none;
-                 box-shadow: 0 0 0 3px rgba(37, 99, 235, 0.2);
-             }
-            /* Estilos para botões de ação no formulário */
-            .form-actions {
-                margin-top: 1.5rem;
-                padding-top: 1rem;
-                border-top: 1px solid var(--border-color, #e5e7eb);
-                display: flex;
-                justify-content: flex-end; /* Alinha botões à direita */
-                gap: 0.75rem; /* Espaço entre botões */
-            }
-            .form-actions .btn-secondary {
-                 margin-left: 0; /* Remove margem extra se presente */
-            }
-        """)
+        stylesheet("css/users-edit.css")
     )
     # ----------------------------------------------
 
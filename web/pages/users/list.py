@@ -1,11 +1,13 @@
 # web/pages/users/list.py
 from fasthtml.common import *
+from utils.assets import stylesheet
 # Importa datetime para formatar a data
 from datetime import datetime
 from components.layout import MainLayout
-from components.ui import Card, Table, Alert
+from components.ui import Card, Table, Alert, Pagination
 from services.users_service import UsersService
 from services.auth_service import AuthService
+from utils.htmx import is_htmx, fragment
 # Importa NotStr para renderizar SVG diretamente
 from fasthtml.components import NotStr
 
@@ -26,14 +28,30 @@ delete_icon_svg = """
 """
 # --------------------------------
 
+PER_PAGE = 20 # A API devolve a lista completa; a paginação é feita aqui
+
+
 async def users_list_page(request):
-    """Renderiza a página de listagem de usuários com lógica baseada no perfil."""
+    """
+    Renderiza a página de listagem de usuários com lógica baseada no perfil.
+    Requisições do HTMX (filtro/paginação) recebem só o bloco #users-results.
+    """
     session = request.scope.get("session", {})
     token = session.get('token')
     # *** ADICIONADO: Obter user_profile da sessão ***
     user_profile = session.get('user_profile')
     current_user_id = session.get('user_id')
 
+    # Filtros e página da query string
+    query_params = request.query_params
+    status_filter = query_params.get('status')
+    profile_filter = query_params.get('profile')
+    try:
+        page = max(1, int(query_params.get('page', '1')))
+    except ValueError:
+        page = 1
+    partial = is_htmx(request)
+
     # Verifica permissão geral de gerenciamento (ambos admins podem)
     can_manage = AuthService.is_admin(user_profile)
     is_general_admin = (user_profile == "general_administrator")
@@ -73,34 +91,22 @@ async def users_list_page(request):
         result_success = False
         print(f"Erro na view users_list_page: {e}") # Log do erro
 
-    # --- Renderização do Conteúdo ---
-    content = []
-
-    # Adiciona Alerta de erro ou mensagem da sessão
-    if 'message' in session:
-        message = session.pop('message')
-        message_type = session.pop('message_type', 'success')
-        content.append(Alert(message, type=message_type))
-    elif result_message and not result_success:
-        content.append(Alert(result_message, type="error"))
-
-    # Cabeçalho da página
-    content.append(
-        Div(
-            H1(page_title),
-            Div(
-                A("Add User", href="/users/add", cls="btn btn-primary"),
-                cls="page-actions"
-            ) if can_manage else "", # Botão Add só para admins
-            cls="page-header"
-        )
-    )
-
-    # Tabela de Usuários (somente se a busca foi bem sucedida)
+    # --- Bloco de resultados (tabela + paginação), substituído pelo HTMX ---
+    results = ""
     if result_success:
-        if users_list:
+        # Aplica os filtros e recorta a página atual
+        if status_filter:
+            users_list = [u for u in users_list if u.get("status") == status_filter]
+        if profile_filter:
+            users_list = [u for u in users_list if u.get("profile") == profile_filter]
+        total_count = len(users_list)
+        total_pages = max(1, (total_count + PER_PAGE - 1) // PER_PAGE)
+        page = min(page, total_pages)
+        page_users = users_list[(page - 1) * PER_PAGE:page * PER_PAGE]
+
+        if page_users:
             rows = []
-            for user in users_list:
+            for user in page_users:
                 user_id_list = user.get("id") # ID do usuário na linha atual
 
                 # Formata data
@@ -150,41 +156,105 @@ async def users_list_page(request):
             headers = ["Name", "Email", "Profile", "Status", "Created At", "Actions"]
 
             # Cria Card com a Tabela
-            card_title = f"{'All Users' if is_general_admin else 'My Professionals'} ({len(users_list)})"
-            content.append(
-                Card(
-                    Table(headers, rows, id="users-table"),
-                    title=card_title
-                )
+            card_title = f"{'All Users' if is_general_admin else 'My Professionals'} ({total_count})"
+            results = Card(
+                Table(headers, rows, id="users-table"),
+                Pagination(
+                    page=page,
+                    total_pages=total_pages,
+                    base_url="/users",
+                    params={"status": status_filter, "profile": profile_filter},
+                    target="#users-results"
+                ),
+                title=card_title
             )
         else:
             # Mensagem se não houver usuários/profissionais
             no_data_message = "No users found." if is_general_admin else "No professionals associated with your account."
             card_title = f"{'All Users' if is_general_admin else 'My Professionals'}"
-            content.append( Card( P(no_data_message, cls="no-data"), title=card_title) )
-    # else: O erro da API já foi tratado pelo Alert no início
+            results = Card( P(no_data_message, cls="no-data"), title=card_title)
+    elif partial and result_message:
+        results = Alert(result_message, type="error")
+    results = Div(results, id="users-results")
+
+    if partial:
+        return fragment(page_title, results)
+
+    # --- Renderização do Conteúdo ---
+    content = []
+
+    # Adiciona Alerta de erro ou mensagem da sessão
+    if 'message' in session:
+        message = session.pop('message')
+        message_type = session.pop('message_type', 'success')
+        content.append(Alert(message, type=message_type))
+    elif result_message and not result_success:
+        content.append(Alert(result_message, type="error"))
+
+    # Cabeçalho da página
+    content.append(
+        Div(
+            H1(page_title),
+            Div(
+                A("Add User", href="/users/add", cls="btn btn-primary"),
+                cls="page-actions"
+            ) if can_manage else "", # Botão Add só para admins
+            cls="page-header"
+        )
+    )
+
+    # Filtros (HTMX troca só os resultados e atualiza a URL; sem JS, GET comum)
+    if result_success:
+        filter_inputs = [
+            Div(
+                Label("Status", For="status"),
+                Select(
+                    Option("All", value=""),
+                    Option("Active", value="active", selected=status_filter == "active"),
+                    Option("Inactive", value="inactive", selected=status_filter == "inactive"),
+                    id="status", name="status"
+                ),
+                cls="form-group"
+            )
+        ]
+        if is_general_admin: # Só o admin geral vê perfis diferentes na lista
+            filter_inputs.append(
+                Div(
+                    Label("Profile", For="profile"),
+                    Select(
+                        Option("All Profiles", value=""),
+                        Option("Administrator", value="administrator", selected=profile_filter == "administrator"),
+                        Option("Professional", value="professional", selected=profile_filter == "professional"),
+                        id="profile", name="profile"
+                    ),
+                    cls="form-group"
+                )
+            )
+        content.append(
+            Card(
+                Form(
+                    Div(*filter_inputs, Button("Filter", type="submit", cls="btn btn-secondary"), cls="filter-inputs"),
+                    method="get",
+                    action="/users",
+                    hx_get="/users",
+                    hx_trigger="submit, change",
+                    hx_target="#users-results",
+                    hx_swap="outerHTML",
+                    hx_push_url="true",
+                    cls="filter-form"
+                ),
+                title="Filter Users",
+                cls="filter-card"
+            )
+        )
+
+    # Tabela de Usuários (somente se a busca foi bem sucedida)
+    content.append(results)
 
     # Adiciona CSS (mantido como antes)
     content.append(
-        Style("""
-            /* --- CSS Completo (mantido da resposta anterior) --- */
-            .page-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 1.5rem; border-bottom: 1px solid var(--border-color, #e5e7eb); padding-bottom: 1rem; }
-            .page-header h1 { margin-bottom: 0; }
-            .page-actions .btn { padding: 0.6rem 1.2rem; font-weight: 500; }
-            .no-data { text-align: center; padding: 2rem; color: #6b7280; }
-            .table-container { overflow-x: auto; }
-            .actions-cell { display: flex; gap: 0.75rem; align-items: center; justify-content: center; white-space: nowrap; }
-            .btn-icon { display: inline-flex; align-items: center; justify-content: center; padding: 0.3rem; border-radius: 50%; border: 1px solid transparent; cursor: pointer; transition: all 0.2s; }
-            .btn-icon svg { width: 1em; height: 1em; vertical-align: middle; }
-            .btn-edit { color: #2563eb; border-color: #bfdbfe; }
-            .btn-edit:hover { background-color: #eff6ff; border-color: #93c5fd; transform: scale(1.1); }
-            .btn-delete { color: #dc2626; border-color: #fecaca; }
-            .btn-delete:hover { background-color: #fee2e2; border-color: #fca5a5; transform: scale(1.1); }
-            .status-active { color: #059669; font-weight: 500; background-color: #d1fae5; padding: 0.2em 0.6em; border-radius: 0.25rem; display: inline-block; }
-            .status-inactive { color: #71717a; font-weight: 500; background-color: #f4f4f5; padding: 0.2em 0.6em; border-radius: 0.25rem; display: inline-block; }
-            table td { vertical-align: middle; }
-        """)
+        stylesheet("css/users-list.css")
     )
 
     # *** ALTERADO: Passar user_profile para MainLayout ***
-    return MainLayout(page_title, *content, active_page="users", user_profile=user_profile)
\ No newline at end of file
+    return MainLayout(page_title, *content, active_page="users", user_profile=user_profile)
@@ -0,0 +1,150 @@
+# web/scripts/benchmark_charts.py
+"""
+Compara o renderizador SVG (utils.plotting) com o antigo fluxo matplotlib -> PNG -> base64.
+
+Cada renderizador roda em um subprocesso separado para medir o tempo de import
+e o RSS do processo de forma isolada.
+
+Uso (a partir de web/):
+    python scripts/benchmark_charts.py [--renders 200]
+
+O modo matplotlib só é executado se o pacote estiver instalado
+(ele não faz mais parte de requirements.txt).
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+WEB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBABILITIES = {"Normal": 12.4, "Pneumonia": 61.3, "COVID-19": 18.9, "Tuberculosis": 5.2, "Lung Opacity": 2.2}
+DETECTIONS = [{"confidence": c} for c in (0.71, 0.78, 0.83, 0.91, 0.93, 0.97)]
+
+
+def _rss_mb() -> float:
+    """RSS atual do processo em MB (Linux); cai para o pico via resource."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _legacy_renderers():
+    """Reprodução do renderizador anterior (barh/hist + tight_layout + PNG 90 dpi + base64)."""
+    import base64
+    import io
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    def probability_chart(probabilities, title):
+        labels, values = list(probabilities.keys()), list(probabilities.values())
+        fig, ax = plt.subplots(figsize=(7, max(3, len(labels) * 0.6)))
+        bars = ax.barh(labels, values, color=plt.cm.viridis_r([v / 100. for v in values]), height=0.6)
+        ax.bar_label(bars, fmt='%.1f%%', padding=3, fontsize=9, color='dimgray')
+        ax.set_xlabel("Probability (%)", fontsize=10)
+        ax.set_title(title, fontsize=12, pad=15)
+        ax.set_xlim(0, 105)
+        plt.tight_layout()
+        buf = io.BytesIO()
+        plt.savefig(buf, format='png', dpi=90)
+        plt.close(fig)
+        return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+    def confidence_histogram(detections, title):
+        confidences = [d.get('confidence', 0) * 100 for d in detections]
+        fig, ax = plt.subplots(figsize=(7, 4))
+        ax.hist(confidences, bins=[70, 75, 80, 85, 90, 95, 100], color='skyblue', edgecolor='black', rwidth=0.85)
+        ax.set_title(title, fontsize=12, pad=15)
+        plt.tight_layout()
+        buf = io.BytesIO()
+        plt.savefig(buf, format='png', dpi=90)
+        plt.close(fig)
+        return base64.b64encode(buf.getvalue()).decode('utf-8')
+
+    return probability_chart, confidence_histogram
+
+
+def run_worker(mode: str, renders: int) -> dict:
+    rss_start = _rss_mb()
+    start = time.perf_counter()
+    if mode == "svg":
+        sys.path.insert(0, WEB_DIR)
+        from utils.plotting import generate_probability_chart as probability_chart
+        from utils.plotting import generate_confidence_histogram as confidence_histogram
+    else:
+        probability_chart, confidence_histogram = _legacy_renderers()
+    import_ms = (time.perf_counter() - start) * 1000
+
+    rng = random.Random(42)
+    # Entradas distintas a cada render: mede o custo real, sem ajuda do cache
+    varied = [
+        {label: round(rng.uniform(0, 100), 1) for label in PROBABILITIES}
+        for _ in range(renders)
+    ]
+    start = time.perf_counter()
+    for probabilities in varied:
+        probability_chart(probabilities, "Benchmark")
+    uncached_ms = (time.perf_counter() - start) * 1000 / renders
+
+    # Mesma entrada repetida: o caso de re-render da mesma predição
+    start = time.perf_counter()
+    for _ in range(renders):
+        probability_chart(PROBABILITIES, "Benchmark")
+    repeated_ms = (time.perf_counter() - start) * 1000 / renders
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        confidence_histogram(DETECTIONS, "Benchmark")
+    histogram_ms = (time.perf_counter() - start) * 1000 / renders
+
+    return {
+        "mode": mode,
+        "import_ms": round(import_ms, 1),
+        "bar_chart_ms": round(uncached_ms, 3),
+        "bar_chart_repeated_ms": round(repeated_ms, 4),
+        "histogram_ms": round(histogram_ms, 4),
+        "output_bytes": len(probability_chart(PROBABILITIES, "Benchmark")),
+        "rss_start_mb": round(rss_start, 1),
+        "rss_end_mb": round(_rss_mb(), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--renders", type=int, default=200)
+    parser.add_argument("--worker", choices=["svg", "matplotlib"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.renders)))
+        return
+
+    results = []
+    for mode in ("matplotlib", "svg"):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--worker", mode, "--renders", str(args.renders)],
+            capture_output=True, text=True
+        )
+        if proc.returncode != 0:
+            print(f"{mode}: skipped ({proc.stderr.strip().splitlines()[-1] if proc.stderr else 'failed'})")
+            continue
+        results.append(json.loads(proc.stdout))
+
+    columns = ["mode", "import_ms", "bar_chart_ms", "bar_chart_repeated_ms", "histogram_ms", "output_bytes", "rss_start_mb", "rss_end_mb"]
+    print(" | ".join(columns))
+    for result in results:
+        print(" | ".join(str(result[c]) for c in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,22 @@
 # web/services/api_client.py
 import httpx
 from config import API_BASE_URL, API_KEY
+from services.http_client import send_request
+
+def forwarded_for(request):
+    """
+    Cadeia X-Forwarded-For a repassar à API: a recebida (se o web estiver atrás de outro proxy)
+    mais o IP de quem conectou ao web. Sem isso a API vê todos os usuários com o IP do web
+    """
+    client_host = request.client.host if request.client else None
+    chain = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if client_host:
+        chain.append(client_host)
+    return ", ".join(chain) or None
+
 
 class ApiClient:
-    def __init__(self, token=None):
+    def __init__(self, token=None, forwarded_for=None):
         self.base_url = API_BASE_URL
         self.headers = {
             "api_key": API_KEY,
@@ -11,36 +24,38 @@ class ApiClient:
         }
         if token:
             self.headers["Authorization"] = f"Bearer {token}"
+        if forwarded_for:
+            # A API só confia neste cabeçalho vindo dos IPs em TRUSTED_PROXY_IPS
+            self.headers["X-Forwarded-For"] = forwarded_for
     
     async def request(self, method, url, data=None, params=None):
-        """Executa uma requisição para a API"""
-        async with httpx.AsyncClient() as client:
-            full_url = f"{self.base_url}{url}"
-            
+        """Executa uma requisição para a API usando o cliente HTTP compartilhado"""
+        full_url = f"{self.base_url}{url}"
+
+        try:
+            response = await send_request(
+                method,
+                full_url,
+                json=data,
+                params=params,
+                headers=self.headers
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                # Token expirado ou inválido
+                raise ValueError("Session expired. Please login again.")
+
+            error_detail = {"message": str(e)}
             try:
-                response = await client.request(
-                    method=method, 
-                    url=full_url, 
-                    json=data, 
-                    params=params, 
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 401:
-                    # Token expirado ou inválido
-                    raise ValueError("Session expired. Please login again.")
-                
-                error_detail = {"message": str(e)}
-                try:
-                    error_detail = e.response.json().get("detail", error_detail)
-                except:
-                    pass
-                
-                raise ValueError(error_detail.get("message", str(e)))
-            except Exception as e:
-                raise ValueError(f"Error connecting to API: {str(e)}")
+                error_detail = e.response.json().get("detail", error_detail)
+            except:
+                pass
+
+            raise ValueError(error_detail.get("message", str(e)))
+        except Exception as e:
+            raise ValueError(f"Error connecting to API: {str(e)}")
     
     async def get(self, url, params=None):
         """Executa uma requisição GET"""
@@ -1,11 +1,11 @@
 # web/services/auth_service.py
-from services.api_client import ApiClient
+from services.api_client import ApiClient, forwarded_for
 
 class AuthService:
     @staticmethod
-    async def login(email, password):
-        """Faz login e retorna o token"""
-        client = ApiClient()
+    async def login(email, password, request=None):
+        """Faz login e retorna o token (com `request`, repassa o IP do cliente para o limite de tentativas da API)"""
+        client = ApiClient(forwarded_for=forwarded_for(request) if request else None)
         data = {"email": email, "password": password}
         
         try:
@@ -0,0 +1,139 @@
+# web/services/data_loader.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+from services.attendance_service import AttendanceService
+from services.health_units_service import HealthUnitsService
+from services.users_service import UsersService
+
+
+async def _fetch_users_by_id(token, ids: List[str]) -> Dict[str, Optional[Dict]]:
+    """Resolve vários usuários com uma única chamada a /users/lookup."""
+    result = await UsersService.lookup_users(token, ids)
+    if not result.get("success"):
+        print(f"Erro ao resolver usuários: {result.get('message')}")
+        return {}
+    return {user["id"]: user for user in result["users"]}
+
+
+async def _fetch_health_units_by_id(token, ids: List[str]) -> Dict[str, Optional[Dict]]:
+    """Resolve várias unidades de saúde com uma única chamada a /health-units/lookup."""
+    result = await HealthUnitsService.lookup_health_units(token, ids)
+    if not result.get("success"):
+        print(f"Erro ao resolver unidades de saúde: {result.get('message')}")
+        return {}
+    return {unit["id"]: unit for unit in result["health_units"]}
+
+
+class DataLoader:
+    """
+    Carregador de dados com escopo de requisição.
+
+    - load(): inicia a busca imediatamente e devolve um Future; chamadas
+      idênticas durante o mesmo render reaproveitam o mesmo Future.
+    - load_batched(): agrupa ids pedidos no mesmo ciclo do event loop e os
+      resolve com uma única chamada à função de lote (endpoints /lookup da API).
+    """
+
+    def __init__(self, token):
+        self.token = token
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}
+        # Referência aos despachos em andamento (o event loop só guarda referências fracas às tasks)
+        self._tasks: Set[asyncio.Task] = set()
+
+    def load(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]) -> asyncio.Future:
+        future = self._futures.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            self._futures[key] = future
+        return future
+
+    def load_batched(self, name: str, item_id: str,
+                     batch_fn: Callable[[Any, List[str]], Awaitable[Dict[str, Any]]]) -> asyncio.Future:
+        key = (name, item_id)
+        future = self._futures.get(key)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._futures[key] = future
+
+        pending = self._pending.get(name)
+        if pending is None:
+            pending = self._pending[name] = {}
+            # Despacha no próximo ciclo, depois que o render pediu todos os ids
+            loop.call_soon(self._start_dispatch, name, batch_fn)
+        pending[item_id] = future
+        return future
+
+    def _start_dispatch(self, name: str, batch_fn):
+        task = asyncio.get_running_loop().create_task(self._dispatch(name, batch_fn))
+        self._tasks.add(task)
+        task.add_done_callback(self._dispatch_done)
+
+    def _dispatch_done(self, task: asyncio.Task):
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Erro inesperado ao despachar lote: {task.exception()}")
+
+    async def _dispatch(self, name: str, batch_fn):
+        pending = self._pending.pop(name, {})
+        if not pending:
+            return
+        try:
+            results = await batch_fn(self.token, list(pending))
+        except Exception as e:
+            print(f"Erro ao carregar lote '{name}': {e}")
+            results = {}
+        for item_id, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(item_id))
+
+    @staticmethod
+    async def gather(*awaitables):
+        """Aguarda buscas independentes em paralelo."""
+        return await asyncio.gather(*awaitables)
+
+    # --- Atalhos usados pelas páginas ---
+
+    def user(self, user_id: str) -> asyncio.Future:
+        """Usuário (dict) ou None."""
+        return self.load_batched("users", user_id, _fetch_users_by_id)
+
+    def health_unit(self, unit_id: str) -> asyncio.Future:
+        """Unidade de saúde (dict) ou None."""
+        return self.load_batched("health_units", unit_id, _fetch_health_units_by_id)
+
+    def users(self, ids: Iterable[str]) -> Awaitable[Dict[str, Optional[Dict]]]:
+        return self._many(self.user, ids)
+
+    def health_units_by_id(self, ids: Iterable[str]) -> Awaitable[Dict[str, Optional[Dict]]]:
+        return self._many(self.health_unit, ids)
+
+    def health_units(self) -> asyncio.Future:
+        """Resultado de HealthUnitsService.get_health_units."""
+        return self.load("health_units_list", lambda: HealthUnitsService.get_health_units(self.token))
+
+    def attendances(self, health_unit_id=None, model_used=None, page=1, per_page=10) -> asyncio.Future:
+        """Resultado de AttendanceService.get_attendances."""
+        return self.load(
+            ("attendances", health_unit_id, model_used, page, per_page),
+            lambda: AttendanceService.get_attendances(self.token, health_unit_id, model_used, page, per_page)
+        )
+
+    @staticmethod
+    async def _many(load_one, ids: Iterable[str]) -> Dict[str, Optional[Dict]]:
+        unique_ids = [i for i in dict.fromkeys(ids) if i]
+        values = await asyncio.gather(*(load_one(i) for i in unique_ids))
+        return dict(zip(unique_ids, values))
+
+
+def get_loader(request) -> DataLoader:
+    """Retorna o DataLoader da requisição atual (criado na primeira chamada)."""
+    loader = request.scope.get("data_loader")
+    if loader is None:
+        token = request.scope.get("session", {}).get("token")
+        loader = request.scope["data_loader"] = DataLoader(token)
+    return loader
@@ -29,6 +29,24 @@ class HealthUnitsService:
         except ValueError as e:
             return {"success": False, "message": str(e)}
     
+    @staticmethod
+    async def lookup_health_units(token, unit_ids):
+        """Resolve várias unidades de saúde em uma chamada (apenas campos de exibição)"""
+        client = ApiClient(token)
+        ids = list(dict.fromkeys(i for i in unit_ids if i))
+        units = []
+
+        try:
+            # A API aceita até 500 ids por chamada
+            for start in range(0, len(ids), 500):
+                result = await client.post("/health-units/lookup", {"ids": ids[start:start + 500]})
+                if "detail" not in result or "health_units" not in result["detail"]:
+                    return {"success": False, "message": "Failed to retrieve health units"}
+                units.extend(result["detail"]["health_units"])
+            return {"success": True, "health_units": units}
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+
     @staticmethod
     async def create_health_unit(token, unit_data):
         """Cria uma nova unidade de saúde"""
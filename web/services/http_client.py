@@ -0,0 +1,80 @@
+# web/services/http_client.py
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import httpx
+from config import (
+    API_HTTP2, API_MAX_CONNECTIONS, API_MAX_KEEPALIVE_CONNECTIONS,
+    API_KEEPALIVE_EXPIRY, API_CONNECT_TIMEOUT, API_TIMEOUT
+)
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """HTTP/2 no httpx depende do pacote opcional 'h2'."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Cria o cliente com pool de conexões keep-alive usado por todos os serviços."""
+    http2 = API_HTTP2 and _http2_available()
+    if API_HTTP2 and not http2:
+        print("API_HTTP2 habilitado, mas o pacote 'h2' não está instalado. Usando HTTP/1.1.")
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=API_MAX_CONNECTIONS,
+            max_keepalive_connections=API_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=API_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(API_TIMEOUT, connect=API_CONNECT_TIMEOUT)
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Retorna o cliente do processo.
+    Normalmente criado no lifespan da aplicação; é criado sob demanda
+    caso os serviços sejam usados fora do app (scripts, shell).
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_http_client()
+    return _client
+
+
+async def close_http_client():
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+    _client = None
+
+
+@asynccontextmanager
+async def http_client_lifespan(app):
+    """Lifespan do FastHTML: abre o pool na subida e fecha as conexões no desligamento."""
+    get_http_client()
+    try:
+        yield
+    finally:
+        await close_http_client()
+
+
+async def send_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Envia a requisição pelo cliente compartilhado e registra a latência da chamada."""
+    start = time.perf_counter()
+    status = "error"
+    try:
+        response = await get_http_client().request(method, url, **kwargs)
+        status = response.status_code
+        return response
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"API {method} {url} -> {status} em {elapsed_ms:.1f}ms")
@@ -1,69 +1,166 @@
 # web/services/prediction_service.py
+import time
 import httpx
-from config import API_BASE_URL, API_KEY # Importa configurações
-from typing import Dict, Any
+from config import API_BASE_URL, API_KEY, API_PREDICTION_TIMEOUT # Importa configurações
+from services.http_client import send_request
+from services.upload_proxy import StreamedUpload
+from services.api_client import ApiClient
+from typing import Dict, Any, Optional, Union
+
+MODEL_INFO_TTL = 300 # Resoluções dos modelos quase nunca mudam: cache por processo
+_model_info_cache = {"models": None, "expires_at": 0.0}
+
 
 class PredictionService:
     """Serviço para interagir com os endpoints de predição da API."""
 
     @staticmethod
-    async def _make_prediction_request(token: str, endpoint: str, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Método auxiliar para enviar a imagem e obter a predição."""
+    async def get_model_info(token: str) -> Dict[str, Any]:
+        """
+        Resolução de entrada de cada modelo (GET /predictions/models), usada pelo
+        formulário para reduzir a imagem no navegador antes do upload.
+        """
+        if _model_info_cache["models"] is not None and time.monotonic() < _model_info_cache["expires_at"]:
+            return {"success": True, "models": _model_info_cache["models"]}
+        client = ApiClient(token)
+        try:
+            result = await client.get("/predictions/models")
+            if "detail" in result and "models" in result["detail"]:
+                _model_info_cache["models"] = result["detail"]["models"]
+                _model_info_cache["expires_at"] = time.monotonic() + MODEL_INFO_TTL
+                return {"success": True, "models": _model_info_cache["models"]}
+            return {"success": False, "message": "Failed to retrieve model info"}
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+
+    @staticmethod
+    async def get_max_upload_dimension(token: str, model: str):
+        """Maior lado útil para o modelo, ou None (sem redução no navegador)."""
+        result = await PredictionService.get_model_info(token)
+        if not result.get("success"):
+            print(f"Erro ao obter resolução dos modelos: {result.get('message')}")
+            return None
+        return (result["models"].get(model) or {}).get("max_upload_dimension")
+
+    @staticmethod
+    async def get_breast_upload_profile(token: str):
+        """
+        Perfil de detecção que a página vai pedir (o padrão da API) e o maior lado útil
+        para ele: (perfil, dimensão), ou (None, None) sem redução no navegador.
+        O perfil em tiles processa a imagem em resolução cheia, com limite bem maior.
+        """
+        result = await PredictionService.get_model_info(token)
+        if not result.get("success"):
+            print(f"Erro ao obter resolução dos modelos: {result.get('message')}")
+            return None, None
+        spec = result["models"].get("breast") or {}
+        profile = spec.get("default_detection_profile")
+        by_profile = spec.get("max_upload_dimension_by_profile")
+        if profile and by_profile:
+            return profile, by_profile.get(profile)
+        return None, spec.get("max_upload_dimension")  # API antiga: limite só do perfil padrão
+
+    @staticmethod
+    async def _make_prediction_request(token: str, endpoint: str, file_content: Union[bytes, StreamedUpload], filename: str, persist: bool = False, params: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """
+        Método auxiliar para enviar a imagem e obter a predição.
+        file_content pode ser bytes ou um StreamedUpload: neste caso o arquivo é
+        repassado à API em streaming, à medida que o navegador o envia.
+        Com persist=True a API guarda imagem e resultado e devolve um prediction_id,
+        usado depois no cadastro do atendimento sem reenviar a imagem.
+        params: parâmetros de query adicionais do endpoint.
+        """
         headers = {
             "api_key": API_KEY,
         }
         if token:
             headers["Authorization"] = f"Bearer {token}"
 
-        files = {'file': (filename, file_content, 'image/jpeg')} # Ajuste 'image/jpeg' se necessário
+        if isinstance(file_content, StreamedUpload):
+            headers["Content-Type"] = file_content.forward_content_type
+            body = {"content": file_content.body()}
+        else:
+            body = {"files": {'file': (filename, file_content, 'image/jpeg')}} # Ajuste 'image/jpeg' se necessário
 
         full_url = f"{API_BASE_URL}{endpoint}"
 
-        async with httpx.AsyncClient(timeout=60.0) as client: # Timeout maior
-            try:
-                # ---- CORREÇÃO APLICADA AQUI ----
-                print(f"Enviando para API: POST {full_url}") # Log de depuração corrigido
-                response = await client.post(full_url, headers=headers, files=files)
-                response.raise_for_status() # Levanta exceção para erros HTTP (4xx, 5xx)
-
-                api_response = response.json()
-                if "detail" in api_response and api_response["detail"].get("status_code") == 200:
-                     return {"success": True, "data": api_response["detail"]}
-                else:
-                     error_msg = api_response.get("detail", {}).get("message", "Prediction API request failed")
-                     return {"success": False, "message": error_msg}
-
-            except httpx.HTTPStatusError as e:
-                error_detail = {"message": str(e)}
-                try: error_detail = e.response.json().get("detail", error_detail)
-                except: pass
-                print(f"Erro HTTP API Predição: {e.response.status_code} - {error_detail}")
-                # Retorna a mensagem de erro da API se possível
-                return {"success": False, "message": error_detail.get("message", str(e))}
-            except Exception as e:
-                 # Aqui o erro 'e' seria o NameError antes da correção
-                 # Agora deve capturar outros erros (ex: conexão, timeout)
-                print(f"Erro Conexão/Outro API Predição: {type(e).__name__} - {e}") # Log mais detalhado
-                return {"success": False, "message": f"Error connecting to prediction API: {e}"}
+        try:
+            # Cliente compartilhado, com timeout maior para a inferência
+            params = {**(params or {}), **({"persist": "true"} if persist else {})} or None
+            response = await send_request("POST", full_url, headers=headers, params=params, **body, timeout=API_PREDICTION_TIMEOUT)
+            response.raise_for_status() # Levanta exceção para erros HTTP (4xx, 5xx)
+
+            api_response = response.json()
+            if "detail" in api_response and api_response["detail"].get("status_code") == 200:
+                 return {"success": True, "data": api_response["detail"]}
+            else:
+                 error_msg = api_response.get("detail", {}).get("message", "Prediction API request failed")
+                 return {"success": False, "message": error_msg}
+
+        except httpx.HTTPStatusError as e:
+            error_detail = {"message": str(e)}
+            try: error_detail = e.response.json().get("detail", error_detail)
+            except: pass
+            print(f"Erro HTTP API Predição: {e.response.status_code} - {error_detail}")
+            # Retorna a mensagem de erro da API se possível
+            return {"success": False, "message": error_detail.get("message", str(e))}
+        except Exception as e:
+            # Upload abortado no meio do streaming (ex.: arquivo acima do limite)
+            if isinstance(file_content, StreamedUpload) and file_content.error:
+                return {"success": False, "message": file_content.error}
+            # Outros erros (ex: conexão, timeout)
+            print(f"Erro Conexão/Outro API Predição: {type(e).__name__} - {e}") # Log mais detalhado
+            return {"success": False, "message": f"Error connecting to prediction API: {e}"}
 
     # --- Métodos específicos (predict_respiratory, etc.) continuam iguais ---
     @staticmethod
-    async def predict_respiratory(token: str, file_content: bytes, filename: str) -> Dict[str, Any]:
+    async def predict_respiratory(token: str, file_content: Union[bytes, StreamedUpload], filename: str, persist: bool = False) -> Dict[str, Any]:
         """Chama a API para predição de doenças respiratórias."""
-        return await PredictionService._make_prediction_request(token, "/predictions/respiratory", file_content, filename)
+        return await PredictionService._make_prediction_request(token, "/predictions/respiratory", file_content, filename, persist)
 
     @staticmethod
-    async def predict_breast_cancer(token: str, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Chama a API para predição de câncer de mama."""
+    async def predict_breast_cancer(token: str, file_content: Union[bytes, StreamedUpload], filename: str, persist: bool = False, annotated: bool = True, profile: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Chama a API para predição de câncer de mama.
+        Com annotated=False a API devolve só caixas e scores (a página desenha a sobreposição)
+        e um detection_id para buscar a imagem anotada sob demanda (get_breast_annotation).
+        profile: perfil de detecção pedido explicitamente (o mesmo usado para reduzir a imagem no navegador).
+        """
         # Certifique-se que o endpoint na API é /api/predictions/breast-cancer
-        return await PredictionService._make_prediction_request(token, "/predictions/breast-cancer", file_content, filename)
+        params = {}
+        if not annotated:
+            params["annotated"] = "false"
+        if profile:
+            params["profile"] = profile
+        return await PredictionService._make_prediction_request(token, "/predictions/breast-cancer", file_content, filename, persist, params or None)
+
+    @staticmethod
+    async def get_breast_annotation(token: str, detection_id: str, accept: Optional[str] = None):
+        """
+        Imagem anotada renderizada pela API para uma detecção: (bytes, content type), ou None se expirou.
+        accept: cabeçalho Accept do navegador, repassado para a API escolher JPEG ou WebP.
+        """
+        headers = {"api_key": API_KEY}
+        if accept:
+            headers["Accept"] = accept
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        try:
+            response = await send_request("GET", f"{API_BASE_URL}/predictions/breast-cancer/{detection_id}/annotated", headers=headers, timeout=API_PREDICTION_TIMEOUT)
+            if response.status_code != 200:
+                print(f"Imagem anotada indisponível ({detection_id}): {response.status_code}")
+                return None
+            return response.content, response.headers.get("content-type", "image/jpeg")
+        except Exception as e:
+            print(f"Erro ao buscar imagem anotada ({detection_id}): {type(e).__name__} - {e}")
+            return None
 
     @staticmethod
-    async def predict_tuberculosis(token: str, file_content: bytes, filename: str) -> Dict[str, Any]:
+    async def predict_tuberculosis(token: str, file_content: Union[bytes, StreamedUpload], filename: str, persist: bool = False) -> Dict[str, Any]:
         """Chama a API para predição de tuberculose."""
-        return await PredictionService._make_prediction_request(token, "/predictions/tuberculosis", file_content, filename)
+        return await PredictionService._make_prediction_request(token, "/predictions/tuberculosis", file_content, filename, persist)
 
     @staticmethod
-    async def predict_osteoporosis(token: str, file_content: bytes, filename: str) -> Dict[str, Any]:
+    async def predict_osteoporosis(token: str, file_content: Union[bytes, StreamedUpload], filename: str, persist: bool = False) -> Dict[str, Any]:
         """Chama a API para predição de osteoporose."""
-        return await PredictionService._make_prediction_request(token, "/predictions/osteoporosis", file_content, filename)
\ No newline at end of file
+        return await PredictionService._make_prediction_request(token, "/predictions/osteoporosis", file_content, filename, persist)
\ No newline at end of file
@@ -0,0 +1,255 @@
+# web/services/upload_proxy.py
+"""
+Proxy de upload em streaming: página -> API de predição.
+
+O multipart enviado pelo navegador é lido em pedaços direto de request.stream()
+e cada pedaço do arquivo é repassado à API assim que chega, sem montar o arquivo
+inteiro na memória. No caminho:
+- o tamanho é conferido (UPLOAD_MAX_BYTES) e o upload é abortado ao passar do limite;
+- o SHA-256 do conteúdo é calculado;
+- o arquivo é copiado para um temporário em disco, usado para gerar a miniatura
+  em uma thread enquanto a API ainda está processando a inferência.
+"""
+import asyncio
+import base64
+import hashlib
+import io
+import tempfile
+import uuid
+from collections import deque
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps
+
+from config import UPLOAD_MAX_BYTES, UPLOAD_SPOOL_MAX_MEMORY
+
+THUMBNAIL_MAX_DIM = 640  # Preview da página e imagem guardada para o formulário de atendimento
+FIELD_MAX_BYTES = 64 * 1024  # Total de campos simples e cabeçalhos de parte (bufferizados na memória)
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ModuleNotFoundError:  # Versões antigas do python-multipart
+    from multipart.multipart import MultipartParser, parse_options_header
+
+
+class UploadError(Exception):
+    """Erro de upload com mensagem pronta para exibir ao usuário."""
+
+
+class StreamedUpload:
+    """
+    Upload de um campo de arquivo lido sob demanda.
+
+    Uso:
+        upload = await StreamedUpload.open(request, "image_file")
+        try:
+            ... PredictionService.predict_xxx(token, upload, upload.filename) ...
+            thumb = await upload.thumbnail_b64()
+        finally:
+            upload.close()
+    """
+
+    def __init__(self, request, field_name: str, max_bytes: int = UPLOAD_MAX_BYTES):
+        self.field_name = field_name
+        self.max_bytes = max_bytes
+        self.filename: Optional[str] = None
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self.fields: Dict[str, str] = {}  # Demais campos simples do formulário
+        self.error: Optional[str] = None
+        self.complete = False
+
+        content_type, options = parse_options_header(request.headers.get("content-type", ""))
+        if content_type != b"multipart/form-data" or b"boundary" not in options:
+            raise UploadError("Invalid upload request.")
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > max_bytes + 64 * 1024:
+            raise UploadError(f"File too large. Maximum size is {max_bytes // (1024 * 1024)} MB.")
+
+        self._stream = request.stream().__aiter__()
+        self._stream_done = False
+        self._sha256 = hashlib.sha256()
+        self._spool = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_MAX_MEMORY)
+        self._out = deque()  # Pedaços prontos para repassar à API
+        self._boundary = uuid.uuid4().hex
+        self._thumbnail_task: Optional[asyncio.Future] = None
+
+        # Estado do parser
+        self._header_field = b""
+        self._header_value = b""
+        self._headers: Dict[bytes, bytes] = {}
+        self._part_name: Optional[str] = None
+        self._part_value = b""
+        self._in_file = False
+        self._file_seen = False
+        self._file_ended = False
+        self._buffered = 0  # Bytes fora do arquivo guardados na memória
+        self._parser = MultipartParser(options[b"boundary"], {
+            "on_part_begin": self._on_part_begin,
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+            "on_part_data": self._on_part_data,
+            "on_part_end": self._on_part_end,
+        })
+
+    @classmethod
+    async def open(cls, request, field_name: str, max_bytes: int = UPLOAD_MAX_BYTES) -> "StreamedUpload":
+        """
+        Lê o corpo só até o início do conteúdo do campo de arquivo (nome e tipo já
+        disponíveis). Arquivo vazio é recusado aqui, antes de abrir a requisição à API.
+        """
+        upload = cls(request, field_name, max_bytes)
+        try:
+            while not upload._started() and await upload._read_chunk():
+                pass
+            if upload.filename and upload.size == 0:
+                raise UploadError("Uploaded file is empty.")
+        except Exception:
+            upload.close()
+            raise
+        return upload
+
+    def _started(self) -> bool:
+        """Campo de arquivo encontrado e com o primeiro byte lido (ou terminado sem nenhum)."""
+        if not self._file_seen:
+            return False
+        return not self.filename or self.size > 0 or self._file_ended
+
+    # --- Callbacks do parser multipart ---
+
+    def _on_part_begin(self):
+        self._headers = {}
+        self._part_name = None
+        self._part_value = b""
+
+    def _on_header_field(self, data, start, end):
+        self._header_field += data[start:end]
+        self._count_buffered(end - start)
+
+    def _on_header_value(self, data, start, end):
+        self._header_value += data[start:end]
+        self._count_buffered(end - start)
+
+    def _count_buffered(self, size: int):
+        # Sem Content-Length nada mais limita o que fica na memória fora do arquivo
+        self._buffered += size
+        if self._buffered > FIELD_MAX_BYTES:
+            raise UploadError("Form fields too large.")
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = parse_options_header(self._headers.get(b"content-disposition", b""))
+        self._part_name = options.get(b"name", b"").decode("utf-8", "replace")
+        filename = options.get(b"filename")
+        if self._part_name != self.field_name or self._file_seen:
+            return
+        self._file_seen = True
+        if not filename:
+            return  # Campo presente, mas sem arquivo selecionado
+        self._in_file = True
+        self.filename = filename.decode("utf-8", "replace")
+        self.content_type = self._headers.get(b"content-type", b"application/octet-stream").decode("latin-1")
+        # Cabeçalho da parte repassada à API (campo 'file', como no upload original)
+        safe_name = self.filename.replace('"', "%22").replace("\r", "").replace("\n", "")
+        self._out.append(
+            f"--{self._boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{safe_name}"\r\n'
+            f"Content-Type: {self.content_type}\r\n\r\n".encode("utf-8")
+        )
+
+    def _on_part_data(self, data, start, end):
+        chunk = data[start:end]
+        if not self._in_file:
+            self._part_value += chunk
+            self._count_buffered(len(chunk))
+            return
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            self.error = f"File too large. Maximum size is {self.max_bytes // (1024 * 1024)} MB."
+            raise UploadError(self.error)
+        self._sha256.update(chunk)
+        self._spool.write(chunk)
+        self._out.append(bytes(chunk))
+
+    def _on_part_end(self):
+        if self._in_file:
+            self._in_file = False
+            self._file_ended = True
+            self._out.append(f"\r\n--{self._boundary}--\r\n".encode("utf-8"))
+        elif self._part_name:
+            self.fields[self._part_name] = self._part_value.decode("utf-8", "replace")
+
+    # --- Leitura / repasse ---
+
+    async def _read_chunk(self) -> bool:
+        """Alimenta o parser com o próximo pedaço do navegador. False no fim do corpo."""
+        if self._stream_done:
+            return False
+        try:
+            chunk = await self._stream.__anext__()
+        except StopAsyncIteration:
+            chunk = b""
+        if not chunk:
+            self._stream_done = True
+            self._parser.finalize()
+            return False
+        self._parser.write(chunk)
+        return True
+
+    @property
+    def forward_content_type(self) -> str:
+        return f"multipart/form-data; boundary={self._boundary}"
+
+    async def body(self):
+        """Corpo multipart para a API, gerado à medida que o navegador envia o arquivo."""
+        while True:
+            while self._out:
+                yield self._out.popleft()
+            if not await self._read_chunk():
+                break
+        while self._out:
+            yield self._out.popleft()
+        self.complete = True
+        # Upload completo: a miniatura é gerada enquanto a API faz a inferência
+        self._thumbnail_task = asyncio.ensure_future(asyncio.to_thread(self._make_thumbnail))
+
+    @property
+    def sha256(self) -> Optional[str]:
+        return self._sha256.hexdigest() if self.complete else None
+
+    # --- Miniatura ---
+
+    def _make_thumbnail(self, max_dim: int = THUMBNAIL_MAX_DIM) -> Optional[str]:
+        try:
+            self._spool.seek(0)
+            with Image.open(self._spool) as img:
+                # JPEG: decodifica direto em escala reduzida (sem alocar a imagem cheia)
+                img.draft("RGB", (max_dim, max_dim))
+                # Mesma orientação da API (EXIF aplicado): as caixas das detecções casam com a miniatura
+                img = ImageOps.exif_transpose(img).convert("RGB")
+                img.thumbnail((max_dim, max_dim), Image.Resampling.LANCZOS)
+                buffer = io.BytesIO()
+                img.save(buffer, format="JPEG", quality=85)
+            return base64.b64encode(buffer.getvalue()).decode("utf-8")
+        except Exception as e:
+            print(f"Erro ao gerar miniatura do upload '{self.filename}': {e}")
+            return None
+
+    async def thumbnail_b64(self) -> Optional[str]:
+        """Miniatura JPEG (base64) do arquivo recebido, ou None se não foi possível gerar."""
+        if self.error:
+            return None
+        if self._thumbnail_task is None:
+            # A API respondeu antes de consumir o corpo: termina a leitura para gerar a miniatura
+            async for _ in self.body():
+                pass
+        return await self._thumbnail_task
+
+    def close(self):
+        self._spool.close()
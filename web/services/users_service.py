@@ -30,6 +30,24 @@ class UsersService:
             return {"success": False, "message": str(e)}
     
 
+    @staticmethod
+    async def lookup_users(token, user_ids):
+        """Resolve vários usuários em uma chamada (apenas campos de exibição)"""
+        client = ApiClient(token)
+        ids = list(dict.fromkeys(i for i in user_ids if i))
+        users = []
+
+        try:
+            # A API aceita até 500 ids por chamada
+            for start in range(0, len(ids), 500):
+                result = await client.post("/users/lookup", {"ids": ids[start:start + 500]})
+                if "detail" not in result or "users" not in result["detail"]:
+                    return {"success": False, "message": "Failed to retrieve users"}
+                users.extend(result["detail"]["users"])
+            return {"success": True, "users": users}
+        except ValueError as e:
+            return {"success": False, "message": str(e)}
+
     @staticmethod
     async def get_professionals_by_admin(token, admin_id=None):
         """Obtém a lista de profissionais associados a um admin."""
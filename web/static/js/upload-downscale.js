@@ -0,0 +1,52 @@
+// Redução da imagem no navegador antes do upload.
+// O input de arquivo traz data-max-dimension (maior lado útil para o modelo, informado
+// pela API); imagens maiores são redesenhadas em um canvas e enviadas já reduzidas.
+// Marcando "full_resolution" o arquivo original é enviado (arquivamento em resolução cheia).
+(function () {
+  async function downscale(file, maxDimension) {
+    const bitmap = await createImageBitmap(file, { imageOrientation: 'from-image' });
+    const scale = maxDimension / Math.max(bitmap.width, bitmap.height);
+    if (scale >= 1) { bitmap.close(); return null; } // Já é pequena: envia o original
+
+    const canvas = document.createElement('canvas');
+    canvas.width = Math.max(1, Math.round(bitmap.width * scale));
+    canvas.height = Math.max(1, Math.round(bitmap.height * scale));
+    const context = canvas.getContext('2d');
+    context.imageSmoothingQuality = 'high';
+    context.drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+    bitmap.close();
+
+    // JPEG continua JPEG; os demais formatos viram PNG (sem perdas)
+    const type = file.type === 'image/jpeg' ? 'image/jpeg' : 'image/png';
+    const blob = await new Promise(function (resolve) { canvas.toBlob(resolve, type, 0.92); });
+    if (!blob) return null;
+    const name = type === file.type ? file.name : file.name.replace(/\.[^.]*$/, '') + '.png';
+    return new File([blob], name, { type: type });
+  }
+
+  document.addEventListener('submit', async function (event) {
+    const form = event.target;
+    const input = form.querySelector('input[type=file][data-max-dimension]');
+    if (!input || form.dataset.downscaled === '1') return;
+
+    const file = input.files && input.files[0];
+    const maxDimension = parseInt(input.dataset.maxDimension, 10);
+    const fullResolution = form.querySelector('input[name=full_resolution]');
+    if (!file || !maxDimension || (fullResolution && fullResolution.checked)) return;
+    if (!window.createImageBitmap || !window.DataTransfer) return; // Navegador antigo: envia o original
+
+    event.preventDefault();
+    try {
+      const reduced = await downscale(file, maxDimension);
+      if (reduced) {
+        const transfer = new DataTransfer();
+        transfer.items.add(reduced);
+        input.files = transfer.files;
+      }
+    } catch (err) {
+      console.warn('Falha ao reduzir a imagem; enviando o original.', err);
+    }
+    form.dataset.downscaled = '1';
+    form.submit();
+  });
+})();
@@ -0,0 +1,137 @@
+# web/utils/assets.py
+"""
+Pipeline de arquivos estáticos (CSS/JS).
+
+Na importação, cada arquivo de static/css e static/js é lido uma vez, recebe
+um nome com o hash do conteúdo (ex.: css/layout.3f2a9c1b7d.css) e é
+pré-comprimido em gzip e, se o pacote 'brotli' estiver instalado, em brotli.
+As páginas referenciam os arquivos com stylesheet()/script(), e serve_asset()
+entrega a variante aceita pelo navegador com Cache-Control imutável.
+
+`python -m utils.assets [destino]` grava os mesmos arquivos em disco
+(padrão: static/dist), para servir por um proxy/CDN.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sys
+from typing import Dict, Optional
+
+from fasthtml.common import Link, Script
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:  # Opcional: sem ele só há gzip
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STATIC_URL = "/static"
+ASSET_DIRS = ("css", "js")
+MEDIA_TYPES = {".css": "text/css; charset=utf-8", ".js": "application/javascript; charset=utf-8"}
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+class Asset:
+    def __init__(self, name: str, content: bytes):
+        stem, ext = os.path.splitext(name)
+        self.name = name
+        self.digest = hashlib.sha256(content).hexdigest()[:10]
+        self.hashed_name = f"{stem}.{self.digest}{ext}"
+        self.media_type = MEDIA_TYPES.get(ext, "application/octet-stream")
+        self.etag = f'"{self.digest}"'
+        self.variants: Dict[str, bytes] = {"identity": content}
+        self.variants["gzip"] = gzip.compress(content, compresslevel=9, mtime=0)
+        if brotli is not None:
+            self.variants["br"] = brotli.compress(content, quality=11)
+
+    def pick(self, accept_encoding: str):
+        """Escolhe a menor variante aceita pelo cliente."""
+        accepted = {e.split(";")[0].strip() for e in accept_encoding.lower().split(",")}
+        for encoding in ("br", "gzip"):
+            if encoding in self.variants and encoding in accepted:
+                return encoding, self.variants[encoding]
+        return "identity", self.variants["identity"]
+
+
+def _collect() -> Dict[str, Asset]:
+    assets = {}
+    for directory in ASSET_DIRS:
+        root = os.path.join(STATIC_DIR, directory)
+        if not os.path.isdir(root):
+            continue
+        for file_name in sorted(os.listdir(root)):
+            path = os.path.join(root, file_name)
+            if os.path.splitext(file_name)[1] in MEDIA_TYPES and os.path.isfile(path):
+                with open(path, "rb") as f:
+                    asset = Asset(f"{directory}/{file_name}", f.read())
+                assets[asset.name] = asset
+    return assets
+
+
+_assets = _collect()
+_by_hashed_name = {asset.hashed_name: asset for asset in _assets.values()}
+
+
+def asset_url(name: str) -> str:
+    """URL com hash do arquivo (ex.: 'css/layout.css' -> '/static/css/layout.<hash>.css')."""
+    asset = _assets.get(name)
+    return f"{STATIC_URL}/{asset.hashed_name if asset else name}"
+
+
+def stylesheet(name: str):
+    return Link(rel="stylesheet", href=asset_url(name))
+
+
+def script(name: str, defer: bool = False):
+    if defer:
+        return Script(src=asset_url(name), defer=True)
+    return Script(src=asset_url(name))
+
+
+def serve_asset(request, path: str) -> Response:
+    """
+    Entrega um arquivo do pipeline. Nomes com hash são imutáveis; o nome
+    original também é aceito, mas sempre revalidado.
+    """
+    asset: Optional[Asset] = _by_hashed_name.get(path)
+    cache_control = IMMUTABLE
+    if asset is None:
+        asset = _assets.get(path)
+        cache_control = "no-cache"
+    if asset is None:
+        return Response("Not found", status_code=404, media_type="text/plain")
+
+    headers = {"Cache-Control": cache_control, "ETag": asset.etag, "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == asset.etag:
+        return Response(status_code=304, headers=headers)
+
+    encoding, body = asset.pick(request.headers.get("accept-encoding", ""))
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(body, media_type=asset.media_type, headers=headers)
+
+
+def build(output_dir: str = os.path.join(STATIC_DIR, "dist")) -> Dict[str, str]:
+    """Grava os arquivos com hash (+ .gz/.br) e um manifest.json; retorna o manifesto."""
+    manifest = {}
+    for asset in _assets.values():
+        target = os.path.join(output_dir, asset.hashed_name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        suffixes = {"identity": "", "gzip": ".gz", "br": ".br"}
+        for encoding, body in asset.variants.items():
+            with open(target + suffixes[encoding], "wb") as f:
+                f.write(body)
+        manifest[asset.name] = asset.hashed_name
+    with open(os.path.join(output_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+if __name__ == "__main__":
+    result = build(*sys.argv[1:2])
+    for name, hashed_name in sorted(result.items()):
+        asset = _assets[name]
+        sizes = ", ".join(f"{enc}={len(body)}B" for enc, body in asset.variants.items())
+        print(f"{name} -> {hashed_name} ({sizes})")
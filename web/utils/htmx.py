@@ -0,0 +1,20 @@
+# web/utils/htmx.py
+# Respostas parciais para navegação via HTMX (paginação e filtros das listas).
+from fasthtml.common import Title, HttpHeader
+
+
+def is_htmx(request) -> bool:
+    """
+    True se a requisição veio do HTMX e espera só um fragmento.
+    Restauração de histórico (HX-History-Restore-Request) precisa da página completa.
+    """
+    headers = request.headers
+    return headers.get("hx-request") == "true" and headers.get("hx-history-restore-request") != "true"
+
+
+def fragment(title, *components):
+    """
+    Resposta parcial: só os componentes (e o <title>, que o HTMX atualiza),
+    sem MainLayout. 'Vary' evita que o navegador reaproveite o fragmento como página.
+    """
+    return (Title(f"{title} - Medical Diagnosis System"), *components, HttpHeader("Vary", "HX-Request"))
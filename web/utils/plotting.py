@@ -1,108 +1,161 @@
 # web/utils/plotting.py
-import matplotlib
-matplotlib.use('Agg') # Usa backend não interativo, essencial para servidor web
-import matplotlib.pyplot as plt
-import io
-import base64
-from typing import Dict, List
+# Gráficos em SVG puro (sem matplotlib). A saída é memoizada pelos valores de
+# entrada, então a mesma predição renderizada de novo não recalcula nada.
+from functools import lru_cache
+from html import escape
+from typing import Dict, List, Tuple
+
+# Pontos de controle da escala viridis (invertida: valores altos ficam escuros)
+_VIRIDIS = [
+    (0.0, (68, 1, 84)),
+    (0.25, (59, 82, 139)),
+    (0.5, (33, 145, 140)),
+    (0.75, (94, 201, 98)),
+    (1.0, (253, 231, 37)),
+]
+
+_FONT = "font-family:system-ui,-apple-system,'Segoe UI',Roboto,sans-serif"
+
+
+def _viridis_r(value: float) -> str:
+    """Cor hexadecimal da escala viridis invertida para value entre 0 e 1."""
+    t = 1.0 - min(1.0, max(0.0, value))
+    for (t0, c0), (t1, c1) in zip(_VIRIDIS, _VIRIDIS[1:]):
+        if t <= t1:
+            f = (t - t0) / (t1 - t0)
+            r, g, b = (round(a + (b_ - a) * f) for a, b_ in zip(c0, c1))
+            return f"#{r:02x}{g:02x}{b:02x}"
+    return "#fde725"
+
+
+def _svg(width: int, height: int, title: str, body: List[str]) -> str:
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" '
+        f'width="100%" style="max-width:{width}px;height:auto;{_FONT}" role="img" aria-label="{escape(title)}">'
+        f'<text x="{width / 2:.0f}" y="24" text-anchor="middle" font-size="15" fill="#111827">{escape(title)}</text>'
+        + "".join(body)
+        + "</svg>"
+    )
+
+
+@lru_cache(maxsize=256)
+def _probability_chart(items: Tuple[Tuple[str, float], ...], title: str) -> str:
+    width = 600
+    label_width = min(220, max(60, max(len(label) for label, _ in items) * 8 + 16))
+    plot_left, plot_right = label_width, width - 60
+    plot_width = plot_right - plot_left
+    row_height, top = 38, 48
+    plot_bottom = top + row_height * len(items)
+    height = plot_bottom + 48
+    scale = plot_width / 105  # Eixo de 0 a 105% para caber o rótulo
+
+    body = []
+    # Grade e ticks do eixo X
+    for tick in range(0, 101, 20):
+        x = plot_left + tick * scale
+        body.append(f'<line x1="{x:.1f}" y1="{top}" x2="{x:.1f}" y2="{plot_bottom}" stroke="#f1f5f9"/>')
+        body.append(f'<text x="{x:.1f}" y="{plot_bottom + 16}" text-anchor="middle" font-size="11" fill="#6b7280">{tick}</text>')
+    body.append(f'<line x1="{plot_left}" y1="{top}" x2="{plot_left}" y2="{plot_bottom}" stroke="#dddddd"/>')
+    body.append(f'<line x1="{plot_left}" y1="{plot_bottom}" x2="{plot_right}" y2="{plot_bottom}" stroke="#dddddd"/>')
+    body.append(
+        f'<text x="{plot_left + plot_width / 2:.0f}" y="{plot_bottom + 36}" text-anchor="middle" '
+        f'font-size="12" fill="#374151">Probability (%)</text>'
+    )
+
+    # Barras (primeiro item embaixo, como no barh)
+    for i, (label, value) in enumerate(reversed(items)):
+        y = top + i * row_height + row_height * 0.2
+        bar_height = row_height * 0.6
+        bar_width = max(0.0, min(value, 105)) * scale
+        body.append(
+            f'<rect x="{plot_left}" y="{y:.1f}" width="{bar_width:.1f}" height="{bar_height:.1f}" '
+            f'fill="{_viridis_r(value / 100)}" rx="2"><title>{escape(label)}: {value:.1f}%</title></rect>'
+        )
+        body.append(
+            f'<text x="{plot_left - 8}" y="{y + bar_height / 2 + 4:.1f}" text-anchor="end" '
+            f'font-size="12" fill="#111827">{escape(label)}</text>'
+        )
+        body.append(
+            f'<text x="{plot_left + bar_width + 4:.1f}" y="{y + bar_height / 2 + 4:.1f}" '
+            f'font-size="11" fill="#696969">{value:.1f}%</text>'
+        )
+
+    return _svg(width, height, title, body)
+
 
 def generate_probability_chart(probabilities: Dict[str, float], title: str = "Prediction Probabilities") -> str:
     """
     Gera um gráfico de barras horizontais a partir de um dicionário de probabilidades
-    e retorna a imagem como uma string base64 PNG.
+    (em %) e retorna o SVG como string, pronto para ser inserido na página.
     """
     if not probabilities:
         return ""
-
-    labels = list(probabilities.keys())
-    values = list(probabilities.values())
-
-    # Cores (opcional, pode definir um conjunto de cores)
-    colors = plt.cm.viridis_r([v / 100. for v in values]) # Exemplo de cores baseadas no valor
-
-    # Criar a figura e os eixos
-    fig, ax = plt.subplots(figsize=(7, max(3, len(labels) * 0.6))) # Ajusta altura com base no nº de labels
-
-    # Criar barras horizontais
-    bars = ax.barh(labels, values, color=colors, height=0.6)
-
-    # Adicionar rótulos de porcentagem nas barras
-    ax.bar_label(bars, fmt='%.1f%%', padding=3, fontsize=9, color='dimgray')
-
-    # Configurações do gráfico
-    ax.set_xlabel("Probability (%)", fontsize=10)
-    ax.set_title(title, fontsize=12, pad=15)
-    ax.set_xlim(0, 105) # Limite um pouco maior que 100% para espaço
-    ax.tick_params(axis='y', labelsize=10) # Tamanho da fonte dos labels Y
-    ax.tick_params(axis='x', labelsize=9)
-    ax.spines['top'].set_visible(False) # Remove bordas superior/direita
-    ax.spines['right'].set_visible(False)
-    ax.spines['left'].set_color('#dddddd') # Cor mais suave para borda esquerda
-    ax.spines['bottom'].set_color('#dddddd') # Cor mais suave para borda inferior
-
-    # Inverte a ordem dos labels (opcional, para mais importantes em cima)
-    # ax.invert_yaxis()
-
-    plt.tight_layout() # Ajusta layout para evitar sobreposição
-
-    # Salva o gráfico em um buffer de memória
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=90) # Salva como PNG
-    buf.seek(0)
-
-    # Codifica para base64
-    image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    buf.close()
-    plt.close(fig) # Fecha a figura para liberar memória
-
-    return image_base64
+    items = tuple((str(label), round(float(value), 2)) for label, value in probabilities.items())
+    return _probability_chart(items, title)
+
+
+@lru_cache(maxsize=256)
+def _confidence_histogram(confidences: Tuple[float, ...], title: str) -> str:
+    bins = [70, 75, 80, 85, 90, 95, 100]
+    counts = [0] * (len(bins) - 1)
+    for value in confidences:
+        # Mesma regra do numpy: intervalos semiabertos, o último inclui a borda direita
+        if bins[0] <= value <= bins[-1]:
+            index = min(int((value - bins[0]) // 5), len(counts) - 1)
+            counts[index] += 1
+
+    width, height = 600, 340
+    plot_left, plot_right, top, plot_bottom = 64, width - 24, 48, height - 60
+    plot_width, plot_height = plot_right - plot_left, plot_bottom - top
+    y_max = max(counts) * 1.15 if max(counts) > 0 else 1
+    bin_width = plot_width / len(counts)
+
+    body = []
+    # Eixo Y com ticks inteiros
+    step = max(1, round(y_max / 5))
+    for tick in range(0, int(y_max) + 1, step):
+        y = plot_bottom - tick / y_max * plot_height
+        body.append(f'<line x1="{plot_left}" y1="{y:.1f}" x2="{plot_right}" y2="{y:.1f}" stroke="#f1f5f9"/>')
+        body.append(f'<text x="{plot_left - 6}" y="{y + 4:.1f}" text-anchor="end" font-size="11" fill="#6b7280">{tick}</text>')
+    body.append(f'<line x1="{plot_left}" y1="{top}" x2="{plot_left}" y2="{plot_bottom}" stroke="#374151"/>')
+    body.append(f'<line x1="{plot_left}" y1="{plot_bottom}" x2="{plot_right}" y2="{plot_bottom}" stroke="#374151"/>')
+
+    for i, count in enumerate(counts):
+        x = plot_left + i * bin_width
+        bar_height = count / y_max * plot_height
+        inset = bin_width * 0.075  # rwidth=0.85
+        if count > 0:
+            body.append(
+                f'<rect x="{x + inset:.1f}" y="{plot_bottom - bar_height:.1f}" width="{bin_width - 2 * inset:.1f}" '
+                f'height="{bar_height:.1f}" fill="#87ceeb" stroke="#000000">'
+                f'<title>{bins[i]}-{bins[i + 1]}%: {count}</title></rect>'
+            )
+            body.append(
+                f'<text x="{x + bin_width / 2:.1f}" y="{plot_bottom - bar_height - 4:.1f}" text-anchor="middle" '
+                f'font-size="11" fill="#111827">{count}</text>'
+            )
+    for i, edge in enumerate(bins):
+        x = plot_left + i * bin_width
+        body.append(f'<text x="{x:.1f}" y="{plot_bottom + 16}" text-anchor="middle" font-size="11" fill="#6b7280">{edge}</text>')
+
+    body.append(
+        f'<text x="{plot_left + plot_width / 2:.0f}" y="{plot_bottom + 40}" text-anchor="middle" '
+        f'font-size="12" fill="#374151">Confidence Score (%)</text>'
+    )
+    body.append(
+        f'<text x="16" y="{top + plot_height / 2:.0f}" text-anchor="middle" font-size="12" fill="#374151" '
+        f'transform="rotate(-90 16 {top + plot_height / 2:.0f})">Number of Detections</text>'
+    )
+    return _svg(width, height, title, body)
 
 
 def generate_confidence_histogram(detections: List[Dict], title: str = "Detection Confidence Distribution") -> str:
     """
     Gera um histograma das confianças de detecção.
-    Espera uma lista de dicionários, cada um com 'confidence'.
-    Retorna imagem base64 PNG.
+    Espera uma lista de dicionários, cada um com 'confidence' (0 a 1).
+    Retorna o SVG como string.
     """
     if not detections:
         return ""
-
-    confidences = [d.get('confidence', 0) * 100 for d in detections] # Confianças em %
-    if not confidences: return ""
-
-    fig, ax = plt.subplots(figsize=(7, 4)) # Tamanho fixo para histograma
-
-    # Define os bins (faixas) para o histograma, por exemplo, de 70% a 100%
-    bins = [70, 75, 80, 85, 90, 95, 100] # Ajuste os bins conforme necessário
-
-    # Cria o histograma
-    n, bins, patches = ax.hist(confidences, bins=bins, color='skyblue', edgecolor='black', rwidth=0.85)
-
-    # Adiciona contagem acima das barras (opcional)
-    for count, patch in zip(n, patches):
-        if count > 0:
-            height = patch.get_height()
-            ax.text(patch.get_x() + patch.get_width() / 2., height + 0.1,
-                    f'{int(count)}', ha='center', va='bottom', fontsize=9)
-
-    ax.set_xlabel("Confidence Score (%)", fontsize=10)
-    ax.set_ylabel("Number of Detections", fontsize=10)
-    ax.set_title(title, fontsize=12, pad=15)
-    # ax.set_xticks(bins) # Define ticks nos limites dos bins
-    ax.tick_params(axis='both', labelsize=9)
-    ax.spines['top'].set_visible(False)
-    ax.spines['right'].set_visible(False)
-
-    # Ajusta o limite Y para dar espaço às contagens
-    if n.any(): # Verifica se n não está vazio ou só com zeros
-      ax.set_ylim(0, n.max() * 1.15 if n.max() > 0 else 1)
-
-
-    plt.tight_layout()
-    buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=90)
-    buf.seek(0)
-    image_base64 = base64.b64encode(buf.read()).decode('utf-8')
-    buf.close()
-    plt.close(fig)
-    return image_base64
\ No newline at end of file
+    confidences = tuple(round(d.get('confidence', 0) * 100, 2) for d in detections)
+    return _confidence_histogram(confidences, title)
@@ -0,0 +1,200 @@
+# web/utils/session_store.py
+import asyncio
+import copy
+import hashlib
+import json
+import os
+import secrets
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from config import (
+    SESSION_BACKEND, SESSION_FILE_DIR, SESSION_MAX_ENTRIES,
+    SESSION_MAX_BYTES, SESSION_PURGE_EVERY_WRITES, PREDICTION_ARTIFACT_TTL
+)
+
+
+class SessionBackend:
+    """
+    Armazenamento chave/valor com expiração usado pelas sessões e artefatos.
+    Valores devem ser serializáveis em JSON.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Any, ttl: int):
+        raise NotImplementedError
+
+    async def touch(self, key: str, ttl: int):
+        """Renova a expiração sem regravar o valor."""
+        value = await self.get(key)
+        if value is not None:
+            await self.set(key, value, ttl)
+
+    async def delete(self, key: str):
+        raise NotImplementedError
+
+
+def _value_size(value: Any) -> int:
+    """Tamanho aproximado; só textos grandes (imagens em base64) importam aqui."""
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(_value_size(v) for v in value.values())
+    return 0
+
+
+class MemorySessionBackend(SessionBackend):
+    """LRU em memória com TTL por entrada. Não é compartilhado entre workers."""
+
+    def __init__(self, max_entries: int = SESSION_MAX_ENTRIES, max_bytes: int = SESSION_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self.total_bytes = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, size = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            return None
+        self.entries.move_to_end(key)
+        # Cópia: alterações feitas por uma requisição só valem (e entram na contagem de bytes) com set
+        return copy.deepcopy(value)
+
+    async def set(self, key: str, value: Any, ttl: int):
+        self._remove(key)
+        value = copy.deepcopy(value)  # O chamador pode continuar alterando o próprio objeto
+        size = _value_size(value)
+        self.entries[key] = (time.monotonic() + ttl, value, size)
+        self.total_bytes += size
+        while self.entries and (len(self.entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            oldest = next(iter(self.entries))
+            if oldest == key:
+                break
+            self._remove(oldest)
+
+    async def touch(self, key: str, ttl: int):
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries[key] = (time.monotonic() + ttl, entry[1], entry[2])
+            self.entries.move_to_end(key)
+
+    async def delete(self, key: str):
+        self._remove(key)
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+
+class FileSessionBackend(SessionBackend):
+    """
+    Um arquivo JSON por chave em um diretório compartilhado (volume),
+    permitindo que vários workers/réplicas enxerguem as mesmas sessões.
+    A expiração é o mtime do arquivo + TTL gravado no conteúdo. Arquivos expirados
+    que ninguém volta a ler são removidos na inicialização e a cada `purge_every` gravações.
+    """
+
+    def __init__(self, directory: str = SESSION_FILE_DIR, purge_every: int = SESSION_PURGE_EVERY_WRITES):
+        self.directory = directory
+        self.purge_every = purge_every
+        self.writes = 0
+        os.makedirs(directory, exist_ok=True)
+        self.purge_expired()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    async def get(self, key: str) -> Optional[Any]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if os.path.getmtime(path) + entry["ttl"] < time.time():
+                os.remove(path)
+                return None
+            return entry["value"]
+        except (FileNotFoundError, ValueError, KeyError):
+            return None
+
+    async def set(self, key: str, value: Any, ttl: int):
+        path = self._path(key)
+        tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"ttl": ttl, "value": value}, f)
+        os.replace(tmp_path, path)
+
+        self.writes += 1
+        if self.purge_every and self.writes % self.purge_every == 0:
+            # Varre o diretório fora do event loop
+            await asyncio.to_thread(self.purge_expired)
+
+    async def touch(self, key: str, ttl: int):
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    async def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def purge_expired(self):
+        """Remove arquivos expirados e temporários abandonados (chamado na inicialização e a cada purge_every gravações)."""
+        now = time.time()
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if name.endswith(".tmp"):
+                    # Gravação interrompida: o os.replace nunca aconteceu
+                    if os.path.getmtime(path) + 3600 < now:
+                        os.remove(path)
+                    continue
+                with open(path, "r", encoding="utf-8") as f:
+                    ttl = json.load(f)["ttl"]
+                if os.path.getmtime(path) + ttl < now:
+                    os.remove(path)
+            except (OSError, ValueError, KeyError):
+                continue
+
+
+def create_session_backend(name: str) -> SessionBackend:
+    """Cria o backend configurado em SESSION_BACKEND ("memory" ou "file")."""
+    if name == "file":
+        return FileSessionBackend()
+    if name != "memory":
+        print(f"SESSION_BACKEND '{name}' desconhecido. Usando memória.")
+    return MemorySessionBackend()
+
+
+session_backend = create_session_backend(SESSION_BACKEND)
+
+
+# --- Artefatos de predição (imagens) guardados por referência ---
+
+async def save_artifact(value: str, ttl: int = PREDICTION_ARTIFACT_TTL) -> str:
+    """Guarda um artefato grande (ex.: imagem em base64) e retorna sua referência."""
+    ref = secrets.token_urlsafe(16)
+    await session_backend.set(f"artifact:{ref}", value, ttl)
+    return ref
+
+
+async def load_artifact(ref: Optional[str]) -> Optional[str]:
+    """Retorna o artefato ou None se a referência for inválida ou tiver expirado."""
+    if not ref:
+        return None
+    return await session_backend.get(f"artifact:{ref}")
+
+
+async def delete_artifact(ref: Optional[str]):
+    if ref:
+        await session_backend.delete(f"artifact:{ref}")